@@ -0,0 +1,96 @@
+"""
+Compara la vía síncrona (gunicorn con workers gthread sobre WSGI) con las vistas
+asíncronas (gunicorn con workers de uvicorn sobre ASGI) con un número creciente
+de conexiones simultáneas: peticiones por segundo y latencia p99.
+
+Arranca ambos servidores con gunicorn.conf.py contra la base de datos
+configurada, que debe contener el usuario indicado:
+
+    cd backend && python -m benchmarks.bench_async --username demo --password demo1234 \\
+        [--path /api/projects/] [--concurrency 16 64 256] [--duration 10] [--workers 1]
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.load_test import obtain_token, run_load, summarize
+
+SERVERS = (
+    ('wsgi (gthread)', {'GUNICORN_ASGI': '0'}),
+    ('asgi (uvicorn)', {'GUNICORN_ASGI': '1', 'API_ASYNC_VIEWS': '1'}),
+)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f'El servidor terminó al arrancar (código {process.returncode})')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f'El servidor no respondió en {timeout} s')
+
+
+def start_server(overrides, port, workers):
+    env = {
+        **os.environ, **overrides,
+        'GUNICORN_BIND': f'127.0.0.1:{port}',
+        'GUNICORN_WORKERS': str(workers),
+        'GUNICORN_ACCESS_LOG': os.devnull,
+        'GUNICORN_LOG_LEVEL': 'warning',
+    }
+    process = subprocess.Popen([sys.executable, '-m', 'gunicorn'], env=env)
+    wait_until_ready(port, process)
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--path', default='/api/projects/')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[16, 64, 256])
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f'{args.path} · {args.workers} worker(s) · {args.duration:.0f} s por nivel')
+    print(f'{"servidor":<16}{"conexiones":>11}{"pet/s":>9}{"p50 ms":>9}{"p99 ms":>9}{"errores":>9}')
+    for name, overrides in SERVERS:
+        port = free_port()
+        process = start_server(overrides, port, args.workers)
+        try:
+            url = f'http://127.0.0.1:{port}{args.path}'
+            headers = {
+                'Accept': 'application/json',
+                'Authorization': f'Bearer {obtain_token(url, args.username, args.password)}',
+            }
+            for concurrency in args.concurrency:
+                latencies, errors, elapsed = run_load(url, headers, concurrency, args.duration)
+                if not latencies:
+                    print(f'{name:<16}{concurrency:>11}{"-":>9}{"-":>9}{"-":>9}{errors:>9}')
+                    continue
+                stats = summarize(latencies, errors, elapsed)
+                print(
+                    f'{name:<16}{concurrency:>11}{stats["rps"]:>9.1f}{stats["p50_ms"]:>9.1f}'
+                    f'{stats["p99_ms"]:>9.1f}{errors:>9}'
+                )
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Mide la latencia por petición contra PostgreSQL con cada estrategia de conexión:
+una conexión por petición, conexiones persistentes (con y sin comprobación de
+salud) y el pool de `core.backends.postgresql_pool`. Cada petición simulada
+abre y cierra el ciclo de conexiones como lo hace Django y ejecuta una consulta.
+
+Necesita la base de datos de PostgreSQL configurada con DATABASE_URL:
+
+    cd backend && DATABASE_URL=postgres://... python -m benchmarks.bench_connections [--requests 500] [--threads 4]
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'user_manager.settings')
+django.setup()
+
+from django.db import connections  # noqa: E402
+from django.db.utils import load_backend  # noqa: E402
+
+from core.backends.postgresql_pool import base as pool_base  # noqa: E402
+
+MODES = (
+    ('una por petición', {'ENGINE': 'django.db.backends.postgresql', 'CONN_MAX_AGE': 0,
+                          'CONN_HEALTH_CHECKS': False}),
+    ('persistente', {'ENGINE': 'django.db.backends.postgresql', 'CONN_MAX_AGE': 60,
+                     'CONN_HEALTH_CHECKS': False}),
+    ('persistente + salud', {'ENGINE': 'django.db.backends.postgresql', 'CONN_MAX_AGE': 60,
+                             'CONN_HEALTH_CHECKS': True}),
+    ('pool', {'ENGINE': 'core.backends.postgresql_pool', 'CONN_MAX_AGE': 0,
+              'CONN_HEALTH_CHECKS': True}),
+)
+
+
+def run_worker(settings_dict, requests, timings):
+    """Hilo con su propia conexión de Django, como un worker con hilos."""
+    wrapper = load_backend(settings_dict['ENGINE']).DatabaseWrapper(dict(settings_dict), 'bench')
+    for _ in range(requests):
+        started = time.perf_counter()
+        # request_started / request_finished llaman a close_old_connections
+        wrapper.close_if_unusable_or_obsolete()
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        wrapper.close_if_unusable_or_obsolete()
+        timings.append(time.perf_counter() - started)
+    wrapper.close()
+
+
+def run_mode(settings_dict, requests, threads):
+    timings = []
+    workers = [
+        threading.Thread(target=run_worker, args=(settings_dict, requests // threads, timings))
+        for _ in range(threads)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return timings, time.perf_counter() - started
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--pool-size', type=int, default=None, help='MAX_SIZE del pool (por defecto, --threads)')
+    args = parser.parse_args()
+
+    base_settings = connections['default'].settings_dict
+    if connections['default'].vendor != 'postgresql':
+        raise SystemExit('Se necesita PostgreSQL: define DATABASE_URL y POSTGRES_*.')
+
+    print(f'{args.requests} peticiones en {args.threads} hilos')
+    print(f'{"modo":<22}{"media ms":>10}{"p50 ms":>10}{"p95 ms":>10}{"pet/s":>10}')
+    for name, overrides in MODES:
+        settings_dict = {**base_settings, **overrides, 'POOL': {'MAX_SIZE': args.pool_size or args.threads}}
+        timings, elapsed = run_mode(settings_dict, args.requests, args.threads)
+        print(
+            f'{name:<22}{statistics.mean(timings) * 1000:>10.2f}{percentile(timings, 0.5) * 1000:>10.2f}'
+            f'{percentile(timings, 0.95) * 1000:>10.2f}{len(timings) / elapsed:>10.0f}'
+        )
+    pool_base.close_pools()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Compara el renderer/parser JSON de DRF con `FastJSONRenderer`/`FastJSONParser`
+sobre un listado de proyectos de 10.000 filas. No necesita base de datos: los
+proyectos se construyen en memoria y se serializan con `ProjectSerializer`.
+
+    cd backend && python -m benchmarks.bench_renderers [--rows 10000] [--repeat 5]
+"""
+import argparse
+import datetime
+import io
+import os
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'user_manager.settings')
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from core import renderers  # noqa: E402
+from core.models import Client, Project  # noqa: E402
+from core.serializers import ProjectSerializer  # noqa: E402
+
+
+def build_payload(rows):
+    """Página de `rows` proyectos con la forma de la respuesta del listado."""
+    now = timezone.now()
+    clients = [Client(id=i, name=f'Cliente {i}', user_id=1) for i in range(1, 101)]
+    projects = [
+        Project(
+            id=i,
+            name=f'Proyecto {i}',
+            description=f'Descripción del proyecto {i} con acentos: ñandú, camión',
+            status=('pendiente', 'en_progreso', 'completado')[i % 3],
+            client=clients[i % len(clients)],
+            start_date=now.date(),
+            end_date=(now + datetime.timedelta(days=i % 90)).date() if i % 4 else None,
+            created_at=now - datetime.timedelta(minutes=i),
+            updated_at=now,
+        )
+        for i in range(1, rows + 1)
+    ]
+    return {'next': None, 'previous': None, 'results': ProjectSerializer(projects, many=True).data}
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if renderers.orjson is None:
+        print('orjson no está instalado: FastJSONRenderer usa el renderer de DRF.')
+
+    data = build_payload(args.rows)
+    stock_body = JSONRenderer().render(data)
+    fast_body = renderers.FastJSONRenderer().render(data)
+    assert fast_body == stock_body, 'La salida de FastJSONRenderer difiere de la de DRF'
+
+    cases = [
+        ('render', lambda: JSONRenderer().render(data),
+         lambda: renderers.FastJSONRenderer().render(data)),
+        ('parse', lambda: JSONParser().parse(io.BytesIO(stock_body)),
+         lambda: renderers.FastJSONParser().parse(io.BytesIO(stock_body))),
+    ]
+    print(f'{args.rows} proyectos, {len(stock_body) / 1024:.0f} KiB, mejor de {args.repeat}')
+    for name, stock, fast in cases:
+        stock_time = best_of(args.repeat, stock)
+        fast_time = best_of(args.repeat, fast)
+        print(f'{name:<8} DRF {stock_time * 1000:8.1f} ms   rápido {fast_time * 1000:8.1f} ms'
+              f'   x{stock_time / fast_time:.1f}')
+
+
+if __name__ == '__main__':
+    main()
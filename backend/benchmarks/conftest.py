@@ -0,0 +1,182 @@
+"""
+Fixtures y opciones de la suite de rendimiento (`pytest benchmarks`). La suite
+no forma parte de la ejecución normal de pytest (ver `testpaths` en pytest.ini).
+"""
+from dataclasses import dataclass
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from benchmarks import harness
+from core.models import Client, Project
+from core.tests.factories import ClientFactory, ProjectFactory, UserFactory
+
+results_key = pytest.StashKey[dict]()
+warnings_key = pytest.StashKey[dict]()
+baselines_key = pytest.StashKey[dict]()
+traced_key = pytest.StashKey[bool]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmarks', 'Suite de rendimiento de la API')
+    group.addoption('--update-baselines', action='store_true',
+                    help='Guarda los resultados como nuevas líneas base en benchmarks/baselines.json')
+    group.addoption('--bench-iterations', type=int, default=30,
+                    help='Peticiones medidas por caso (por defecto 30)')
+    group.addoption('--bench-strict', action='store_true',
+                    help='Falla también si empeoran p50 o el pico de memoria (por defecto solo se avisa)')
+    group.addoption('--bench-sigmas', type=float, default=4.0,
+                    help='Desviaciones típicas de p50 de la línea base admitidas (por defecto 4)')
+    group.addoption('--bench-memory-tolerance', type=float, default=0.5,
+                    help='Empeoramiento relativo admitido del pico de memoria (por defecto 0.5)')
+    group.addoption('--bench-clients', type=int, default=100,
+                    help='Clientes del usuario de la suite (por defecto 100)')
+    group.addoption('--bench-projects-per-client', type=int, default=20,
+                    help='Proyectos por cliente (por defecto 20)')
+
+
+def pytest_configure(config):
+    config.stash[results_key] = {}
+    config.stash[warnings_key] = {}
+    config.stash[traced_key] = False
+    config.stash[baselines_key] = harness.load_baselines()
+
+
+def dataset_key(config):
+    """Identifica el volumen de datos: solo se comparan resultados obtenidos con el mismo."""
+    clients = config.getoption('--bench-clients')
+    projects_per_client = config.getoption('--bench-projects-per-client')
+    return f'{connection.vendor}:{clients}x{projects_per_client}'
+
+
+@dataclass
+class Dataset:
+    key: str
+    user: User
+    other_user: User
+    client: Client
+    project: Project
+
+
+@pytest.fixture(scope='session')
+def bench_dataset(request, django_db_setup, django_db_blocker):
+    """
+    Datos con un volumen realista creados con las factorías de core/tests una
+    sola vez por sesión: el usuario de la suite con `--bench-clients` clientes
+    de `--bench-projects-per-client` proyectos y otros usuarios con datos que
+    las consultas deben descartar.
+    """
+    clients = request.config.getoption('--bench-clients')
+    projects_per_client = request.config.getoption('--bench-projects-per-client')
+    with django_db_blocker.unblock():
+        user = UserFactory(username='bench')
+        own_clients = ClientFactory.create_batch(clients, user=user)
+        for client in own_clients:
+            ProjectFactory.create_batch(projects_per_client, client=client)
+        for _ in range(4):
+            for client in ClientFactory.create_batch(10, user=UserFactory()):
+                ProjectFactory.create_batch(5, client=client)
+        other_user = UserFactory()
+        project = Project.objects.filter(client=own_clients[0]).first()
+    return Dataset(
+        key=dataset_key(request.config),
+        user=user,
+        other_user=other_user,
+        client=own_clients[0],
+        project=project,
+    )
+
+
+@pytest.fixture(autouse=True)
+def bench_settings(settings):
+    """Se mide el trabajo real de cada petición, sin respuestas cacheadas ni instrumentación."""
+    settings.API_CACHE_ENABLED = False
+    settings.API_INSTRUMENTATION = False
+    settings.API_METRICS = False
+
+
+@pytest.fixture
+def bench_client(bench_dataset):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(bench_dataset.user)}')
+    return client
+
+
+@pytest.fixture
+def benchmark(request, bench_dataset):
+    """
+    Mide un caso y lo compara con su línea base: `benchmark(call, prepare=None,
+    iterations=None)`. Falla si hace más consultas SQL; si empeoran p50 o la
+    memoria solo avisa en el resumen, salvo con `--bench-strict`.
+    """
+    config = request.config
+    name = request.node.callspec.id if hasattr(request.node, 'callspec') else request.node.name
+
+    def run(call, prepare=None, iterations=None):
+        iterations = min(iterations or config.getoption('--bench-iterations'),
+                         config.getoption('--bench-iterations'))
+        result = harness.measure(call, iterations, prepare=prepare)
+        if not harness.timings_are_reliable():
+            config.stash[traced_key] = True
+        config.stash[results_key][name] = result
+        if config.getoption('--update-baselines'):
+            return result
+        baselines = config.stash[baselines_key]
+        baseline = baselines['benchmarks'].get(name)
+        if baseline is None or baselines['dataset'] != bench_dataset.key:
+            return result
+        regressions = harness.find_query_regressions(result, baseline)
+        noisy = harness.find_timing_regressions(
+            result, baseline,
+            sigmas=config.getoption('--bench-sigmas'),
+            memory_tolerance=config.getoption('--bench-memory-tolerance'),
+        )
+        if config.getoption('--bench-strict'):
+            regressions += noisy
+        elif noisy:
+            config.stash[warnings_key][name] = noisy
+        if regressions:
+            pytest.fail(f'Regresión de rendimiento en {name}: ' + '; '.join(regressions), pytrace=False)
+        return result
+
+    return run
+
+
+def pytest_sessionfinish(session):
+    results = session.config.stash.get(results_key, {})
+    if not results or not session.config.getoption('--update-baselines'):
+        return
+    baselines = harness.load_baselines()
+    dataset = dataset_key(session.config)
+    if baselines['dataset'] != dataset:
+        # Las líneas base de otro volumen de datos no son comparables
+        baselines = {'dataset': dataset, 'benchmarks': {}}
+    baselines['benchmarks'].update(results)
+    harness.save_baselines(baselines)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash.get(results_key, {})
+    if not results:
+        return
+    baselines = config.stash[baselines_key]['benchmarks']
+    write = terminalreporter.write_line
+    terminalreporter.section('rendimiento de la API')
+    if config.stash[traced_key]:
+        write('Hay un trazador activo (¿coverage?): los tiempos no se comparan; usa --no-cov.')
+    write(f'{"caso":<32}{"pet/s":>9}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"SQL":>5}{"KiB":>9}{"p50 base":>10}')
+    for name, result in sorted(results.items()):
+        baseline = baselines.get(name)
+        reference = f'{baseline["p50_ms"]:>10.2f}' if baseline else f'{"-":>10}'
+        write(
+            f'{name:<32}{result["rps"]:>9.1f}{result["p50_ms"]:>9.2f}{result["p95_ms"]:>9.2f}'
+            f'{result["p99_ms"]:>9.2f}{result["queries"]:>5}{result["peak_kib"]:>9.1f}{reference}'
+        )
+    warnings = config.stash[warnings_key]
+    if warnings:
+        write('Posibles regresiones de tiempo o memoria (no fallan sin --bench-strict):')
+        for name, regressions in sorted(warnings.items()):
+            write(f'  {name}: ' + '; '.join(regressions))
@@ -0,0 +1,130 @@
+"""
+Medición de una petición repetida y comparación con las líneas base guardadas
+en `benchmarks/baselines.json`. Lo usa la suite de pytest de `benchmarks/`.
+"""
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.load_test import percentile
+
+BASELINES_PATH = Path(__file__).resolve().parent / 'baselines.json'
+
+# Margen absoluto sobre la tolerancia: en las peticiones de 1-2 ms el ruido de
+# la máquina supera cualquier dispersión medida
+TIME_SLACK_MS = 2.0
+MEMORY_SLACK_KIB = 64.0
+# Rondas en que se reparten las iteraciones de un caso: p50 es la mediana de
+# las medianas de cada ronda y su dispersión da la tolerancia de la comparación
+ROUNDS = 5
+
+
+def read_response(response):
+    """Consume el cuerpo, también el de las respuestas en streaming, dentro de la medida."""
+    if response.streaming:
+        return b''.join(response.streaming_content)
+    return response.content
+
+
+def measure(call, iterations, warmup=3, prepare=None, rounds=ROUNDS):
+    """
+    Ejecuta `call(prepare())` y devuelve latencias, rendimiento secuencial,
+    consultas SQL por petición y pico de memoria asignada (tracemalloc). La
+    preparación no se mide.
+
+    Las iteraciones se reparten en `rounds` rondas: `p50_ms` es la mediana de
+    las medianas de las rondas y `p50_stdev_ms` su desviación típica, con la
+    que `find_timing_regressions` deriva la tolerancia.
+    """
+    prepare = prepare or (lambda: None)
+    for _ in range(warmup):
+        call(prepare())
+
+    rounds = max(1, min(rounds, iterations))
+    latencies, round_medians = [], []
+    for index in range(rounds):
+        round_latencies = []
+        for _ in range(iterations // rounds + (index < iterations % rounds)):
+            argument = prepare()
+            started = time.perf_counter()
+            call(argument)
+            round_latencies.append(time.perf_counter() - started)
+        latencies.extend(round_latencies)
+        round_medians.append(statistics.median(round_latencies))
+
+    # Pasadas aparte: contar consultas y trazar la memoria alteran los tiempos
+    argument = prepare()
+    with CaptureQueriesContext(connection) as queries:
+        call(argument)
+    # La señal request_started de la siguiente petición vacía el registro de consultas
+    query_count = len(queries)
+    argument = prepare()
+    tracemalloc.start()
+    try:
+        call(argument)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'rps': round(len(latencies) / sum(latencies), 1),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 2),
+        'p50_ms': round(statistics.median(round_medians) * 1000, 2),
+        'p50_stdev_ms': round(statistics.stdev(round_medians) * 1000, 2) if len(round_medians) > 1 else 0.0,
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'queries': query_count,
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def timings_are_reliable():
+    """Con coverage u otro trazador activo los tiempos no son comparables."""
+    return sys.gettrace() is None
+
+
+def find_query_regressions(result, baseline):
+    """Las consultas son deterministas: cualquier consulta de más es una regresión."""
+    if result['queries'] > baseline['queries']:
+        return [f'consultas {result["queries"]} > {baseline["queries"]}']
+    return []
+
+
+def find_timing_regressions(result, baseline, sigmas, memory_tolerance):
+    """
+    Empeoramiento de p50 y del pico de memoria. Son medidas ruidosas: la suite
+    solo falla por ellas con `--bench-strict`. p50 admite `sigmas` veces la
+    desviación típica registrada en la línea base (la mayor si la medida
+    actual es más dispersa).
+    """
+    regressions = []
+    limit = baseline['peak_kib'] * (1 + memory_tolerance) + MEMORY_SLACK_KIB
+    if result['peak_kib'] > limit:
+        regressions.append(f'memoria {result["peak_kib"]} KiB > {limit:.1f} KiB')
+    if timings_are_reliable():
+        spread = max(baseline.get('p50_stdev_ms', 0.0), result['p50_stdev_ms'])
+        limit = baseline['p50_ms'] + sigmas * spread + TIME_SLACK_MS
+        if result['p50_ms'] > limit:
+            regressions.append(f'p50_ms {result["p50_ms"]} > {limit:.2f}')
+    return regressions
+
+
+def load_baselines(path=BASELINES_PATH):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {'dataset': None, 'benchmarks': {}}
+
+
+def save_baselines(baselines, path=BASELINES_PATH):
+    with open(path, 'w') as file:
+        json.dump(baselines, file, indent=2, sort_keys=True)
+        file.write('\n')
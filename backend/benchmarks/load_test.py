@@ -0,0 +1,134 @@
+"""
+Prueba de carga HTTP contra un servidor en marcha: `--concurrency` clientes con
+conexiones keep-alive piden la misma URL durante `--duration` segundos e
+informan de peticiones por segundo y latencias. Solo usa la biblioteca estándar.
+
+    cd backend && python -m benchmarks.load_test --url http://localhost:8000/api/projects/ \\
+        --username demo --password demo1234 [--concurrency 16] [--duration 20]
+
+Para comparar `runserver` con gunicorn se lanza contra cada uno con la misma
+base de datos y los mismos parámetros.
+"""
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urljoin, urlsplit
+
+
+def obtain_token(url, username, password):
+    body = json.dumps({'username': username, 'password': password}).encode('utf-8')
+    connection = _connect(urljoin(url, '/api/token/'))
+    connection.request('POST', '/api/token/', body=body, headers={'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    payload = response.read()
+    if response.status != 200:
+        raise SystemExit(f'No se pudo obtener el token ({response.status}): {payload[:200]!r}')
+    return json.loads(payload)['access']
+
+
+def _connect(url):
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+    return connection_class(parts.hostname, parts.port, timeout=30)
+
+
+class Worker(threading.Thread):
+    """Cliente que repite la petición sobre una misma conexión hasta `deadline`."""
+
+    def __init__(self, url, headers, deadline):
+        super().__init__(daemon=True)
+        self.url = url
+        parts = urlsplit(url)
+        self.path = parts.path + (f'?{parts.query}' if parts.query else '')
+        self.headers = headers
+        self.deadline = deadline
+        self.latencies = []
+        self.errors = 0
+
+    def run(self):
+        connection = _connect(self.url)
+        while time.perf_counter() < self.deadline:
+            started = time.perf_counter()
+            try:
+                connection.request('GET', self.path, headers=self.headers)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                self.errors += 1
+                connection.close()
+                connection = _connect(self.url)
+                continue
+            if response.status == 200:
+                self.latencies.append(time.perf_counter() - started)
+            else:
+                self.errors += 1
+            if response.will_close:
+                connection.close()
+                connection = _connect(self.url)
+        connection.close()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_load(url, headers, concurrency, duration, warmup=2):
+    """Lanza la carga y devuelve las latencias correctas, los errores y el tiempo medido."""
+    # La primera pasada calienta el servidor y se descarta
+    for phase_duration in (warmup, duration):
+        deadline = time.perf_counter() + phase_duration
+        workers = [Worker(url, headers, deadline) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+    latencies = [latency for worker in workers for latency in worker.latencies]
+    return latencies, sum(worker.errors for worker in workers), elapsed
+
+
+def summarize(latencies, errors, elapsed):
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed,
+        'mean_ms': statistics.mean(latencies) * 1000,
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', default='http://localhost:8000/api/projects/')
+    parser.add_argument('--username')
+    parser.add_argument('--password')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--warmup', type=float, default=2)
+    args = parser.parse_args()
+
+    headers = {'Accept': 'application/json'}
+    if args.username:
+        headers['Authorization'] = f'Bearer {obtain_token(args.url, args.username, args.password)}'
+
+    latencies, errors, elapsed = run_load(args.url, headers, args.concurrency, args.duration, args.warmup)
+    if not latencies:
+        raise SystemExit(f'Ninguna petición correcta ({errors} errores)')
+    stats = summarize(latencies, errors, elapsed)
+    print(f'{args.url} · {args.concurrency} clientes · {args.duration:.0f} s')
+    print(f'peticiones: {stats["requests"]}  errores: {errors}  pet/s: {stats["rps"]:.1f}')
+    print(
+        f'latencia ms  media {stats["mean_ms"]:.1f}  p50 {stats["p50_ms"]:.1f}  '
+        f'p95 {stats["p95_ms"]:.1f}  p99 {stats["p99_ms"]:.1f}'
+    )
+
+
+if __name__ == '__main__':
+    main()
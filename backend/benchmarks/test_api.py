@@ -0,0 +1,327 @@
+"""
+Suite de rendimiento de la API: cada caso repite una acción de los ViewSets o
+de los endpoints JWT contra un volumen de datos realista y registra el
+rendimiento secuencial, los percentiles de latencia, las consultas SQL y el
+pico de memoria. Falla si algún caso hace más consultas SQL que en
+benchmarks/baselines.json; los empeoramientos de p50 y de memoria, más ruidosos,
+solo se avisan salvo con `--bench-strict` (ver `harness.find_timing_regressions`).
+
+    cd backend && pytest benchmarks --no-cov                      # comparar
+    cd backend && pytest benchmarks --no-cov --update-baselines   # guardar nuevas líneas base
+    cd backend && pytest benchmarks --no-cov -k projects --bench-iterations 100
+    cd backend && pytest benchmarks --no-cov --bench-strict        # también p50 y memoria
+
+Las líneas base solo se comparan con el mismo motor de base de datos y el mismo
+volumen (`--bench-clients`, `--bench-projects-per-client`).
+"""
+import datetime
+import itertools
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from benchmarks.harness import read_response
+from core.tests.factories import ClientFactory, ProjectFactory
+
+CASES = {}
+
+# Filas de las operaciones en lote y de las importaciones
+BATCH_SIZE = 50
+
+_sequence = itertools.count()
+
+
+def case(name, iterations=None):
+    """Registra un caso: una función que recibe el cliente y los datos y devuelve (call, prepare)."""
+    def register(builder):
+        CASES[name] = (builder, iterations)
+        return builder
+    return register
+
+
+def expect(response, status_code):
+    assert response.status_code == status_code, (response.status_code, getattr(response, 'data', None))
+    read_response(response)
+
+
+def unique():
+    return next(_sequence)
+
+
+def client_payload(n):
+    return {'name': f'Cliente bench {n}', 'email': f'bench{n}@example.com', 'phone': '+34600000000'}
+
+
+def project_payload(client_id, n):
+    today = timezone.now().date()
+    return {
+        'name': f'Proyecto bench {n}',
+        'description': 'Descripción del proyecto de la suite de rendimiento',
+        'status': 'pendiente',
+        'client': client_id,
+        'start_date': today.isoformat(),
+        'end_date': (today + datetime.timedelta(days=30)).isoformat(),
+    }
+
+
+def csv_upload(header, rows):
+    content = '\n'.join([header, *rows]) + '\n'
+    return SimpleUploadedFile('datos.csv', content.encode('utf-8'), content_type='text/csv')
+
+
+def get(api, url, status_code=200):
+    return lambda _: expect(api.get(url), status_code), None
+
+
+# Autenticación
+
+@case('token-obtain', iterations=5)
+def token_obtain(api, data):
+    url = reverse('token_obtain_pair')
+    credentials = {'username': data.user.username, 'password': 'password123'}
+    return lambda _: expect(api.post(url, credentials, format='json'), 200), None
+
+
+@case('token-refresh')
+def token_refresh(api, data):
+    url = reverse('token_refresh')
+    return (
+        lambda refresh: expect(api.post(url, {'refresh': refresh}, format='json'), 200),
+        lambda: str(RefreshToken.for_user(data.user)),
+    )
+
+
+# Usuarios
+
+@case('users-list')
+def users_list(api, data):
+    return get(api, reverse('user-list'))
+
+
+@case('users-retrieve')
+def users_retrieve(api, data):
+    return get(api, reverse('user-detail', args=[data.user.id]))
+
+
+@case('users-create', iterations=5)
+def users_create(api, data):
+    url = reverse('user-list')
+    return (
+        lambda payload: expect(api.post(url, payload, format='json'), 201),
+        lambda: {'username': f'bench-{unique()}', 'email': 'nuevo@example.com', 'password': 'password123'},
+    )
+
+
+@case('users-update')
+def users_update(api, data):
+    url = reverse('user-detail', args=[data.other_user.id])
+    return lambda _: expect(api.put(url, {
+        'username': data.other_user.username, 'email': f'otro{unique()}@example.com', 'password': 'x',
+    }, format='json'), 200), None
+
+
+@case('users-partial-update')
+def users_partial_update(api, data):
+    url = reverse('user-detail', args=[data.other_user.id])
+    return lambda _: expect(api.patch(url, {'email': f'otro{unique()}@example.com'}, format='json'), 200), None
+
+
+@case('users-destroy')
+def users_destroy(api, data):
+    return (
+        lambda user_id: expect(api.delete(reverse('user-detail', args=[user_id])), 204),
+        lambda: User.objects.create(username=f'borrar-{unique()}').id,
+    )
+
+
+# Clientes
+
+@case('clients-list')
+def clients_list(api, data):
+    return get(api, reverse('client-list'))
+
+
+@case('clients-list-search')
+def clients_list_search(api, data):
+    return get(api, reverse('client-list') + '?q=Cliente')
+
+
+@case('clients-retrieve')
+def clients_retrieve(api, data):
+    return get(api, reverse('client-detail', args=[data.client.id]))
+
+
+@case('clients-create')
+def clients_create(api, data):
+    url = reverse('client-list')
+    return (
+        lambda payload: expect(api.post(url, payload, format='json'), 201),
+        lambda: client_payload(unique()),
+    )
+
+
+@case('clients-update')
+def clients_update(api, data):
+    url = reverse('client-detail', args=[data.client.id])
+    return lambda _: expect(api.put(url, client_payload(unique()), format='json'), 200), None
+
+
+@case('clients-partial-update')
+def clients_partial_update(api, data):
+    url = reverse('client-detail', args=[data.client.id])
+    return lambda _: expect(api.patch(url, {'phone': f'+34600{unique():06d}'}, format='json'), 200), None
+
+
+@case('clients-destroy')
+def clients_destroy(api, data):
+    return (
+        lambda client_id: expect(api.delete(reverse('client-detail', args=[client_id])), 204),
+        lambda: ClientFactory(user=data.user).id,
+    )
+
+
+@case('clients-bulk-create')
+def clients_bulk_create(api, data):
+    url = reverse('client-bulk')
+    return (
+        lambda payload: expect(api.post(url, payload, format='json'), 201),
+        lambda: [client_payload(unique()) for _ in range(BATCH_SIZE)],
+    )
+
+
+@case('clients-import-csv')
+def clients_import_csv(api, data):
+    url = reverse('client-import-csv')
+    return (
+        lambda upload: expect(api.post(url, {'file': upload}, format='multipart'), 200),
+        lambda: csv_upload('name,email,phone', [
+            f'Importado {n},importado{n}@example.com,+34600000000' for n in (unique() for _ in range(BATCH_SIZE))
+        ]),
+    )
+
+
+@case('clients-export', iterations=10)
+def clients_export(api, data):
+    return get(api, reverse('client-export'))
+
+
+# Proyectos
+
+@case('projects-list')
+def projects_list(api, data):
+    return get(api, reverse('project-list'))
+
+
+@case('projects-list-filtered')
+def projects_list_filtered(api, data):
+    return get(api, reverse('project-list') + '?status=pendiente&ordering=-start_date')
+
+
+@case('projects-list-search')
+def projects_list_search(api, data):
+    return get(api, reverse('project-list') + '?q=Proyecto')
+
+
+@case('projects-retrieve')
+def projects_retrieve(api, data):
+    return get(api, reverse('project-detail', args=[data.project.id]))
+
+
+@case('projects-by-status')
+def projects_by_status(api, data):
+    return get(api, reverse('project-by-status') + '?status=en_progreso')
+
+
+@case('projects-summary')
+def projects_summary(api, data):
+    return get(api, reverse('project-summary'))
+
+
+@case('projects-create')
+def projects_create(api, data):
+    url = reverse('project-list')
+    return (
+        lambda payload: expect(api.post(url, payload, format='json'), 201),
+        lambda: project_payload(data.client.id, unique()),
+    )
+
+
+@case('projects-update')
+def projects_update(api, data):
+    url = reverse('project-detail', args=[data.project.id])
+    return lambda _: expect(api.put(url, project_payload(data.client.id, unique()), format='json'), 200), None
+
+
+@case('projects-partial-update')
+def projects_partial_update(api, data):
+    url = reverse('project-detail', args=[data.project.id])
+    statuses = itertools.cycle(['pendiente', 'en_progreso', 'completado'])
+    return lambda _: expect(api.patch(url, {'status': next(statuses)}, format='json'), 200), None
+
+
+@case('projects-destroy')
+def projects_destroy(api, data):
+    return (
+        lambda project_id: expect(api.delete(reverse('project-detail', args=[project_id])), 204),
+        lambda: ProjectFactory(client=data.client).id,
+    )
+
+
+@case('projects-bulk-create')
+def projects_bulk_create(api, data):
+    url = reverse('project-bulk')
+    return (
+        lambda payload: expect(api.post(url, payload, format='json'), 201),
+        lambda: [project_payload(data.client.id, unique()) for _ in range(BATCH_SIZE)],
+    )
+
+
+@case('projects-bulk-update')
+def projects_bulk_update(api, data):
+    url = reverse('project-bulk')
+    ids = list(data.client.projects.values_list('id', flat=True)[:BATCH_SIZE])
+    statuses = itertools.cycle(['pendiente', 'en_progreso', 'completado'])
+    return lambda _: expect(api.patch(url, [
+        {'id': project_id, 'status': next(statuses)} for project_id in ids
+    ], format='json'), 200), None
+
+
+@case('projects-bulk-delete')
+def projects_bulk_delete(api, data):
+    url = reverse('project-bulk')
+    return (
+        lambda ids: expect(api.delete(url, ids, format='json'), 200),
+        lambda: [project.id for project in ProjectFactory.create_batch(BATCH_SIZE // 2, client=data.client)],
+    )
+
+
+@case('projects-import-csv')
+def projects_import_csv(api, data):
+    url = reverse('project-import-csv')
+    return (
+        lambda upload: expect(api.post(url, {'file': upload}, format='multipart'), 200),
+        lambda: csv_upload('name,description,status,client_name,start_date,end_date', [
+            f'Importado {unique()},Descripción,pendiente,{data.client.name},2025-01-01,'
+            for _ in range(BATCH_SIZE)
+        ]),
+    )
+
+
+@case('projects-export', iterations=10)
+def projects_export(api, data):
+    return get(api, reverse('project-export'))
+
+
+@pytest.mark.django_db
+class TestAPIBenchmarks:
+    """Rendimiento de cada acción de la API frente a su línea base."""
+
+    @pytest.mark.parametrize('name', CASES)
+    def test_endpoint(self, name, benchmark, bench_client, bench_dataset):
+        builder, iterations = CASES[name]
+        call, prepare = builder(bench_client, bench_dataset)
+        benchmark(call, prepare=prepare, iterations=iterations)
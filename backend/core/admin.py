@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Client, Project
+from .models import Client, Project, Tombstone
 
 @admin.register(Client)
 class ClientAdmin(admin.ModelAdmin):
@@ -11,4 +11,9 @@ class ClientAdmin(admin.ModelAdmin):
 class ProjectAdmin(admin.ModelAdmin):
     list_display = ('name', 'client', 'status', 'start_date', 'end_date')
     list_filter = ('status', 'client')
-    search_fields = ('name', 'description') 
\ No newline at end of file
+    search_fields = ('name', 'description') 
+
+@admin.register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ('model', 'object_id', 'user', 'deleted_at')
+    list_filter = ('model',)
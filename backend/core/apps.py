@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'core' 
\ No newline at end of file
+    name = 'core'
+
+    def ready(self):
+        # Registrar los receptores de señales de la aplicación
+        from . import signals  # noqa: F401
+        from .search import repair_sqlite_search_triggers
+        post_migrate.connect(repair_sqlite_search_triggers, sender=self)
@@ -0,0 +1,143 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from django.template.response import SimpleTemplateResponse
+from django.urls import URLPattern
+from rest_framework import exceptions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .authentication import aauthenticate
+from .instrumentation import timed
+
+
+class SyncFallback(Exception):
+    """La petición no se puede atender de forma asíncrona y se delega en la vista síncrona."""
+
+
+class AsyncReadMixin:
+    """
+    Acciones de lectura asíncronas de un ViewSet, servidas por `async_read_view`
+    bajo ASGI: `alist`, `aretrieve` y cualquier otra acción GET con su
+    variante `a<acción>`. Usan el ORM asíncrono (`aget`, `aiterator`,
+    `aaggregate`) y reutilizan el resto de la vista: filtros, campos
+    dispersos, paginación por cursor, validadores y caché de respuestas.
+    """
+
+    def can_handle_async(self, request):
+        """Indica si la acción puede atenderse de forma asíncrona; si no, se usa la vista síncrona."""
+        if self.detail:
+            return True
+        if self.action == 'list' and 'since' in request.query_params:
+            # La sincronización incremental solo tiene implementación síncrona
+            return False
+        paginator = self.paginator
+        if paginator is not None and not hasattr(paginator, 'apaginate_queryset'):
+            return False
+        return self.get_values_representation() is not None
+
+    async def ainitial(self, request, *args, **kwargs):
+        """Versión asíncrona de `initial`; se redefine para evitar E/S síncrona en el bucle de eventos."""
+        self.initial(request, *args, **kwargs)
+
+    async def aget_object(self):
+        """Versión asíncrona de `get_object`."""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.aget_list_response(self.filter_queryset(self.get_queryset()))
+
+
+async def _authenticate(request):
+    """Equivalente asíncrono de `Request._authenticate` para autenticadores JWT."""
+    for authenticator in request.authenticators:
+        try:
+            user_auth_tuple = await aauthenticate(authenticator, request)
+        except exceptions.APIException:
+            request._not_authenticated()
+            raise
+        if user_auth_tuple is not None:
+            request._authenticator = authenticator
+            request.user, request.auth = user_auth_tuple
+            return
+    request._not_authenticated()
+
+
+async def _dispatch(sync_view, handler_name, request, args, kwargs):
+    """`APIView.dispatch` con autenticación y acción asíncronas."""
+    self = sync_view.cls(**sync_view.initkwargs)
+    # Mismo estado que prepara la vista de ViewSetMixin.as_view
+    self.action_map = sync_view.actions
+    for method, action in sync_view.actions.items():
+        setattr(self, method, getattr(self, action))
+    self.args = args
+    self.kwargs = kwargs
+    request = self.initialize_request(request, *args, **kwargs)
+    self.request = request
+    self.headers = self.default_response_headers
+    if not all(isinstance(authenticator, JWTAuthentication) for authenticator in request.authenticators):
+        raise SyncFallback
+
+    try:
+        await _authenticate(request)
+        await self.ainitial(request, *args, **kwargs)
+        if not self.can_handle_async(request):
+            raise SyncFallback
+        response = await getattr(self, handler_name)(request, *args, **kwargs)
+    except SyncFallback:
+        raise
+    except Exception as exc:
+        response = self.handle_exception(exc)
+
+    self.response = self.finalize_response(request, response, *args, **kwargs)
+    if isinstance(self.response, SimpleTemplateResponse):
+        # Se renderiza aquí para no pasar por el hilo de las vistas síncronas
+        with timed('render'):
+            self.response.render()
+    return self.response
+
+
+def async_read_view(sync_view):
+    """
+    Envuelve la vista de un ViewSet (`ViewSet.as_view(actions)`) en una vista
+    asíncrona: las peticiones GET a acciones con variante `a<acción>` se
+    atienden en el bucle de eventos y el resto, o las que la variante no
+    admite, se delegan en la vista síncrona original.
+    """
+    actions = getattr(sync_view, 'actions', None) or {}
+    viewset_class = getattr(sync_view, 'cls', None)
+    action = actions.get('get')
+    handler_name = f'a{action}' if action else None
+    if handler_name is None or not hasattr(viewset_class, handler_name):
+        return sync_view
+    run_sync_view = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method == 'GET':
+            try:
+                return await _dispatch(sync_view, handler_name, request, args, kwargs)
+            except SyncFallback:
+                pass
+        return await run_sync_view(request, *args, **kwargs)
+
+    # cls, actions, initkwargs y csrf_exempt, que usan el esquema y el middleware CSRF
+    view.__dict__.update(sync_view.__dict__)
+    view.__name__ = sync_view.__name__
+    view.__doc__ = sync_view.__doc__
+    return view
+
+
+def async_read_urls(urlpatterns):
+    """Sustituye las vistas de las rutas de un router por su versión `async_read_view`."""
+    return [
+        URLPattern(pattern.pattern, async_read_view(pattern.callback), pattern.default_args, pattern.name)
+        if isinstance(pattern, URLPattern) else pattern
+        for pattern in urlpatterns
+    ]
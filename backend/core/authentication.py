@@ -0,0 +1,211 @@
+import itertools
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserStatusCache:
+    """
+    Caché local (por proceso) con TTL corto del estado de cada usuario.
+
+    Guarda si el usuario sigue existiendo y si está activo, de modo que la
+    revocación (baja o desactivación) se detecta como mucho `ttl` segundos
+    después sin consultar `auth_user` en cada petición.
+
+    Las entradas caducadas se descartan al guardar una nueva cuando se alcanza
+    `max_entries`; si todas siguen vigentes se descartan las más antiguas.
+    """
+
+    max_entries = 10000
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'JWT_USER_STATUS_CACHE_TTL', 30)
+
+    def get_status(self, user_id):
+        """
+        Devuelve `True` si el usuario está activo, `False` si está inactivo y
+        `None` si ya no existe.
+        """
+        found, is_active = self._get_cached(user_id)
+        if not found:
+            is_active = self._status_queryset(user_id).first()
+            self._store(user_id, is_active)
+        return is_active
+
+    async def aget_status(self, user_id):
+        """Versión asíncrona de `get_status`."""
+        found, is_active = self._get_cached(user_id)
+        if not found:
+            is_active = await self._status_queryset(user_id).afirst()
+            self._store(user_id, is_active)
+        return is_active
+
+    def _get_cached(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is not None and entry[1] > time.monotonic():
+            return True, entry[0]
+        return False, None
+
+    def _store(self, user_id, is_active):
+        now = time.monotonic()
+        with self._lock:
+            # Se reinserta al final: el diccionario queda ordenado por antigüedad
+            self._entries.pop(user_id, None)
+            if len(self._entries) >= self.max_entries:
+                self._prune(now)
+            self._entries[user_id] = (is_active, now + self.ttl)
+
+    def _prune(self, now):
+        expired = [user_id for user_id, (_, expires) in self._entries.items() if expires <= now]
+        for user_id in expired:
+            del self._entries[user_id]
+        excess = len(self._entries) - self.max_entries + 1
+        for user_id in list(itertools.islice(self._entries, max(excess, 0))):
+            del self._entries[user_id]
+
+    @staticmethod
+    def _status_queryset(user_id):
+        return get_user_model().objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).values_list('is_active', flat=True)
+
+    def invalidate(self, user_id=None):
+        """Elimina la entrada de un usuario, o todas si no se indica ninguno."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+user_status_cache = UserStatusCache()
+
+
+class StatelessUser(TokenUser):
+    """
+    Usuario ligero construido a partir de los claims firmados del token.
+
+    `id` y `pk` salen del token sin tocar la base de datos. Cualquier otro
+    atributo del modelo (email, username, permisos...) se resuelve cargando el
+    usuario real de forma perezosa, una sola vez por petición.
+    """
+
+    @cached_property
+    def _db_user(self):
+        return get_user_model().objects.get(**{api_settings.USER_ID_FIELD: self.id})
+
+    def __str__(self):
+        return f"StatelessUser {self.id}"
+
+    def __getattr__(self, attr):
+        # Solo se invoca para atributos que TokenUser no define
+        if attr.startswith('_') or attr == 'token':
+            raise AttributeError(attr)
+        return getattr(self._db_user, attr)
+
+    @cached_property
+    def username(self):
+        return self._db_user.username
+
+    @cached_property
+    def is_staff(self):
+        return self._db_user.is_staff
+
+    @cached_property
+    def is_superuser(self):
+        return self._db_user.is_superuser
+
+    @property
+    def groups(self):
+        return self._db_user.groups
+
+    @property
+    def user_permissions(self):
+        return self._db_user.user_permissions
+
+    def get_group_permissions(self, obj=None):
+        return self._db_user.get_group_permissions(obj)
+
+    def get_all_permissions(self, obj=None):
+        return self._db_user.get_all_permissions(obj)
+
+    def has_perm(self, perm, obj=None):
+        return self._db_user.has_perm(perm, obj)
+
+    def has_perms(self, perm_list, obj=None):
+        return self._db_user.has_perms(perm_list, obj)
+
+    def has_module_perms(self, module):
+        return self._db_user.has_module_perms(module)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Autenticación JWT opcional que evita el SELECT sobre `auth_user` en cada
+    petición. Devuelve un `StatelessUser` y comprueba la existencia y el estado
+    `is_active` del usuario a través de `user_status_cache`.
+
+    Se activa con `JWT_STATELESS_AUTH=1`.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        is_active = user_status_cache.get_status(user_id)
+        if is_active is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return StatelessUser(validated_token)
+
+
+async def aauthenticate(authenticator, request):
+    """
+    Equivalente asíncrono de `authenticate` para `JWTAuthentication` y
+    `StatelessJWTAuthentication`: la firma del token se valida igual y el
+    usuario (o su estado) se obtiene con el ORM asíncrono.
+    """
+    header = authenticator.get_header(request)
+    if header is None:
+        return None
+    raw_token = authenticator.get_raw_token(header)
+    if raw_token is None:
+        return None
+    validated_token = authenticator.get_validated_token(raw_token)
+
+    try:
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    if isinstance(authenticator, StatelessJWTAuthentication):
+        is_active = await user_status_cache.aget_status(user_id)
+        user = StatelessUser(validated_token) if is_active else None
+    else:
+        user = await authenticator.user_model.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).afirst()
+        is_active = None if user is None else user.is_active
+    if is_active is None:
+        raise AuthenticationFailed(_("User not found"), code="user_not_found")
+    if not is_active:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    return user, validated_token
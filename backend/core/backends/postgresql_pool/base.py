@@ -0,0 +1,103 @@
+"""
+Backend de PostgreSQL con un pool de conexiones local al proceso, pensado para
+workers con varios hilos. Se activa con `DB_POOL=True` (ver settings) y se
+configura con la clave `POOL` de la base de datos:
+
+    'POOL': {'MIN_SIZE': 0, 'MAX_SIZE': 10, 'TIMEOUT': 30}
+
+Al terminar cada petición Django cierra la conexión (`CONN_MAX_AGE = 0`), lo que
+aquí la devuelve al pool en lugar de cerrarla. Con `CONN_HEALTH_CHECKS` cada
+conexión reutilizada se comprueba con `SELECT 1` antes de entregarla.
+"""
+import threading
+
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from core.pool import ConnectionPool
+
+_pools = {}
+# Nombre legible de cada pool ("host/base de datos") para las métricas
+_pool_names = {}
+_pools_lock = threading.Lock()
+
+# Estado de transacción "sin transacción en curso", igual en psycopg2 y psycopg 3
+TRANSACTION_STATUS_IDLE = 0
+
+
+def _is_alive(connection):
+    return not connection.closed
+
+
+def _ping(connection):
+    if connection.closed:
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+    return True
+
+
+def get_pool(settings_dict, conn_params, connect):
+    """Pool compartido por los hilos del proceso para unos mismos parámetros de conexión."""
+    # La clave incluye la base de datos: los tests, p. ej., se conectan a otra
+    key = repr(sorted(conn_params.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            options = settings_dict.get('POOL') or {}
+            pool = _pools[key] = ConnectionPool(
+                connect,
+                min_size=options.get('MIN_SIZE', 0),
+                max_size=options.get('MAX_SIZE', 10),
+                timeout=options.get('TIMEOUT', 30),
+                check=_ping if settings_dict.get('CONN_HEALTH_CHECKS') else _is_alive,
+            )
+            _pool_names[key] = '{}/{}'.format(
+                conn_params.get('host') or 'localhost', conn_params.get('dbname') or conn_params.get('database')
+            )
+            pool.prefill()
+    return pool
+
+
+def pool_stats():
+    """Pares (nombre, pool) de los pools abiertos en el proceso."""
+    with _pools_lock:
+        return [(_pool_names[key], pool) for key, pool in _pools.items()]
+
+
+def close_pools():
+    """Cierra las conexiones libres de todos los pools."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    pool = None
+
+    def get_new_connection(self, conn_params):
+        def connect():
+            return super(DatabaseWrapper, self).get_new_connection(conn_params)
+
+        self.pool = get_pool(self.settings_dict, conn_params, connect)
+        connection = self.pool.acquire()
+        # Lo que fija get_new_connection al abrir una conexión nueva
+        isolation_level = self.settings_dict['OPTIONS'].get('isolation_level')
+        self.isolation_level = (
+            IsolationLevel.READ_COMMITTED if isolation_level is None else IsolationLevel(isolation_level)
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None or self.pool is None:
+            return super()._close()
+        connection = self.connection
+        # Una conexión abandonada dentro de atomic() sigue referenciada por este wrapper
+        discard = bool(connection.closed) or self.in_atomic_block
+        if not discard and connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except self.Database.Error:
+                discard = True
+        self.pool.release(connection, discard=discard)
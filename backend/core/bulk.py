@@ -0,0 +1,154 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .cache import invalidate_user_cache
+from .signals import bulk_deletion
+
+
+class BulkOperationsMixin:
+    """
+    Endpoint `bulk/` que recibe una lista de objetos:
+
+    - POST crea todos los objetos con `bulk_create`.
+    - PUT/PATCH actualiza los objetos indicados por `id` con `bulk_update`.
+    - DELETE elimina los objetos cuyos ids se envían.
+
+    La validación se hace para todo el lote antes de escribir y la escritura
+    ocurre en una única transacción: si algún elemento no es válido no se
+    aplica ningún cambio y se devuelve una lista de errores alineada con la
+    entrada (un diccionario vacío para los elementos correctos).
+    """
+    bulk_serializer_class = None
+    # Columnas que recibe `bulk_deleting` además del id
+    bulk_deletion_fields = ()
+
+    def get_bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({'non_field_errors': ['Se esperaba una lista de elementos no vacía.']})
+        if len(items) > settings.API_BULK_MAX_ITEMS:
+            raise ValidationError({'non_field_errors': [
+                f'Se admiten como máximo {settings.API_BULK_MAX_ITEMS} elementos por petición.'
+            ]})
+        return items
+
+    def get_bulk_serializer_context(self, items):
+        """Contexto del serializador; las vistas lo amplían con datos precargados."""
+        return self.get_serializer_context()
+
+    def get_bulk_save_kwargs(self):
+        """Atributos fijos que se asignan a cada objeto creado."""
+        return {}
+
+    def bulk_created(self, objects):
+        """Se llama dentro de la transacción tras crear los objetos (no hay señales)."""
+
+    def bulk_updated(self, objects):
+        """Se llama dentro de la transacción tras actualizar los objetos (no hay señales)."""
+
+    def bulk_deleting(self, rows):
+        """
+        Se llama dentro de la transacción antes de eliminar las filas `rows`
+        (diccionarios con `id` y `bulk_deletion_fields`). Los receptores de
+        `post_delete` no hacen nada durante la eliminación en lote: los
+        contadores y los registros de eliminación se ajustan aquí para todo el lote.
+        """
+
+    def _bulk_response_errors(self, errors):
+        return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post', 'put', 'patch', 'delete'], filter_backends=[])
+    def bulk(self, request):
+        """Endpoint para crear, actualizar o eliminar objetos en lote"""
+        items = self.get_bulk_items(request)
+        if request.method == 'POST':
+            response = self.perform_bulk_create(items)
+        elif request.method == 'DELETE':
+            response = self.perform_bulk_destroy(items)
+        else:
+            response = self.perform_bulk_update(items, partial=request.method == 'PATCH')
+        if response.status_code < 400:
+            # Las operaciones en lote no emiten señales post_save
+            invalidate_user_cache(request.user.id)
+        return response
+
+    def perform_bulk_create(self, items):
+        context = self.get_bulk_serializer_context(items)
+        serializer = self.bulk_serializer_class(data=items, many=True, context=context)
+        if not serializer.is_valid():
+            return self._bulk_response_errors(serializer.errors)
+
+        model = self.bulk_serializer_class.Meta.model
+        extra = self.get_bulk_save_kwargs()
+        objects = [model(**data, **extra) for data in serializer.validated_data]
+        with transaction.atomic():
+            created = model.objects.bulk_create(objects, batch_size=settings.API_BULK_BATCH_SIZE)
+            self.bulk_created(created)
+        data = self.bulk_serializer_class(created, many=True, context=context).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def perform_bulk_update(self, items, partial):
+        ids = [item.get('id') if isinstance(item, dict) else None for item in items]
+        invalid = [pk is not None and (not isinstance(pk, int) or isinstance(pk, bool)) for pk in ids]
+        if any(invalid):
+            return self._bulk_response_errors([
+                {'id': ['Se esperaba un id entero.']} if is_invalid else {} for is_invalid in invalid
+            ])
+        if len(set(ids)) != len(ids):
+            raise ValidationError({'non_field_errors': ['Hay ids repetidos en el lote.']})
+        context = self.get_bulk_serializer_context(items)
+
+        with transaction.atomic():
+            # Se bloquean las filas hasta escribir: una petición concurrente no
+            # puede modificarlas entre la validación y bulk_update. `of` limita
+            # el bloqueo a la tabla del modelo, no a las de select_related
+            instances = self.get_queryset().select_for_update(of=('self',)).in_bulk(
+                [pk for pk in ids if isinstance(pk, int)]
+            )
+            errors, serializers_ = [], []
+            for item, pk in zip(items, ids):
+                instance = instances.get(pk)
+                if instance is None:
+                    errors.append({'id': ['No encontrado.']})
+                    continue
+                serializer = self.bulk_serializer_class(instance, data=item, partial=partial, context=context)
+                errors.append({} if serializer.is_valid() else serializer.errors)
+                serializers_.append(serializer)
+            if any(errors):
+                return self._bulk_response_errors(errors)
+
+            fields = {'updated_at'}
+            now = timezone.now()
+            for serializer in serializers_:
+                for attr, value in serializer.validated_data.items():
+                    setattr(serializer.instance, attr, value)
+                    fields.add(attr)
+                serializer.instance.updated_at = now
+
+            updated = [serializer.instance for serializer in serializers_]
+            self.get_queryset().model.objects.bulk_update(
+                updated, sorted(fields), batch_size=settings.API_BULK_BATCH_SIZE
+            )
+            self.bulk_updated(updated)
+        return Response(self.bulk_serializer_class(updated, many=True, context=context).data)
+
+    def perform_bulk_destroy(self, items):
+        if not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in items):
+            raise ValidationError({'non_field_errors': ['Se esperaba una lista de ids.']})
+        queryset = self.get_queryset().filter(pk__in=items)
+        with transaction.atomic():
+            # Se bloquean las filas: una eliminación concurrente no se descuenta dos veces
+            rows = list(queryset.select_for_update().values('id', *self.bulk_deletion_fields))
+            found = {row['id'] for row in rows}
+            errors = [{} if pk in found else {'id': ['No encontrado.']} for pk in items]
+            if any(errors):
+                return self._bulk_response_errors(errors)
+            self.bulk_deleting(rows)
+            with bulk_deletion():
+                queryset.delete()
+        return Response({'deleted': len(found)})
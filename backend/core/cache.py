@@ -0,0 +1,151 @@
+import functools
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+API_CACHE_ALIAS = 'api'
+
+
+def get_api_cache():
+    return caches[API_CACHE_ALIAS]
+
+
+def _generation_key(user_id):
+    return f'api:gen:{user_id}'
+
+
+def get_user_generation(user_id):
+    """
+    Generación actual de la caché de un usuario. Las claves de las respuestas
+    la incluyen, de modo que al incrementarla todas las entradas anteriores
+    quedan obsoletas sin necesidad de enumerarlas (válido para backends
+    compartidos como Redis o Memcached).
+    """
+    cache = get_api_cache()
+    generation = cache.get(_generation_key(user_id))
+    if generation is None:
+        generation = 1
+        cache.add(_generation_key(user_id), generation, timeout=None)
+    return generation
+
+
+async def aget_user_generation(user_id):
+    """Versión asíncrona de `get_user_generation`."""
+    cache = get_api_cache()
+    generation = await cache.aget(_generation_key(user_id))
+    if generation is None:
+        generation = 1
+        await cache.aadd(_generation_key(user_id), generation, timeout=None)
+    return generation
+
+
+def invalidate_user_cache(user_id):
+    """Invalida todas las respuestas cacheadas de un usuario."""
+    if user_id is None:
+        return
+    cache = get_api_cache()
+    try:
+        cache.incr(_generation_key(user_id))
+    except ValueError:
+        # La clave no existe todavía o fue expulsada: se crea con un valor nuevo
+        cache.set(_generation_key(user_id), 2, timeout=None)
+
+
+def _response_cache_key(view, request, generation):
+    digest = hashlib.sha256(request.build_absolute_uri().encode('utf-8')).hexdigest()
+    return f'api:resp:{request.user.id}:{generation}:{view.__class__.__name__}:{view.action}:{digest}'
+
+
+def get_response_cache_key(view, request):
+    """
+    Clave de la respuesta: usuario, generación, vista, acción y URL completa
+    (incluye los parámetros de consulta y el cursor de paginación).
+    """
+    return _response_cache_key(view, request, get_user_generation(request.user.id))
+
+
+async def aget_response_cache_key(view, request):
+    """Versión asíncrona de `get_response_cache_key`."""
+    return _response_cache_key(view, request, await aget_user_generation(request.user.id))
+
+
+def _to_cacheable(data):
+    """
+    Copia los datos de la respuesta sin las referencias al serializador que
+    guardan ReturnList/ReturnDict, para que puedan serializarse en la caché.
+    """
+    if isinstance(data, dict):
+        return {key: _to_cacheable(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_to_cacheable(item) for item in data]
+    return data
+
+
+def _is_cacheable(request):
+    return request.method == 'GET' and getattr(settings, 'API_CACHE_ENABLED', True)
+
+
+def _get_cached_response(view, request):
+    """Clave de la respuesta y la respuesta cacheada, o `(None, None)` si no se cachea."""
+    if not _is_cacheable(request):
+        return None, None
+    key = get_response_cache_key(view, request)
+    cached = get_api_cache().get(key)
+    return key, Response(cached) if cached is not None else None
+
+
+async def _aget_cached_response(view, request):
+    if not _is_cacheable(request):
+        return None, None
+    key = await aget_response_cache_key(view, request)
+    cached = await get_api_cache().aget(key)
+    return key, Response(cached) if cached is not None else None
+
+
+def _store_response(key, response):
+    if key is not None and response.status_code == status.HTTP_200_OK:
+        get_api_cache().set(key, _to_cacheable(response.data), timeout=settings.API_CACHE_TIMEOUT)
+
+
+async def _astore_response(key, response):
+    if key is not None and response.status_code == status.HTTP_200_OK:
+        await get_api_cache().aset(key, _to_cacheable(response.data), timeout=settings.API_CACHE_TIMEOUT)
+
+
+def cache_list_response(method):
+    """
+    Decorador para acciones de listado de un ViewSet que cachea la respuesta
+    por usuario. Solo se guardan las respuestas 200 a peticiones GET; la
+    invalidación se realiza desde las señales de `core.signals`.
+    """
+    @functools.wraps(method)
+    def wrapper(view, request, *args, **kwargs):
+        key, cached = _get_cached_response(view, request)
+        if cached is not None:
+            return cached
+        response = method(view, request, *args, **kwargs)
+        _store_response(key, response)
+        return response
+
+    return wrapper
+
+
+def acache_list_response(method):
+    """
+    Versión de `cache_list_response` para acciones asíncronas. La caché se usa
+    con su API asíncrona (`aget`, `aset`) para no bloquear el bucle de eventos
+    con la red de un backend compartido como Redis.
+    """
+    @functools.wraps(method)
+    async def wrapper(view, request, *args, **kwargs):
+        key, cached = await _aget_cached_response(view, request)
+        if cached is not None:
+            return cached
+        response = await method(view, request, *args, **kwargs)
+        await _astore_response(key, response)
+        return response
+
+    return wrapper
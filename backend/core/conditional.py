@@ -0,0 +1,162 @@
+import functools
+import hashlib
+from functools import reduce
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+def _make_etag(*parts):
+    """ETag fuerte a partir de los valores que determinan la representación."""
+    digest = hashlib.sha256('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return quote_etag(digest)
+
+
+def _latest(values):
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def _set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def _evaluate_preconditions(request, etag, last_modified):
+    """
+    Evalúa If-Match / If-Unmodified-Since / If-None-Match / If-Modified-Since.
+    Devuelve la respuesta 304/412 correspondiente o `None` si la petición debe
+    continuar.
+    """
+    response = get_conditional_response(
+        request._request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified is not None else None,
+    )
+    if response is not None:
+        _set_validators(response, etag, last_modified)
+    return response
+
+
+class ConditionalRequestMixin:
+    """
+    Añade validadores (ETag fuerte y Last-Modified) derivados de `updated_at`.
+
+    - `retrieve` responde 304 sin serializar cuando If-None-Match o
+      If-Modified-Since coinciden.
+    - `update`/`partial_update` respetan If-Match y responden 412 si el objeto
+      cambió desde que el cliente lo leyó.
+    - Las acciones de listado decoradas con `conditional_list_response`
+      calculan su ETag con una única agregación (max + count). No emiten
+      Last-Modified: max(updated_at) no cambia al eliminar una fila ni cuando
+      una fila deja de cumplir un filtro, y un 304 por If-Modified-Since
+      devolvería filas que ya no están.
+
+    `validator_fields` enumera los campos de fecha que afectan a la
+    representación; p. ej. un proyecto incluye el nombre de su cliente.
+    """
+    validator_fields = ('updated_at',)
+
+    def _resolve_field(self, obj, field):
+        return reduce(getattr, field.split('__'), obj)
+
+    def get_object_validators(self, obj):
+        values = [self._resolve_field(obj, field) for field in self.validator_fields]
+        etag = _make_etag(
+            self.__class__.__name__, obj.pk, *values, self.request.query_params.urlencode()
+        )
+        return etag, _latest(values)
+
+    def _get_list_validator_aggregates(self):
+        aggregates = {f'max_{i}': Max(field) for i, field in enumerate(self.validator_fields)}
+        return {'count': Count('pk'), **aggregates}
+
+    def get_list_validators(self):
+        result = self.get_queryset().order_by().aggregate(**self._get_list_validator_aggregates())
+        return self._get_list_validators_from(result)
+
+    async def aget_list_validators(self):
+        result = await self.get_queryset().order_by().aaggregate(**self._get_list_validator_aggregates())
+        return self._get_list_validators_from(result)
+
+    def _get_list_validators_from(self, result):
+        values = [result[f'max_{i}'] for i in range(len(self.validator_fields))]
+        etag = _make_etag(
+            self.__class__.__name__, self.action, self.request.user.id,
+            result['count'], *values, self.request.get_full_path()
+        )
+        return etag, None
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = self.get_object_validators(instance)
+        not_modified = _evaluate_preconditions(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(instance)
+        return _set_validators(Response(serializer.data), etag, last_modified)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """Versión asíncrona de `retrieve` (ver `core.async_views`)."""
+        instance = await self.aget_object()
+        etag, last_modified = self.get_object_validators(instance)
+        not_modified = _evaluate_preconditions(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(instance)
+        return _set_validators(Response(serializer.data), etag, last_modified)
+
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+        etag, last_modified = self.get_object_validators(instance)
+        precondition_failed = _evaluate_preconditions(request, etag, last_modified)
+        if precondition_failed is not None:
+            return precondition_failed
+
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+
+        response = Response(serializer.data)
+        return _set_validators(response, *self.get_object_validators(serializer.instance))
+
+
+def conditional_list_response(method):
+    """
+    Decorador para acciones de listado de un ViewSet con `ConditionalRequestMixin`.
+    Responde 304 antes de consultar las filas o serializar si los validadores
+    coinciden, y añade ETag / Last-Modified a la respuesta en otro caso.
+    """
+    @functools.wraps(method)
+    def wrapper(view, request, *args, **kwargs):
+        etag, last_modified = view.get_list_validators()
+        not_modified = _evaluate_preconditions(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        response = method(view, request, *args, **kwargs)
+        if response.status_code == 200:
+            _set_validators(response, etag, last_modified)
+        return response
+
+    return wrapper
+
+
+def aconditional_list_response(method):
+    """Versión de `conditional_list_response` para acciones asíncronas."""
+    @functools.wraps(method)
+    async def wrapper(view, request, *args, **kwargs):
+        etag, last_modified = await view.aget_list_validators()
+        not_modified = _evaluate_preconditions(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        response = await method(view, request, *args, **kwargs)
+        if response.status_code == 200:
+            _set_validators(response, etag, last_modified)
+        return response
+
+    return wrapper
@@ -0,0 +1,89 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Now
+
+from .cache import invalidate_user_cache
+
+# Campo de Client que cuenta los proyectos de cada estado
+STATUS_COUNTER_FIELDS = {
+    'pendiente': 'pending_project_count',
+    'en_progreso': 'in_progress_project_count',
+    'completado': 'completed_project_count',
+}
+COUNTER_FIELDS = ('project_count', *STATUS_COUNTER_FIELDS.values())
+
+
+class CounterDeltas:
+    """
+    Acumula los cambios de los contadores por cliente para aplicarlos con un
+    UPDATE ... SET campo = campo + n por cliente afectado.
+    """
+
+    def __init__(self):
+        self._deltas = defaultdict(lambda: defaultdict(int))
+
+    def add(self, client_id, status, amount):
+        if client_id is None or not amount:
+            return
+        self._deltas[client_id]['project_count'] += amount
+        if status in STATUS_COUNTER_FIELDS:
+            self._deltas[client_id][STATUS_COUNTER_FIELDS[status]] += amount
+
+    def move(self, old, new):
+        """Registra el paso de un proyecto de (cliente, estado) `old` a `new`."""
+        if old == new:
+            return
+        self.add(*old, -1)
+        self.add(*new, 1)
+
+    def apply(self):
+        from .models import Client
+
+        for client_id, fields in self._deltas.items():
+            changes = {field: F(field) + amount for field, amount in fields.items() if amount}
+            if changes:
+                # Los contadores forman parte de la representación del cliente, pero no de
+                # la de sus proyectos: se marca counters_updated_at y no updated_at
+                Client.objects.filter(pk=client_id).update(counters_updated_at=Now(), **changes)
+        self._deltas.clear()
+
+
+def recompute_client_counters(queryset=None, batch_size=500):
+    """
+    Recalcula los contadores a partir de la tabla de proyectos con subconsultas
+    correlacionadas. Solo se actualizan los clientes cuyos contadores difieren:
+    se marca `counters_updated_at` (validador de la representación) y se
+    invalida la caché de respuestas de sus propietarios. Devuelve el número de
+    clientes corregidos.
+    """
+    from .models import Client, Project
+
+    if queryset is None:
+        queryset = Client.objects.all()
+
+    def count(condition=Q()):
+        subquery = (
+            Project.objects.filter(condition, client=OuterRef('pk'))
+            .order_by().values('client').annotate(total=Count('id')).values('total')
+        )
+        return Coalesce(Subquery(subquery, output_field=IntegerField()), 0)
+
+    values = {'project_count': count()}
+    for status, field in STATUS_COUNTER_FIELDS.items():
+        values[field] = count(Q(status=status))
+    drifted = Q()
+    for field in values:
+        drifted |= ~Q(**{field: F(f'expected_{field}')})
+    with transaction.atomic():
+        stale = list(
+            queryset.annotate(**{f'expected_{field}': value for field, value in values.items()})
+            .filter(drifted).order_by().values_list('id', 'user_id')
+        )
+        for start in range(0, len(stale), batch_size):
+            ids = [pk for pk, _ in stale[start:start + batch_size]]
+            Client.objects.filter(pk__in=ids).update(counters_updated_at=Now(), **values)
+    for user_id in {user_id for _, user_id in stale}:
+        invalidate_user_cache(user_id)
+    return len(stale)
@@ -0,0 +1,119 @@
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+
+from .values import resolve_lookup
+
+
+def _split(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def sparse_fieldset_parameters(allowed):
+    """Documentación de `?fields=` / `?exclude=` para un conjunto de campos permitidos."""
+    allowed = ', '.join(allowed)
+    return [
+        OpenApiParameter(
+            name="fields",
+            description=f"Campos a devolver, separados por comas. Permitidos: {allowed}",
+            required=False,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="exclude",
+            description=f"Campos a omitir, separados por comas. Permitidos: {allowed}",
+            required=False,
+            type=str,
+        ),
+    ]
+
+
+class SparseFieldsetMixin:
+    """
+    Permite pedir solo algunos campos en las lecturas con `?fields=a,b` y/o
+    `?exclude=c`, validados contra `sparse_fields`.
+
+    Además de recortar el serializador, la selección se traslada a la consulta
+    con `.only()`, y la relación con el cliente solo se carga (select_related)
+    si algún campo elegido la necesita, p. ej. `client_name`. En los listados
+    la vía de `.values()` ya lee únicamente las columnas del serializador recortado.
+    """
+    sparse_fields = ()
+    sparse_actions = ('list', 'retrieve', 'by_status')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.sparse_fieldset = self.get_sparse_fieldset(request)
+
+    def get_sparse_fieldset(self, request):
+        """Campos elegidos, en el orden del serializador, o `None` si no se recorta."""
+        if request.method not in ('GET', 'HEAD') or self.action not in self.sparse_actions:
+            return None
+        fields = request.query_params.get('fields')
+        exclude = request.query_params.get('exclude')
+        if not fields and not exclude:
+            return None
+
+        errors = {}
+        requested = {}
+        for param, value in (('fields', fields), ('exclude', exclude)):
+            names = _split(value or '')
+            invalid = [name for name in names if name not in self.sparse_fields]
+            if invalid:
+                errors[param] = (
+                    f"Campos no válidos: {', '.join(invalid)}. "
+                    f"Permitidos: {', '.join(self.sparse_fields)}"
+                )
+            requested[param] = set(names)
+        if errors:
+            raise ValidationError(errors)
+
+        selected = [
+            name for name in self.sparse_fields
+            if (not requested['fields'] or name in requested['fields']) and name not in requested['exclude']
+        ]
+        if not selected:
+            raise ValidationError({'fields': 'Se debe seleccionar al menos un campo.'})
+        return selected
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        selected = getattr(self, 'sparse_fieldset', None)
+        if selected is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in selected:
+                    target.fields.pop(name)
+        return serializer
+
+    def get_sparse_lookups(self, queryset):
+        """
+        Columnas necesarias para la selección: las de los campos elegidos, las de
+        ordenación de la paginación y, en el detalle, las de los validadores.
+        """
+        serializer = self.get_serializer()
+        lookups = []
+        for field in serializer._readable_fields:
+            lookup = resolve_lookup(serializer.Meta.model, field.source_attrs) if field.source != '*' else None
+            if lookup is None:
+                return None
+            lookups.append(lookup)
+        if self.detail:
+            lookups.extend(getattr(self, 'validator_fields', ()))
+        else:
+            lookups.extend(self.get_pagination_lookups(queryset))
+        return lookups
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if getattr(self, 'sparse_fieldset', None) is None:
+            return queryset
+        lookups = self.get_sparse_lookups(queryset)
+        if lookups is None:
+            return queryset
+        # Las anotaciones (p. ej. search_rank) ya forman parte de la consulta
+        lookups = [lookup for lookup in lookups if lookup not in queryset.query.annotations]
+        relations = {lookup.rsplit('__', 1)[0] for lookup in lookups if '__' in lookup}
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*lookups)
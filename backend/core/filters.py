@@ -0,0 +1,89 @@
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .pagination import order_queryset
+from .serializers import ProjectFilterSerializer
+
+# Estados en los que un proyecto con la fecha de entrega pasada se considera vencido
+OPEN_STATUSES = ('pendiente', 'en_progreso')
+
+
+class CollectionFilterMixin:
+    """
+    Aplica `filter_backends` solo en las acciones de colección (listado,
+    `by_status`...). En las de detalle `get_object` también filtra el queryset,
+    y un `?status=` o `?q=` que no coincidiera con el objeto daría 404 en
+    `retrieve`, `update` o `destroy`, o 400 si el valor no fuese válido.
+    """
+
+    def filter_queryset(self, queryset):
+        if self.detail:
+            return queryset
+        return super().filter_queryset(queryset)
+
+
+class KeysetOrderingFilter(BaseFilterBackend):
+    """
+    `?ordering=campo` o `?ordering=-campo` sobre uno de los `ordering_fields`
+    de la vista, con `id` como desempate en el mismo sentido. Solo se admite un
+    campo porque la paginación por cursor pagina sobre el par (campo, id).
+    """
+    ordering_param = 'ordering'
+
+    def get_ordering(self, request, queryset, view):
+        value = request.query_params.get(self.ordering_param, '').strip()
+        if not value:
+            return None
+        allowed = view.ordering_fields
+        if value.lstrip('-') not in allowed or value.startswith('--'):
+            raise ValidationError({self.ordering_param: (
+                f"Orden no válido: {value}. Valores permitidos: "
+                f"{', '.join(allowed)} (con '-' para orden descendente)"
+            )})
+        return (value, '-id' if value.startswith('-') else 'id')
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        return order_queryset(queryset, ordering) if ordering else queryset
+
+    def get_schema_operation_parameters(self, view):
+        choices = [value for field in view.ordering_fields for value in (field, f'-{field}')]
+        return [{
+            'name': self.ordering_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Campo por el que ordenar; con "-" en orden descendente.',
+            'schema': {'type': 'string', 'enum': choices},
+        }]
+
+
+class ProjectFilterBackend(BaseFilterBackend):
+    """
+    Filtros validados del listado de proyectos (ver `ProjectFilterSerializer`).
+    Cada combinación se apoya en un índice que empieza por `client`:
+    estado (`project_client_status_idx`), fechas de inicio
+    (`project_client_start_idx`) y fechas de entrega o vencidos
+    (`project_client_end_idx`).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        serializer = ProjectFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        filters = serializer.validated_data
+
+        conditions = Q()
+        if 'status' in filters:
+            conditions &= Q(status__in=filters['status'])
+        if 'client' in filters:
+            conditions &= Q(client_id=filters['client'])
+        for field in ('start_date', 'end_date'):
+            if f'{field}_after' in filters:
+                conditions &= Q(**{f'{field}__gte': filters[f'{field}_after']})
+            if f'{field}_before' in filters:
+                conditions &= Q(**{f'{field}__lte': filters[f'{field}_before']})
+        if filters.get('overdue') is not None:
+            overdue = Q(status__in=OPEN_STATUSES, end_date__lt=timezone.localdate())
+            conditions &= overdue if filters['overdue'] else ~overdue
+        return queryset.filter(conditions) if conditions else queryset
@@ -0,0 +1,234 @@
+import csv
+import io
+import time
+
+from django.conf import settings
+from django.db import transaction
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+
+from .cache import invalidate_user_cache
+from .counters import CounterDeltas
+from .models import Client, Project
+from .serializers import ClientBulkSerializer, ProjectBulkSerializer
+
+# Número máximo de filas rechazadas que se detallan en el informe (se cuentan todas)
+MAX_REPORTED_REJECTIONS = 1000
+
+
+class ImportReport:
+    """
+    Resultado de una importación: filas creadas, rechazadas y rendimiento. Si
+    el fichero deja de poder leerse a mitad (codificación o CSV mal formado),
+    `error` indica la línea y el motivo; las filas anteriores sí se importaron.
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.rejected = 0
+        self.rejections = []
+        self.error = None
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def reject(self, line, errors):
+        self.rejected += 1
+        if len(self.rejections) < MAX_REPORTED_REJECTIONS:
+            self.rejections.append({'line': line, 'errors': errors})
+
+    def fail(self, line, exc):
+        self.error = {'line': line, 'message': str(exc)}
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    @property
+    def rows_per_second(self):
+        processed = self.created + self.rejected
+        return processed / self.elapsed if self.elapsed else float(processed)
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'rejected': self.rejected,
+            'elapsed_seconds': round(self.elapsed, 3),
+            'rows_per_second': round(self.rows_per_second, 1),
+            'rejections': self.rejections,
+            'error': self.error,
+        }
+
+
+class CSVImporter:
+    """
+    Importa un CSV en streaming: lee las filas de una en una, valida cada lote
+    con el serializador en lote correspondiente (las mismas reglas que la API,
+    p. ej. `validate_email`/`validate_phone`) y las inserta con `bulk_create` en
+    transacciones de `batch_size` filas. La memoria depende del tamaño de lote,
+    no del tamaño del fichero.
+
+    Cada lote se confirma por separado: si el fichero deja de poder leerse, se
+    importan las filas leídas hasta ese punto y el informe indica la línea del
+    error en lugar de descartar lo ya confirmado.
+    """
+    model = None
+    serializer_class = None
+
+    def __init__(self, user_id, batch_size=1000):
+        self.user_id = user_id
+        self.batch_size = batch_size
+
+    def get_context(self, rows):
+        return {}
+
+    def get_save_kwargs(self):
+        return {}
+
+    def after_batch(self, objects):
+        """Se llama dentro de la transacción de cada lote tras insertarlo."""
+
+    def clean_row(self, row):
+        # Las celdas vacías se tratan como ausentes (p. ej. end_date opcional)
+        return {key: value for key, value in row.items() if key and value not in ('', None)}
+
+    def run(self, text_stream):
+        report = ImportReport()
+        reader = csv.DictReader(text_stream)
+        batch = []
+        try:
+            try:
+                for row in reader:
+                    batch.append((reader.line_num, row))
+                    if len(batch) >= self.batch_size:
+                        self.import_batch(batch, report)
+                        batch = []
+            except UnicodeDecodeError as exc:
+                # El texto se decodifica por bloques: la línea siguiente es la primera no leída
+                report.fail(reader.line_num + 1, exc)
+            except csv.Error as exc:
+                report.fail(reader.line_num, exc)
+            if batch:
+                self.import_batch(batch, report)
+        finally:
+            # También si falla un lote: los anteriores ya están confirmados
+            if report.created:
+                invalidate_user_cache(self.user_id)
+        return report.finish()
+
+    def import_batch(self, batch, report):
+        rows = [self.clean_row(row) for _, row in batch]
+        context = self.get_context(rows)
+        objects = []
+        for (line, _), row in zip(batch, rows):
+            serializer = self.serializer_class(data=row, context=context)
+            if serializer.is_valid():
+                objects.append(self.model(**serializer.validated_data, **self.get_save_kwargs()))
+            else:
+                report.reject(line, serializer.errors)
+        if objects:
+            with transaction.atomic():
+                self.model.objects.bulk_create(objects, batch_size=self.batch_size)
+                self.after_batch(objects)
+            report.created += len(objects)
+
+
+class ClientCSVImporter(CSVImporter):
+    """Columnas: name, email, phone."""
+    model = Client
+    serializer_class = ClientBulkSerializer
+
+    def get_save_kwargs(self):
+        return {'user_id': self.user_id}
+
+
+class ProjectCSVImporter(CSVImporter):
+    """
+    Columnas: name, description, status, start_date, end_date y la referencia
+    al cliente, ya sea por id (`client`) o por nombre (`client_name`). Las
+    referencias de cada lote se resuelven con una consulta por tipo.
+    """
+    model = Project
+    serializer_class = ProjectBulkSerializer
+
+    def after_batch(self, objects):
+        # bulk_create no emite señales: los contadores del cliente se ajustan aquí
+        deltas = CounterDeltas()
+        for project in objects:
+            deltas.add(project.client_id, project.status, 1)
+        deltas.apply()
+
+    def clean_row(self, row):
+        row = super().clean_row(row)
+        client_name = row.pop('client_name', None)
+        if 'client' not in row and client_name is not None:
+            # Se marca para resolverla por nombre en get_context
+            row['client'] = ('name', client_name)
+        return row
+
+    def get_context(self, rows):
+        ids, names = set(), set()
+        for row in rows:
+            reference = row.get('client')
+            if isinstance(reference, tuple):
+                names.add(reference[1])
+            else:
+                try:
+                    ids.add(int(reference))
+                except (TypeError, ValueError):
+                    continue
+
+        owned = Client.objects.filter(user_id=self.user_id)
+        owned_clients = owned.filter(pk__in=ids).in_bulk() if ids else {}
+        if names:
+            by_name = {}
+            for client in owned.filter(name__in=names).order_by('id'):
+                by_name.setdefault(client.name, client)
+            for row in rows:
+                reference = row.get('client')
+                if isinstance(reference, tuple):
+                    client = by_name.get(reference[1])
+                    # Se sustituye el nombre por el id; un nombre desconocido se rechaza al validar
+                    row['client'] = client.pk if client is not None else reference[1]
+                    if client is not None:
+                        owned_clients[client.pk] = client
+        return {'owned_clients': owned_clients}
+
+
+class CSVImportMixin:
+    """
+    Acción `import/` que recibe un CSV como `multipart/form-data` (campo
+    `file`) y lo importa con `csv_importer_class`. Django guarda los ficheros
+    grandes en disco, y la lectura se hace en streaming sobre ese fichero.
+    """
+    csv_importer_class = None
+
+    @extend_schema(
+        request={'multipart/form-data': {
+            'type': 'object',
+            'properties': {'file': {'type': 'string', 'format': 'binary'}},
+            'required': ['file'],
+        }},
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_csv(self, request):
+        """Endpoint para importar filas desde un fichero CSV"""
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'Se requiere el fichero CSV en el campo file'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        try:
+            report = self.csv_importer_class(
+                request.user.id, batch_size=settings.IMPORT_BATCH_SIZE
+            ).run(stream)
+        finally:
+            stream.detach()
+        if report.error is not None:
+            # Las filas anteriores a la línea del error ya se importaron
+            return Response(report.as_dict(), status=status.HTTP_400_BAD_REQUEST)
+        return Response(report.as_dict())
@@ -0,0 +1,199 @@
+import contextvars
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('core.performance')
+
+# Consultas que se conservan por petición para el registro de peticiones lentas
+MAX_SAMPLED_QUERIES = 50
+MAX_QUERY_LENGTH = 2000
+
+_request_metrics = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Tiempos acumulados de una petición: SQL y fases como `serialize` o `render`."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.queries = []
+        self.timings = {}
+        self.serializing = False
+
+    def add(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def record_query(self, sql, seconds):
+        self.sql_count += 1
+        self.sql_time += seconds
+        if len(self.queries) < MAX_SAMPLED_QUERIES:
+            self.queries.append((sql[:MAX_QUERY_LENGTH], seconds))
+
+
+def get_request_metrics():
+    """Métricas de la petición en curso, o `None` si la instrumentación está desactivada."""
+    return _request_metrics.get()
+
+
+@contextmanager
+def timed(name):
+    """Suma la duración del bloque a la fase `name` de la petición en curso."""
+    metrics = _request_metrics.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(name, time.perf_counter() - started)
+
+
+def record_query(execute, sql, params, many, context):
+    """`execute_wrapper` que mide cada consulta de la petición en curso."""
+    metrics = _request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, time.perf_counter() - started)
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def enable_query_recording():
+    """Instala `record_query` en las conexiones que se abran a partir de ahora."""
+    connection_created.connect(install_query_recorder, dispatch_uid='core.instrumentation')
+
+
+def start_request_metrics():
+    """Empieza a medir la petición en curso; devuelve las métricas y el token para `reset_request_metrics`."""
+    # Las conexiones abiertas antes de activar la instrumentación no pasaron por connection_created
+    for alias in connections:
+        install_query_recorder(connections[alias])
+    metrics = RequestMetrics()
+    return metrics, _request_metrics.set(metrics)
+
+
+def reset_request_metrics(token):
+    _request_metrics.reset(token)
+
+
+class TimedRepresentationMixin:
+    """
+    Mixin de serializador que suma a la fase `serialize` el tiempo de
+    `to_representation`. Solo se mide el nivel exterior, de modo que los
+    serializadores anidados no se cuentan dos veces.
+    """
+
+    def to_representation(self, instance):
+        metrics = _request_metrics.get()
+        if metrics is None or metrics.serializing:
+            return super().to_representation(instance)
+        metrics.serializing = True
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializing = False
+            metrics.add('serialize', time.perf_counter() - started)
+
+
+def _server_timing(metrics, total):
+    entries = [
+        f'total;dur={total * 1000:.1f}',
+        f'db;dur={metrics.sql_time * 1000:.1f};desc="{metrics.sql_count} queries"',
+    ]
+    entries.extend(f'{name};dur={seconds * 1000:.1f}' for name, seconds in metrics.timings.items())
+    return ', '.join(entries)
+
+
+class PerformanceMiddleware:
+    """
+    Instrumentación por petición, activada con `API_INSTRUMENTATION`:
+
+    - tiempo total, número de consultas SQL y su tiempo (medido con un
+      `execute_wrapper` en cada conexión), y las fases `serialize` y `render`
+      de las vistas de DRF;
+    - cabecera `Server-Timing` con esos valores y una línea de log JSON por
+      petición en el logger `core.performance`;
+    - las peticiones de más de `API_SLOW_REQUEST_MS` se registran, con una
+      proporción `API_SLOW_REQUEST_SAMPLE_RATE`, junto con el texto de sus consultas.
+
+    Desactivada, Django la descarta al arrancar y no añade ningún coste. En las
+    respuestas en streaming el tiempo total no incluye el envío del cuerpo.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'API_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        enable_query_recording()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics, token = start_request_metrics()
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_request_metrics(token)
+        return self._finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics, token = start_request_metrics()
+        try:
+            response = await self.get_response(request)
+        finally:
+            reset_request_metrics(token)
+        return self._finish(request, response, metrics)
+
+    def process_template_response(self, request, response):
+        # Las respuestas de DRF se renderizan justo después de este método
+        metrics = _request_metrics.get()
+        if metrics is not None:
+            started = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: metrics.add('render', time.perf_counter() - started)
+            )
+        return response
+
+    def _finish(self, request, response, metrics):
+        total = time.perf_counter() - metrics.started
+        response['Server-Timing'] = _server_timing(metrics, total)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': getattr(request.resolver_match, 'view_name', None),
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            'db_ms': round(metrics.sql_time * 1000, 2),
+            'queries': metrics.sql_count,
+            **{f'{name}_ms': round(seconds * 1000, 2) for name, seconds in metrics.timings.items()},
+        }
+        logger.info(json.dumps(record))
+        if total * 1000 >= settings.API_SLOW_REQUEST_MS and random.random() < settings.API_SLOW_REQUEST_SAMPLE_RATE:
+            record['slow'] = True
+            record['sql'] = [{'sql': sql, 'ms': round(seconds * 1000, 2)} for sql, seconds in metrics.queries]
+            logger.warning(json.dumps(record))
+        return response
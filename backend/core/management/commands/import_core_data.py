@@ -0,0 +1,58 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importers import ClientCSVImporter, ProjectCSVImporter
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa clientes y proyectos desde ficheros CSV en streaming, insertando "
+        "en lotes acotados con bulk_create."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help='Nombre de usuario propietario de los datos')
+        parser.add_argument('--clients', help='CSV de clientes (name, email, phone)')
+        parser.add_argument(
+            '--projects',
+            help='CSV de proyectos (name, description, status, client o client_name, start_date, end_date)'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Filas por lote (por defecto 1000)')
+        parser.add_argument('--show-rejections', action='store_true', help='Muestra el detalle de las filas rechazadas')
+
+    def handle(self, *args, **options):
+        if not options['clients'] and not options['projects']:
+            raise CommandError('Indica al menos --clients o --projects.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size debe ser mayor que cero.')
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"El usuario '{options['user']}' no existe.")
+
+        # Los clientes se importan primero para que los proyectos puedan referenciarlos
+        for option, importer_class in (('clients', ClientCSVImporter), ('projects', ProjectCSVImporter)):
+            path = options[option]
+            if not path:
+                continue
+            try:
+                with open(path, newline='', encoding='utf-8-sig') as stream:
+                    report = importer_class(user.id, batch_size=options['batch_size']).run(stream)
+            except OSError as exc:
+                raise CommandError(f'No se pudo leer {path}: {exc}')
+            summary = (
+                f'{option}: {report.created} creados, {report.rejected} rechazados '
+                f'en {report.elapsed:.2f}s ({report.rows_per_second:.0f} filas/s)'
+            )
+            self.stdout.write(self.style.WARNING(summary) if report.error else self.style.SUCCESS(summary))
+            if options['show_rejections']:
+                for rejection in report.rejections:
+                    self.stdout.write(f"  línea {rejection['line']}: {json.dumps(rejection['errors'], ensure_ascii=False)}")
+            if report.error is not None:
+                # Las filas anteriores ya se importaron: no se continúa con el siguiente fichero
+                raise CommandError(
+                    f"{path} no es un CSV válido a partir de la línea {report.error['line']}: "
+                    f"{report.error['message']}"
+                )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.counters import recompute_client_counters
+from core.models import Client
+
+
+class Command(BaseCommand):
+    help = "Recalcula los contadores de proyectos de los clientes a partir de la tabla de proyectos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Recalcular solo los clientes de este nombre de usuario')
+
+    def handle(self, *args, **options):
+        queryset = Client.objects.all()
+        if options['user']:
+            queryset = queryset.filter(user__username=options['user'])
+        updated = recompute_client_counters(queryset)
+        self.stdout.write(self.style.SUCCESS(f'Contadores corregidos en {updated} clientes'))
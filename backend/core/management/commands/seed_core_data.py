@@ -0,0 +1,96 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from core.seeding import SeedPlan, SeedReport, seed_users, user_ranges
+
+
+def _seed_part(plan, start, stop, password_hash):
+    # Cada proceso abre sus propias conexiones: las heredadas se cerraron antes del fork
+    try:
+        return seed_users(plan, start, stop, password_hash)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera usuarios, clientes y proyectos sintéticos deterministas para pruebas de "
+        "capacidad, insertando en lotes grandes con bulk_create."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, required=True, help='Usuarios a generar')
+        parser.add_argument('--clients-per-user', type=int, default=10, help='Clientes por usuario (por defecto 10)')
+        parser.add_argument('--projects-per-client', type=int, default=10,
+                            help='Proyectos por cliente (por defecto 10)')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Filas por lote y transacción (por defecto 5000)')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Procesos en paralelo (por defecto 1; más de uno requiere PostgreSQL)')
+        parser.add_argument('--seed', type=int, default=0, help='Semilla de los datos (por defecto 0)')
+        parser.add_argument('--prefix', default='seed', help="Prefijo de los nombres de usuario (por defecto 'seed')")
+        parser.add_argument('--password', default='password123',
+                            help='Contraseña de todos los usuarios generados (por defecto password123)')
+
+    def handle(self, *args, **options):
+        for option in ('users', 'batch_size', 'workers'):
+            if options[option] < 1:
+                raise CommandError(f"--{option.replace('_', '-')} debe ser mayor que cero.")
+        for option in ('clients_per_user', 'projects_per_client'):
+            if options[option] < 0:
+                raise CommandError(f"--{option.replace('_', '-')} no puede ser negativo.")
+        workers = min(options['workers'], options['users'])
+        if workers > 1 and connection.vendor == 'sqlite':
+            raise CommandError('SQLite no admite escrituras concurrentes: usa --workers 1.')
+        if workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+            raise CommandError('--workers requiere una plataforma con fork.')
+
+        plan = SeedPlan(
+            options['users'], options['clients_per_user'], options['projects_per_client'],
+            seed=options['seed'], prefix=options['prefix'], batch_size=options['batch_size'],
+        )
+        if User.objects.filter(username__startswith=plan.prefix).exists():
+            raise CommandError(f"Ya hay usuarios con el prefijo '{plan.prefix}': usa otro --prefix.")
+
+        # Un único hash para todos los usuarios: cada hash cuesta cientos de milisegundos
+        password_hash = make_password(options['password'])
+        started = time.perf_counter()
+        if workers == 1:
+            report = SeedReport()
+            for start, stop in user_ranges(plan, max(1, plan.users * plan.rows_per_user // 100_000)):
+                report.add(seed_users(plan, start, stop, password_hash))
+                self._progress(plan, report, started)
+        else:
+            report = self._seed_in_parallel(plan, workers, password_hash, started)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{report.users} usuarios, {report.clients} clientes y {report.projects} proyectos '
+            f'en {elapsed:.2f}s ({report.rows / elapsed if elapsed else 0:.0f} filas/s)'
+        ))
+
+    def _seed_in_parallel(self, plan, workers, password_hash, started):
+        # Varias partes por proceso para repartir la carga y poder informar del progreso
+        parts = list(user_ranges(plan, workers * 4))
+        connections.close_all()
+        report = SeedReport()
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = [executor.submit(_seed_part, plan, start, stop, password_hash) for start, stop in parts]
+            for future in as_completed(futures):
+                report.add(future.result())
+                self._progress(plan, report, started)
+        return report
+
+    def _progress(self, plan, report, started):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'  {report.users}/{plan.users} usuarios, {report.rows} filas '
+            f'({report.rows / elapsed if elapsed else 0:.0f} filas/s)'
+        )
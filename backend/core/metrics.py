@@ -0,0 +1,415 @@
+"""
+Registro de métricas en proceso con exposición en el formato de texto de
+Prometheus (`GET /metrics/`), sin dependencias externas.
+
+Con `API_METRICS` activado, `MetricsMiddleware` registra por acción de la vista
+(`ClientViewSet.list`, `ProjectViewSet.by_status`,
+`ExtendedTokenObtainPairView.post`...) y código de estado:
+
+- `api_request_duration_seconds`: histograma de latencia; su `_count` es el
+  número de peticiones;
+- `api_request_queries`: histograma de consultas SQL por petición;
+- `db_pool_connections` y `db_pool_max_connections`: estado de los pools de
+  `core.backends.postgresql_pool`, leído al exportar.
+
+Modo multiproceso: con varios workers de gunicorn cada proceso tiene su propio
+registro. Con `API_METRICS_MULTIPROC_DIR` cada worker vuelca el suyo en
+`metrics_<pid>.json` dentro de ese directorio (como mucho cada
+`API_METRICS_FLUSH_SECONDS`, y siempre al exportar o al terminar) y el endpoint
+suma los ficheros de todos. gunicorn.conf.py vacía el directorio al arrancar y
+acumula los contadores de los workers que terminan.
+"""
+import hmac
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_safe
+
+from .instrumentation import enable_query_recording, get_request_metrics, reset_request_metrics, start_request_metrics
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+PROCESS_FILE_PREFIX = 'metrics_'
+# Contadores e histogramas de los workers ya terminados
+DEAD_PROCESSES_FILE = 'metrics_dead.json'
+
+
+class Metric:
+    """Métrica con etiquetas; cada combinación de valores es una serie."""
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} espera las etiquetas {self.labelnames}, no {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def dump(self):
+        """Estado serializable en JSON, para el modo multiproceso."""
+        with self._lock:
+            series = [[list(key), self._dump_value(value)] for key, value in self._values.items()]
+        return {'type': self.type, 'help': self.documentation, 'labelnames': list(self.labelnames),
+                'series': series}
+
+    def _dump_value(self, value):
+        return value
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """Histograma con cubetas fijas; guarda los recuentos por cubeta, la suma y el total."""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Recuentos no acumulados por cubeta, con +Inf al final
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def dump(self):
+        state = super().dump()
+        state['buckets'] = list(self.buckets)
+        return state
+
+    def _dump_value(self, value):
+        return [list(value[0]), value[1]]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'Ya existe una métrica {metric.name}')
+            self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector):
+        """Función llamada antes de cada exportación, p. ej. para actualizar medidores."""
+        self._collectors.append(collector)
+
+    def collect(self):
+        """Estado de todas las métricas: {nombre: estado}."""
+        for collector in self._collectors:
+            collector()
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.dump() for metric in metrics}
+
+    def clear(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+def merge_states(states):
+    """Suma los estados de varios procesos serie a serie."""
+    merged = {}
+    for state in states:
+        for name, metric in state.items():
+            target = merged.setdefault(name, {**metric, 'series': []})
+            series = {tuple(labels): value for labels, value in target['series']}
+            for labels, value in metric['series']:
+                labels = tuple(labels)
+                current = series.get(labels)
+                if current is None:
+                    series[labels] = value
+                elif metric['type'] == 'histogram':
+                    series[labels] = [[a + b for a, b in zip(current[0], value[0])], current[1] + value[1]]
+                else:
+                    series[labels] = current + value
+            target['series'] = [[list(labels), value] for labels, value in series.items()]
+    return merged
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        return repr(value)
+    return str(value)
+
+
+def _escape(value, quotes=True):
+    value = value.replace('\\', r'\\').replace('\n', r'\n')
+    return value.replace('"', r'\"') if quotes else value
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def render(state):
+    """Texto en el formato de exposición de Prometheus 0.0.4."""
+    lines = []
+    for name in sorted(state):
+        metric = state[name]
+        lines.append(f'# HELP {name} {_escape(metric["help"], quotes=False)}')
+        lines.append(f'# TYPE {name} {metric["type"]}')
+        for labels, value in sorted(metric['series']):
+            pairs = list(zip(metric['labelnames'], labels))
+            if metric['type'] != 'histogram':
+                lines.append(f'{name}{_format_labels(pairs)} {_format_value(value)}')
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip([*metric['buckets'], math.inf], counts):
+                cumulative += count
+                bucket_labels = _format_labels([*pairs, ('le', _format_value(float(bound)))])
+                lines.append(f'{name}_bucket{bucket_labels} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(pairs)} {_format_value(float(total))}')
+            lines.append(f'{name}_count{_format_labels(pairs)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+def _write_json(path, data):
+    # Escritura atómica: quien exporta nunca lee un fichero a medias
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'w') as file:
+        json.dump(data, file)
+    os.replace(temporary, path)
+
+
+def _read_json(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def process_file(path, pid):
+    return os.path.join(path, f'{PROCESS_FILE_PREFIX}{pid}.json')
+
+
+def write_process_metrics(registry, path):
+    """Vuelca el registro del proceso en su fichero del directorio compartido."""
+    os.makedirs(path, exist_ok=True)
+    _write_json(process_file(path, os.getpid()), registry.collect())
+
+
+def read_metrics(path):
+    """Suma las métricas de todos los procesos del directorio compartido."""
+    states = [
+        _read_json(os.path.join(path, filename)) for filename in sorted(os.listdir(path))
+        if filename.startswith(PROCESS_FILE_PREFIX) and filename.endswith('.json')
+    ]
+    return merge_states(states)
+
+
+def mark_process_dead(pid, path):
+    """
+    Acumula los contadores e histogramas de un worker terminado y borra su
+    fichero; sus medidores, que describían un estado que ya no existe, se descartan.
+    """
+    filename = process_file(path, pid)
+    state = _read_json(filename)
+    persistent = {name: metric for name, metric in state.items() if metric['type'] != 'gauge'}
+    if persistent:
+        dead_file = os.path.join(path, DEAD_PROCESSES_FILE)
+        _write_json(dead_file, merge_states([_read_json(dead_file), persistent]))
+    try:
+        os.remove(filename)
+    except FileNotFoundError:
+        pass
+
+
+def clear_process_metrics(path):
+    """Borra los ficheros de métricas de una ejecución anterior."""
+    os.makedirs(path, exist_ok=True)
+    for filename in os.listdir(path):
+        if filename.startswith(PROCESS_FILE_PREFIX):
+            os.remove(os.path.join(path, filename))
+
+
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.register(Histogram(
+    'api_request_duration_seconds', 'Duración de las peticiones por acción y código de estado.',
+    ('action', 'status'), buckets=LATENCY_BUCKETS,
+))
+REQUEST_QUERIES = registry.register(Histogram(
+    'api_request_queries', 'Consultas SQL por petición.', ('action',), buckets=QUERY_COUNT_BUCKETS,
+))
+POOL_CONNECTIONS = registry.register(Gauge(
+    'db_pool_connections', 'Conexiones de los pools de base de datos por estado.', ('pool', 'state'),
+))
+POOL_MAX_CONNECTIONS = registry.register(Gauge(
+    'db_pool_max_connections', 'Tamaño máximo de los pools de base de datos.', ('pool',),
+))
+
+
+def collect_pool_stats():
+    # Sin importar el backend: si no se ha cargado no hay pools
+    backend = sys.modules.get('core.backends.postgresql_pool.base')
+    if backend is None:
+        return
+    for name, pool in backend.pool_stats():
+        idle = pool.idle
+        POOL_CONNECTIONS.set(idle, pool=name, state='idle')
+        POOL_CONNECTIONS.set(pool.size - idle, pool=name, state='in_use')
+        POOL_MAX_CONNECTIONS.set(pool.max_size, pool=name)
+
+
+registry.add_collector(collect_pool_stats)
+
+_last_flush = 0.0
+
+
+def flush(force=False):
+    """En modo multiproceso, vuelca el registro del proceso si toca (o siempre con `force`)."""
+    global _last_flush
+    path = settings.API_METRICS_MULTIPROC_DIR
+    if not path:
+        return
+    now = time.monotonic()
+    if force or now - _last_flush >= settings.API_METRICS_FLUSH_SECONDS:
+        _last_flush = now
+        write_process_metrics(registry, path)
+
+
+def generate_latest():
+    """Texto de exposición con las métricas de este proceso o, en modo multiproceso, de todos."""
+    path = settings.API_METRICS_MULTIPROC_DIR
+    if not path:
+        return render(registry.collect())
+    flush(force=True)
+    return render(read_metrics(path))
+
+
+def resolve_action(request):
+    """Etiqueta de la acción atendida: `<ViewSet>.<acción>` o `<Vista>.<método>`."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        # Sin usar la ruta: cada URL inventada crearía una serie nueva
+        return 'unmatched'
+    view_class = getattr(match.func, 'cls', None) or getattr(match.func, 'view_class', None)
+    if view_class is None:
+        return match.view_name
+    method = request.method.lower()
+    actions = getattr(match.func, 'actions', None) or {}
+    return f'{view_class.__name__}.{actions.get(method, method)}'
+
+
+class MetricsMiddleware:
+    """
+    Registra la latencia y las consultas de cada petición en `registry`. Se
+    descarta al arrancar si `API_METRICS` está desactivado. Reutiliza las
+    medidas de `PerformanceMiddleware` cuando ambos están activos.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'API_METRICS', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        enable_query_recording()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics, token = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            if token is not None:
+                reset_request_metrics(token)
+        self._record(request, response, metrics)
+        return response
+
+    async def __acall__(self, request):
+        metrics, token = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            if token is not None:
+                reset_request_metrics(token)
+        self._record(request, response, metrics)
+        return response
+
+    def _start(self):
+        metrics = get_request_metrics()
+        if metrics is not None:
+            return metrics, None
+        return start_request_metrics()
+
+    def _record(self, request, response, metrics):
+        action = resolve_action(request)
+        REQUEST_DURATION.observe(time.perf_counter() - metrics.started, action=action, status=response.status_code)
+        REQUEST_QUERIES.observe(metrics.sql_count, action=action)
+        flush()
+
+
+@require_safe
+def metrics_view(request):
+    """
+    Métricas en formato Prometheus. Con `API_METRICS_TOKEN` exige la cabecera
+    `Authorization: Bearer <token>`.
+    """
+    if not settings.API_METRICS:
+        raise Http404
+    token = settings.API_METRICS_TOKEN
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401, headers={'WWW-Authenticate': 'Bearer'})
+    return HttpResponse(generate_latest(), content_type=CONTENT_TYPE)
@@ -0,0 +1,29 @@
+# Generated by Django 4.2 on 2026-10-17 18:24
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name='client',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='client_user_created_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='project',
+            index=models.Index(fields=['client', '-created_at', '-id'], name='project_client_created_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='project',
+            index=models.Index(fields=['client', 'status', '-created_at', '-id'], name='project_client_status_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2 on 2026-10-17 18:41
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    Client = apps.get_model('core', 'Client')
+    Project = apps.get_model('core', 'Project')
+
+    def count(condition=Q()):
+        subquery = (
+            Project.objects.filter(condition, client=OuterRef('pk'))
+            .order_by().values('client').annotate(total=Count('id')).values('total')
+        )
+        return Coalesce(Subquery(subquery, output_field=IntegerField()), 0)
+
+    Client.objects.update(
+        project_count=count(),
+        pending_project_count=count(Q(status='pendiente')),
+        in_progress_project_count=count(Q(status='en_progreso')),
+        completed_project_count=count(Q(status='completado')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_tombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='completed_project_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Proyectos completados'),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='in_progress_project_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Proyectos en progreso'),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='pending_project_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Proyectos pendientes'),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='project_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Proyectos'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
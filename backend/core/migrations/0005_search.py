@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-17 19:05
+
+from django.db import migrations
+
+from core.operations import AddFullTextSearch
+
+
+class Migration(migrations.Migration):
+    # El índice GIN se crea con CREATE INDEX CONCURRENTLY, que no admite transacciones
+    atomic = False
+
+    dependencies = [
+        ('core', '0004_client_project_counters'),
+    ]
+
+    operations = [
+        AddFullTextSearch(model_name='client', fields=['name', 'email']),
+        AddFullTextSearch(model_name='project', fields=['name', 'description']),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2 on 2026-10-17 19:20
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('core', '0005_search'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name='project',
+            index=models.Index(fields=['client', 'start_date', 'id'], name='project_client_start_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='project',
+            index=models.Index(fields=['client', 'end_date', 'id'], name='project_client_end_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_project_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='counters_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Actualización de contadores'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2 on 2026-10-17 20:46
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('core', '0007_client_counters_updated_at'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name='client',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='client_user_updated_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='client',
+            index=models.Index(fields=['user', 'counters_updated_at'], name='client_user_counters_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='project',
+            index=models.Index(fields=['client', 'updated_at', 'id'], name='project_client_updated_idx'),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 
 class Client(models.Model):
@@ -7,16 +7,43 @@ class Client(models.Model):
     email = models.EmailField(verbose_name="Correo")
     phone = models.CharField(max_length=20, verbose_name="Teléfono")
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='clients', verbose_name="Usuario", null=True)
+    # Contadores desnormalizados mantenidos por core.counters
+    project_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Proyectos")
+    pending_project_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Proyectos pendientes")
+    in_progress_project_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Proyectos en progreso")
+    completed_project_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Proyectos completados")
+    # Último cambio de los contadores; es un validador de la representación del cliente
+    # pero no de la de sus proyectos, que solo dependen de updated_at (nombre del cliente)
+    counters_updated_at = models.DateTimeField(null=True, blank=True, editable=False,
+                                               verbose_name="Actualización de contadores")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de actualización")
     
     def __str__(self):
         return self.name
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Nombre cargado: client_name forma parte de la representación de los proyectos
+        if 'name' in instance.__dict__:
+            instance._loaded_name = instance.name
+        return instance
+    
+    def name_changed(self):
+        return getattr(self, '_loaded_name', None) != self.name
+    
     class Meta:
         verbose_name = "Cliente"
         verbose_name_plural = "Clientes"
         ordering = ['-created_at']
+        indexes = [
+            # Listado de clientes del usuario: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+            models.Index(fields=['user', '-created_at', '-id'], name='client_user_created_idx'),
+            # Sincronización incremental: WHERE user_id = ? AND (updated_at >= ? OR counters_updated_at >= ?)
+            models.Index(fields=['user', 'updated_at', 'id'], name='client_user_updated_idx'),
+            models.Index(fields=['user', 'counters_updated_at'], name='client_user_counters_idx'),
+        ]
 
 class Project(models.Model):
     """Modelo para representar los proyectos."""
@@ -38,7 +65,67 @@ class Project(models.Model):
     def __str__(self):
         return self.name
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Cliente y estado cargados, para ajustar los contadores del cliente al guardar
+        if 'client_id' in instance.__dict__ and 'status' in instance.__dict__:
+            instance._counter_state = (instance.client_id, instance.status)
+        return instance
+    
+    def save(self, *args, **kwargs):
+        # El guardado y la actualización de los contadores del cliente son atómicos
+        using = kwargs.get('using')
+        with transaction.atomic(using=using):
+            update_fields = kwargs.get('update_fields')
+            counted_fields = update_fields is None or {'client', 'client_id', 'status'} & set(update_fields)
+            if counted_fields and not self._state.adding and not kwargs.get('force_insert'):
+                # Se relee el estado con la fila bloqueada: el valor en memoria puede ser
+                # antiguo y dos cambios de estado concurrentes lo descontarían dos veces
+                self._counter_state = (
+                    type(self)._default_manager.using(using).select_for_update()
+                    .filter(pk=self.pk).values_list('client_id', 'status').first()
+                )
+            super().save(*args, **kwargs)
+    
     class Meta:
         verbose_name = "Proyecto"
         verbose_name_plural = "Proyectos"
-        ordering = ['-created_at'] 
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # Listado de proyectos por cliente ordenado por fecha de creación
+            models.Index(fields=['client', '-created_at', '-id'], name='project_client_created_idx'),
+            # Filtro por estado (by_status) dentro de los clientes del usuario
+            models.Index(fields=['client', 'status', '-created_at', '-id'], name='project_client_status_idx'),
+            # ?ordering= por fechas y filtros de rango (?start_date_after=, ?end_date_before=...)
+            models.Index(fields=['client', 'start_date', 'id'], name='project_client_start_idx'),
+            models.Index(fields=['client', 'end_date', 'id'], name='project_client_end_idx'),
+            # Sincronización incremental: WHERE updated_at >= ? por cada cliente del usuario
+            models.Index(fields=['client', 'updated_at', 'id'], name='project_client_updated_idx'),
+        ] 
+class Tombstone(models.Model):
+    """
+    Registro de un cliente o proyecto eliminado. Permite que la sincronización
+    incremental (`?since=`) informe también de las eliminaciones.
+    """
+    MODEL_CHOICES = (
+        ('client', 'Cliente'),
+        ('project', 'Proyecto'),
+    )
+    
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES, verbose_name="Modelo")
+    object_id = models.BigIntegerField(verbose_name="ID del objeto")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tombstones', verbose_name="Usuario")
+    deleted_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de eliminación")
+    
+    def __str__(self):
+        return f'{self.model} {self.object_id}'
+    
+    class Meta:
+        verbose_name = "Eliminación"
+        verbose_name_plural = "Eliminaciones"
+        ordering = ['-deleted_at']
+        indexes = [
+            # Consulta de sincronización: WHERE user_id = ? AND model = ? AND deleted_at >= ?
+            models.Index(fields=['user', 'model', 'deleted_at'], name='tombstone_user_model_idx'),
+        ]
@@ -0,0 +1,170 @@
+from django.db import NotSupportedError
+from django.db.migrations import AddIndex
+from django.db.migrations.operations.base import Operation
+
+
+def use_concurrently(operation, schema_editor):
+    """
+    Indica si los índices de `operation` se crean con CONCURRENTLY (solo en
+    PostgreSQL), lo que exige una migración con `atomic = False`.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return False
+    if schema_editor.connection.in_atomic_block:
+        raise NotSupportedError(
+            "The %s operation cannot be executed inside a transaction "
+            "(set atomic = False on the migration)." % operation.__class__.__name__
+        )
+    return True
+
+
+class AddIndexConcurrentlyIfSupported(AddIndex):
+    """
+    Crea el índice con CREATE INDEX CONCURRENTLY en PostgreSQL para no bloquear
+    la tabla durante la migración. En otros motores (SQLite en desarrollo y
+    pruebas) se comporta como un AddIndex normal.
+
+    La migración que lo use debe declarar `atomic = False`.
+    """
+
+    def describe(self):
+        return "Create index %s on field(s) %s of model %s (concurrently if supported)" % (
+            self.index.name,
+            ", ".join(self.index.fields),
+            self.model_name,
+        )
+
+    def _use_concurrently(self, schema_editor):
+        return use_concurrently(self, schema_editor)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if self._use_concurrently(schema_editor):
+                schema_editor.add_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if self._use_concurrently(schema_editor):
+                schema_editor.remove_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.remove_index(model, self.index)
+
+
+# Búsqueda de texto completo: en PostgreSQL una columna tsvector generada con
+# índice GIN; en SQLite una tabla FTS5 de contenido externo mantenida con triggers.
+SEARCH_VECTOR_COLUMN = 'search_vector'
+SEARCH_WEIGHTS = 'ABCD'
+
+
+def fts_table_name(table):
+    return f'{table}_fts'
+
+
+def postgresql_search_sql(table, fields, config):
+    document = ' || '.join(
+        f"setweight(to_tsvector('{config}'::regconfig, coalesce({field}, '')), '{SEARCH_WEIGHTS[i]}')"
+        for i, field in enumerate(fields)
+    )
+    return [
+        f'ALTER TABLE {table} ADD COLUMN {SEARCH_VECTOR_COLUMN} tsvector '
+        f'GENERATED ALWAYS AS ({document}) STORED',
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {table}_search_idx ON {table} USING GIN ({SEARCH_VECTOR_COLUMN})',
+    ]
+
+
+def sqlite_search_triggers_sql(table, fields):
+    """Triggers que mantienen la tabla FTS5 sincronizada con `table`."""
+    fts = fts_table_name(table)
+    columns = ', '.join(fields)
+    new_values = ', '.join(f'new.{field}' for field in fields)
+    old_values = ', '.join(f'old.{field}' for field in fields)
+    delete = f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});"
+    insert = f'INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values});'
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END',
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END',
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table} '
+        f'BEGIN {delete} {insert} END',
+    ]
+
+
+def sqlite_search_sql(table, fields):
+    fts = fts_table_name(table)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({', '.join(fields)}, content='{table}', "
+        f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        *sqlite_search_triggers_sql(table, fields),
+        # Indexa las filas existentes
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+class AddFullTextSearch(Operation):
+    """
+    Crea el índice de texto completo de `fields` (por orden de peso) para
+    `core.search.FullTextSearchFilter`. No modifica el estado de los modelos:
+    la columna/tabla auxiliar solo se usa desde SQL. En otros motores no hace nada
+    y el filtro recurre a `icontains`.
+
+    En PostgreSQL añadir la columna generada reescribe la tabla con un bloqueo
+    ACCESS EXCLUSIVE (lecturas y escrituras esperan mientras dura); el índice
+    GIN se crea después con CONCURRENTLY, por lo que la migración que lo use
+    debe declarar `atomic = False`.
+    """
+    reduces_to_sql = True
+    reversible = True
+
+    def __init__(self, model_name, fields, config='spanish'):
+        self.model_name = model_name
+        self.fields = fields
+        self.config = config
+
+    def deconstruct(self):
+        kwargs = {'model_name': self.model_name, 'fields': self.fields, 'config': self.config}
+        return self.__class__.__name__, [], kwargs
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def describe(self):
+        return "Create full-text search index on field(s) %s of model %s" % (
+            ", ".join(self.fields), self.model_name,
+        )
+
+    def _get_table(self, app_label, schema_editor, state):
+        model = state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return None
+        return model._meta.db_table
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        table = self._get_table(app_label, schema_editor, to_state)
+        vendor = schema_editor.connection.vendor
+        if table is None:
+            return
+        if vendor == 'postgresql' and use_concurrently(self, schema_editor):
+            statements = postgresql_search_sql(table, self.fields, self.config)
+        elif vendor == 'sqlite':
+            statements = sqlite_search_sql(table, self.fields)
+        else:
+            statements = []
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        table = self._get_table(app_label, schema_editor, from_state)
+        vendor = schema_editor.connection.vendor
+        if table is None:
+            return
+        if vendor == 'postgresql' and use_concurrently(self, schema_editor):
+            schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {table}_search_idx')
+            schema_editor.execute(f'ALTER TABLE {table} DROP COLUMN IF EXISTS {SEARCH_VECTOR_COLUMN}')
+        elif vendor == 'sqlite':
+            fts = fts_table_name(table)
+            for suffix in ('ai', 'ad', 'au'):
+                schema_editor.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+            schema_editor.execute(f'DROP TABLE IF EXISTS {fts}')
@@ -0,0 +1,201 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+def get_ordering_field(queryset, name):
+    """Campo (del modelo o de una anotación) por el que se ordena."""
+    annotation = queryset.query.annotations.get(name)
+    if annotation is not None:
+        return annotation.output_field
+    return queryset.model._meta.get_field(name)
+
+
+def order_queryset(queryset, ordering):
+    """
+    `order_by` que coloca los nulos como el valor más alto en todos los motores
+    (como hace PostgreSQL por defecto), lo que necesita la paginación por cursor
+    sobre campos opcionales como `end_date`.
+    """
+    expressions = []
+    for order in ordering:
+        name = order.lstrip('-')
+        if not get_ordering_field(queryset, name).null:
+            expressions.append(order)
+        elif order.startswith('-'):
+            expressions.append(F(name).desc(nulls_first=True))
+        else:
+            expressions.append(F(name).asc(nulls_last=True))
+    return queryset.order_by(*expressions)
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Paginación por cursor opaco (keyset) ordenada por `-created_at` con `id`
+    como desempate.
+
+    La posición del cursor codifica el par (valor, id) del último elemento,
+    de modo que cada página se obtiene con un filtro sobre el índice en lugar de
+    un OFFSET, y el coste no crece con la profundidad de la página. El primer
+    campo de la ordenación puede ser cualquier campo del modelo o anotación
+    (p. ej. `search_rank` al buscar); su valor se convierte con el propio campo.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    position_separator = '|'
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Orden del primer filtro de la vista que lo determine (p. ej. `?ordering=`
+        o la relevancia de `?q=`); si ninguno lo hace, el orden por defecto.
+        """
+        for filter_class in getattr(view, 'filter_backends', []):
+            if hasattr(filter_class, 'get_ordering'):
+                ordering = filter_class().get_ordering(request, queryset, view)
+                if ordering is not None:
+                    return ordering
+        return type(self).ordering
+
+    def get_page_size(self, request):
+        # Los límites se leen en cada petición para respetar la configuración activa
+        self.page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE')
+        self.max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', None)
+        return super().get_page_size(request)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Versión asíncrona de `paginate_queryset`: las filas se leen con `aiterator()`."""
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page([row async for row in page_queryset.aiterator()])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Consulta (sin evaluar) de la página solicitada más un elemento extra."""
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        # La paginación por cursor siempre impone un orden.
+        if reverse:
+            queryset = order_queryset(queryset, [self._invert(order) for order in self.ordering])
+        else:
+            queryset = order_queryset(queryset, self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(self._get_keyset_filter(current_position, reverse, queryset))
+
+        self.offset = offset
+        self.reverse = reverse
+        self.current_position = current_position
+        # Se obtiene siempre un elemento extra para saber si existe una página siguiente.
+        return queryset[offset:offset + self.page_size + 1]
+
+    def set_page(self, results):
+        """Fija la página y las posiciones anterior y siguiente a partir de las filas obtenidas."""
+        offset, reverse, current_position = self.offset, self.reverse, self.current_position
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def _invert(self, order):
+        return order[1:] if order.startswith('-') else f'-{order}'
+
+    def _parse_position(self, position, queryset):
+        """Convierte la posición codificada en el par (valor, id)."""
+        field = get_ordering_field(queryset, self.ordering[0].lstrip('-'))
+        try:
+            value, pk = position.rsplit(self.position_separator, 1)
+            # Los nulos se codifican como valor vacío
+            value = None if value == '' and field.null else field.to_python(value)
+            pk = int(pk)
+        except (AttributeError, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None and not field.null:
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def _get_keyset_filter(self, position, reverse, queryset):
+        """
+        Construye la condición (a, b) < (x, y) equivalente a
+        `a < x OR (a = x AND b < y)`, que puede resolverse con un índice compuesto.
+
+        Los nulos se ordenan como si fueran mayores que cualquier valor (ver
+        `order_queryset`): al final en orden ascendente y al principio en descendente.
+        """
+        value, pk = self._parse_position(position, queryset)
+        value_field, id_field = (order.lstrip('-') for order in self.ordering)
+        is_reversed = self.ordering[0].startswith('-')
+        lookup = 'lt' if reverse != is_reversed else 'gt'
+        if value is None:
+            condition = Q(**{f'{value_field}__isnull': True, f'{id_field}__{lookup}': pk})
+            if lookup == 'lt':
+                condition |= Q(**{f'{value_field}__isnull': False})
+            return condition
+        condition = (
+            Q(**{f'{value_field}__{lookup}': value}) |
+            Q(**{value_field: value, f'{id_field}__{lookup}': pk})
+        )
+        if lookup == 'gt' and get_ordering_field(queryset, value_field).null:
+            condition |= Q(**{f'{value_field}__isnull': True})
+        return condition
+
+    def _get_position_from_instance(self, instance, ordering):
+        value_field, id_field = (order.lstrip('-') for order in ordering)
+        if isinstance(instance, dict):
+            value, pk = instance[value_field], instance[id_field]
+        else:
+            value, pk = getattr(instance, value_field), getattr(instance, id_field)
+        if value is None:
+            value = ''
+        elif hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        return f'{value}{self.position_separator}{pk}'
+
+
+class UserCursorPagination(KeysetCursorPagination):
+    """Paginación por cursor para usuarios, ordenada por fecha de alta."""
+    ordering = ('-date_joined', '-id')
@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """No quedó ninguna conexión libre dentro del tiempo de espera."""
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones local al proceso y seguro entre hilos. `connect` abre
+    una conexión nueva y `check` (opcional) comprueba antes de entregarla que
+    una conexión reutilizada sigue viva; si falla, se descarta y se abre otra.
+
+    Como mucho hay `max_size` conexiones abiertas a la vez; al agotarse,
+    `acquire` espera hasta `timeout` segundos a que se devuelva alguna.
+    """
+
+    def __init__(self, connect, min_size=0, max_size=10, timeout=30, check=None):
+        if max_size < 1 or not 0 <= min_size <= max_size:
+            raise ValueError('Se requiere 0 <= min_size <= max_size y max_size >= 1')
+        self.connect = connect
+        self.check = check
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = deque()
+        self._size = 0
+        self._condition = threading.Condition()
+        self._pid = os.getpid()
+
+    @property
+    def size(self):
+        """Conexiones abiertas, libres o en uso."""
+        return self._size
+
+    @property
+    def idle(self):
+        return len(self._idle)
+
+    def _reset_after_fork(self):
+        # Las conexiones heredadas de otro proceso no se pueden compartir
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle.clear()
+            self._size = 0
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        with self._condition:
+            self._reset_after_fork()
+            while True:
+                if self._idle:
+                    connection = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    connection = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(f'Sin conexiones libres tras {self.timeout}s (max_size={self.max_size})')
+                self._condition.wait(remaining)
+
+        if connection is not None:
+            if self.check is None or self._is_usable(connection):
+                return connection
+            # Se conserva su hueco para la conexión que la sustituye
+            self._close(connection)
+        try:
+            return self.connect()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, connection, discard=False):
+        """Devuelve la conexión al pool, o la cierra si `discard`."""
+        with self._condition:
+            if self._pid != os.getpid():
+                return
+            if discard:
+                self._size -= 1
+            else:
+                self._idle.append(connection)
+                connection = None
+            self._condition.notify()
+        if connection is not None:
+            self._close(connection)
+
+    def prefill(self):
+        """Abre conexiones hasta tener al menos `min_size`."""
+        while True:
+            with self._condition:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                connection = self.connect()
+            except BaseException:
+                with self._condition:
+                    self._size -= 1
+                raise
+            self.release(connection)
+
+    def close_all(self):
+        with self._condition:
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+        for connection in idle:
+            self._close(connection)
+
+    def _is_usable(self, connection):
+        try:
+            return bool(self.check(connection))
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -0,0 +1,91 @@
+import codecs
+import io
+import json
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer que serializa con `orjson` cuando está instalado y, si no,
+    con el JSONRenderer de DRF.
+
+    La salida es idéntica byte a byte a la de DRF para los tipos que producen
+    los serializadores: las fechas se pasan al encoder de DRF (mismo formato
+    ISO con 'Z'), se escapan \\u2028/\\u2029 y se usan separadores compactos.
+    Si orjson no admite algún valor (claves no str, enteros de más de 64 bits,
+    anidamiento excesivo...) se vuelve a renderizar con DRF. Única diferencia
+    conocida: los float muy grandes o muy pequeños se escriben sin el '+' ni
+    el cero del exponente (1e16 en lugar de 1e+16), y NaN/Infinity se emiten
+    como null; ningún campo de la API devuelve floats de ese rango.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Con indentación (p. ej. desde BrowsableAPIRenderer) se usa el renderer de DRF
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser que decodifica con `orjson` cuando está instalado y el cuerpo
+    viene en UTF-8. Los cuerpos que orjson rechaza se vuelven a analizar con
+    el parser de DRF, de modo que los resultados y los mensajes de error son
+    los mismos.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+
+
+class StreamingExportRenderer(BaseRenderer):
+    """
+    Renderer que solo sirve para la negociación de contenido de las
+    exportaciones (`?format=csv` / `?format=ndjson` o cabecera Accept). Las
+    filas se escriben directamente en un StreamingHttpResponse; aquí solo se
+    renderizan las respuestas de error, que se emiten como JSON.
+    """
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data).encode(self.charset)
+
+
+class CSVRenderer(StreamingExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONRenderer(StreamingExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
@@ -0,0 +1,144 @@
+import contextvars
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+from .cache import get_api_cache
+
+PRIMARY_DB_ALIAS = 'default'
+# Modelos que siempre se leen del primario: el estado de los usuarios (p. ej.
+# is_active) debe estar al día al autenticar
+PRIMARY_APP_LABELS = ('auth', 'contenttypes')
+
+_routing_state = contextvars.ContextVar('db_routing_state', default=None)
+
+
+def _pin_key(user_id):
+    return f'db:pin:{user_id}'
+
+
+def pin_user_to_primary(user_id):
+    """Durante `DATABASE_REPLICA_PIN_SECONDS` las lecturas del usuario van al primario."""
+    get_api_cache().set(_pin_key(user_id), True, timeout=settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_user_pinned(user_id):
+    return bool(get_api_cache().get(_pin_key(user_id)))
+
+
+async def ais_user_pinned(user_id):
+    return bool(await get_api_cache().aget(_pin_key(user_id)))
+
+
+class RoutingState:
+    """Estado de enrutado de una petición."""
+
+    def __init__(self):
+        self.user_id = None
+        self.use_replica = False
+        self.wrote = False
+
+    def record_write(self):
+        # Tras escribir, el resto de la petición y las siguientes del usuario leen del primario
+        self.use_replica = False
+        if not self.wrote:
+            self.wrote = True
+            if self.user_id is not None:
+                pin_user_to_primary(self.user_id)
+
+
+def get_routing_state():
+    return _routing_state.get()
+
+
+class PrimaryReplicaRouter:
+    """
+    Envía las escrituras y las migraciones al primario (`default`) y, en las
+    peticiones que lo permiten (ver `ReplicaReadMixin`), las lecturas a una
+    réplica de `DATABASE_REPLICAS` elegida al azar. Fuera de una petición, p. ej.
+    en comandos de gestión, todo va al primario.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_APP_LABELS:
+            return PRIMARY_DB_ALIAS
+        state = get_routing_state()
+        replicas = settings.DATABASE_REPLICAS
+        if state is not None and state.use_replica and replicas:
+            return random.choice(replicas)
+        return None
+
+    def db_for_write(self, model, **hints):
+        state = get_routing_state()
+        if state is not None:
+            state.record_write()
+        return PRIMARY_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Las réplicas contienen los mismos datos que el primario
+        databases = {PRIMARY_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DB_ALIAS
+
+
+class DatabaseRoutingMiddleware:
+    """Crea el estado de enrutado de cada petición; por defecto todo va al primario."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _routing_state.set(RoutingState())
+        try:
+            return self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+
+    async def __acall__(self, request):
+        token = _routing_state.set(RoutingState())
+        try:
+            return await self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+
+
+class ReplicaReadMixin:
+    """
+    Las peticiones de solo lectura (GET, HEAD, OPTIONS) de la vista leen de
+    las réplicas, salvo que el usuario haya escrito hace menos de
+    `DATABASE_REPLICA_PIN_SECONDS`: así ve siempre sus propios cambios.
+
+    La autenticación y los permisos se resuelven antes, contra el primario.
+    """
+
+    def _may_use_replica(self, request):
+        """Registra el usuario en el estado de enrutado e indica si, salvo anclaje, se lee de una réplica."""
+        state = get_routing_state()
+        if state is None:
+            return False
+        state.user_id = request.user.id
+        return request.method in SAFE_METHODS and bool(settings.DATABASE_REPLICAS) and not state.wrote
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self._may_use_replica(request):
+            get_routing_state().use_replica = not is_user_pinned(request.user.id)
+
+    async def ainitial(self, request, *args, **kwargs):
+        """`initial` de las vistas asíncronas: el anclaje se consulta sin bloquear el bucle de eventos."""
+        # Se omite `initial` de esta clase, que consultaría la caché de forma síncrona
+        super().initial(request, *args, **kwargs)
+        if self._may_use_replica(request):
+            get_routing_state().use_replica = not await ais_user_pinned(request.user.id)
@@ -0,0 +1,180 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.sql.constants import INNER
+from rest_framework.filters import BaseFilterBackend
+
+from .operations import SEARCH_VECTOR_COLUMN, fts_table_name, sqlite_search_triggers_sql
+
+# Configuración de PostgreSQL con la que se generó la columna tsvector (ver 0005_search)
+SEARCH_TEXT_CONFIG = 'spanish'
+# Términos de búsqueda que se tienen en cuenta como máximo
+MAX_SEARCH_TERMS = 10
+
+SEARCH_RANK = 'search_rank'
+SEARCH_RANK_WEIGHTS = (1.0, 0.4, 0.2, 0.1)
+
+
+def get_search_terms(query):
+    """Palabras de la consulta; se descarta cualquier sintaxis del motor de búsqueda."""
+    return re.findall(r'[^\W_]+', query)[:MAX_SEARCH_TERMS]
+
+
+def _postgresql_search(queryset, terms):
+    table = queryset.model._meta.db_table
+    tsquery = f"to_tsquery('{SEARCH_TEXT_CONFIG}'::regconfig, %s)"
+    # Cada término se busca como prefijo y todos deben aparecer
+    expression = ' & '.join(f'{term}:*' for term in terms)
+    vector = f'{table}.{SEARCH_VECTOR_COLUMN}'
+    return queryset.filter(
+        RawSQL(f'{vector} @@ {tsquery}', [expression], output_field=BooleanField())
+    ).annotate(**{
+        SEARCH_RANK: RawSQL(f'ts_rank({vector}, {tsquery})::float8', [expression], output_field=FloatField()),
+    })
+
+
+class _FullTextJoin:
+    """
+    INNER JOIN de la tabla FTS5 por rowid. El ORM no une tablas sin relación,
+    así que se añade a `query.alias_map` con la interfaz que el compilador usa
+    de `django.db.models.sql.datastructures.Join`.
+    """
+    join_type = INNER
+    nullable = False
+    filtered_relation = None
+
+    def __init__(self, table_name, parent_alias):
+        self.table_name = self.table_alias = table_name
+        self.parent_alias = parent_alias
+
+    def as_sql(self, compiler, connection):
+        table = compiler.quote_name_unless_alias(self.table_name)
+        alias = compiler.quote_name_unless_alias(self.table_alias)
+        parent = compiler.quote_name_unless_alias(self.parent_alias)
+        alias_sql = '' if alias == table else f' {alias}'
+        return f'INNER JOIN {table}{alias_sql} ON ({alias}.rowid = {parent}.id)', []
+
+    def relabeled_clone(self, change_map):
+        # Las expresiones RawSQL de la búsqueda nombran la tabla directamente
+        return self
+
+    def demote(self):
+        return self
+
+    def promote(self):
+        return self
+
+    @property
+    def identity(self):
+        return self.__class__, self.table_name, self.parent_alias
+
+    def __eq__(self, other):
+        return getattr(other, 'identity', None) == self.identity
+
+    def __hash__(self):
+        return hash(self.identity)
+
+
+def _sqlite_search(queryset, terms, fields):
+    table = queryset.model._meta.db_table
+    expression = ' '.join(f'"{term}"*' for term in terms)
+    # Mismos pesos por columna que ts_rank para A, B, C y D
+    weights = ', '.join(str(weight) for weight in SEARCH_RANK_WEIGHTS[:len(fields)])
+    # Un único recorrido de la tabla FTS5 unida por rowid: la relevancia se calcula
+    # en ese mismo recorrido y no con una subconsulta MATCH por fila candidata
+    queryset = queryset.all()
+    fts = queryset.query.join(_FullTextJoin(fts_table_name(table), queryset.query.get_initial_alias()))
+    # bm25 devuelve valores menores cuanto más relevante es la fila
+    return queryset.filter(
+        RawSQL(f'{fts} MATCH %s', [expression], output_field=BooleanField())
+    ).annotate(**{
+        SEARCH_RANK: RawSQL(f'-bm25({fts}, {weights})', [], output_field=FloatField()),
+    })
+
+
+def _fallback_search(queryset, terms, fields):
+    condition = Q()
+    for term in terms:
+        term_condition = Q()
+        for field in fields:
+            term_condition |= Q(**{f'{field}__icontains': term})
+        condition &= term_condition
+    return queryset.filter(condition).annotate(**{SEARCH_RANK: Value(0.0, output_field=FloatField())})
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Búsqueda `?q=` sobre `search_fields` de la vista usando el índice de texto
+    completo creado por `AddFullTextSearch`: columna tsvector con índice GIN en
+    PostgreSQL y tabla FTS5 en SQLite. Cada palabra se busca como prefijo y
+    todas deben aparecer.
+
+    Los resultados se anotan con `search_rank` y, al buscar, la paginación por
+    cursor los ordena por relevancia (`-search_rank`, `-id`).
+    """
+    search_param = 'q'
+
+    def get_search_terms(self, request):
+        return get_search_terms(request.query_params.get(self.search_param, ''))
+
+    def is_searching(self, request):
+        return bool(request.query_params.get(self.search_param, '').strip())
+
+    def filter_queryset(self, request, queryset, view):
+        if not self.is_searching(request):
+            return queryset
+        terms = self.get_search_terms(request)
+        if not terms:
+            # Sin palabras no hay resultados; se anota igualmente para la ordenación
+            return queryset.annotate(**{SEARCH_RANK: Value(0.0, output_field=FloatField())}).none()
+        vendor = connections[queryset.db].vendor
+        if vendor == 'postgresql':
+            return _postgresql_search(queryset, terms)
+        if vendor == 'sqlite':
+            return _sqlite_search(queryset, terms, view.search_fields)
+        return _fallback_search(queryset, terms, view.search_fields)
+
+    def get_ordering(self, request, queryset, view):
+        """Orden de la paginación por cursor: por relevancia al buscar."""
+        if self.is_searching(request):
+            return (f'-{SEARCH_RANK}', '-id')
+        return None
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': (
+                'Búsqueda de texto completo en ' + ', '.join(view.search_fields) +
+                '. Los resultados se ordenan por relevancia.'
+            ),
+            'schema': {'type': 'string'},
+        }]
+
+
+def repair_sqlite_search_triggers(using='default', **kwargs):
+    """
+    Al recrear una tabla (p. ej. al migrar ciertos cambios en SQLite) se pierden
+    sus triggers. Tras migrar se vuelven a crear los de cada tabla FTS5 que
+    falten y se reconstruye su índice.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE '%\\_fts' ESCAPE '\\'")
+        fts_tables = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        triggers = {row[0] for row in cursor.fetchall()}
+        for fts in fts_tables:
+            if all(f'{fts}_{suffix}' in triggers for suffix in ('ai', 'ad', 'au')):
+                continue
+            table = fts[:-len('_fts')]
+            cursor.execute(f'PRAGMA table_info({fts})')
+            fields = [row[1] for row in cursor.fetchall()]
+            for statement in sqlite_search_triggers_sql(table, fields):
+                cursor.execute(statement)
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
@@ -0,0 +1,137 @@
+"""
+Generación de datos sintéticos deterministas para pruebas de capacidad (ver el
+comando `seed_core_data`).
+
+Los datos de cada usuario dependen solo de la semilla y de su índice, no del
+tamaño de lote ni del número de procesos: dos ejecuciones con los mismos
+parámetros producen los mismos nombres, estados y fechas.
+"""
+import datetime
+import random
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .counters import STATUS_COUNTER_FIELDS
+from .models import Client, Project
+
+STATUS_WEIGHTS = (('pendiente', 3), ('en_progreso', 2), ('completado', 5))
+# Fecha de referencia fija: la fecha del día haría los datos distintos en cada ejecución
+BASE_DATE = datetime.date(2020, 1, 1)
+
+
+class SeedPlan:
+    """Volumen y forma de los datos a generar."""
+
+    def __init__(self, users, clients_per_user, projects_per_client, seed=0, prefix='seed', batch_size=5000):
+        self.users = users
+        self.clients_per_user = clients_per_user
+        self.projects_per_client = projects_per_client
+        self.seed = seed
+        self.prefix = prefix
+        self.batch_size = batch_size
+
+    @property
+    def rows_per_user(self):
+        return 1 + self.clients_per_user * (1 + self.projects_per_client)
+
+    def username(self, index):
+        return f'{self.prefix}{index:07d}'
+
+
+class SeedReport:
+    def __init__(self, users=0, clients=0, projects=0):
+        self.users = users
+        self.clients = clients
+        self.projects = projects
+
+    @property
+    def rows(self):
+        return self.users + self.clients + self.projects
+
+    def add(self, other):
+        self.users += other.users
+        self.clients += other.clients
+        self.projects += other.projects
+
+
+def _project_rows(rng, client_index, count):
+    statuses, weights = zip(*STATUS_WEIGHTS)
+    for project_index in range(count):
+        start = BASE_DATE + datetime.timedelta(days=rng.randrange(1500))
+        # Uno de cada cinco proyectos sin fecha de entrega
+        end = start + datetime.timedelta(days=rng.randrange(7, 365)) if rng.random() >= 0.2 else None
+        yield {
+            'name': f'Proyecto {client_index}-{project_index}',
+            'description': f'Proyecto sintético {project_index} del cliente {client_index}',
+            'status': rng.choices(statuses, weights)[0],
+            'start_date': start,
+            'end_date': end,
+        }
+
+
+def _build_user(plan, index, password_hash):
+    """Usuario, clientes y proyectos (sin cliente asignado aún) del usuario `index`."""
+    rng = random.Random(f'{plan.seed}:{index}')
+    username = plan.username(index)
+    user = User(username=username, email=f'{username}@example.com', password=password_hash)
+    clients, projects = [], []
+    for client_index in range(plan.clients_per_user):
+        rows = list(_project_rows(rng, client_index, plan.projects_per_client))
+        # Los contadores se calculan aquí y se insertan con el cliente: con
+        # bulk_create no hay señales y un UPDATE por cliente doblaría las escrituras
+        counters = {field: 0 for field in STATUS_COUNTER_FIELDS.values()}
+        for row in rows:
+            counters[STATUS_COUNTER_FIELDS[row['status']]] += 1
+        clients.append(Client(
+            name=f'Cliente {index}-{client_index}',
+            email=f'cliente{client_index}@{username}.example.com',
+            phone=f'+34 6{rng.randrange(10 ** 8):08d}',
+            project_count=len(rows),
+            **counters,
+        ))
+        projects.append(rows)
+    return user, clients, projects
+
+
+def seed_users(plan, start, stop, password_hash):
+    """
+    Inserta los usuarios de índice `start` a `stop - 1` con sus clientes y
+    proyectos, en transacciones de unas `batch_size` filas. Devuelve un `SeedReport`.
+    """
+    report = SeedReport()
+    users_per_chunk = max(1, plan.batch_size // plan.rows_per_user)
+    for chunk_start in range(start, stop, users_per_chunk):
+        built = [
+            _build_user(plan, index, password_hash)
+            for index in range(chunk_start, min(chunk_start + users_per_chunk, stop))
+        ]
+        with transaction.atomic():
+            users = User.objects.bulk_create([user for user, _, _ in built], batch_size=plan.batch_size)
+            clients = []
+            for user, (_, user_clients, _) in zip(users, built):
+                for client in user_clients:
+                    client.user_id = user.id
+                clients.extend(user_clients)
+            # En PostgreSQL y SQLite bulk_create devuelve las claves primarias
+            Client.objects.bulk_create(clients, batch_size=plan.batch_size)
+            project_rows = (rows for _, _, user_projects in built for rows in user_projects)
+            projects = [
+                Project(client_id=client.id, **row)
+                for client, rows in zip(clients, project_rows) for row in rows
+            ]
+            Project.objects.bulk_create(projects, batch_size=plan.batch_size)
+        report.add(SeedReport(len(users), len(clients), len(projects)))
+    return report
+
+
+def user_ranges(plan, parts):
+    """Divide los índices de usuario en `parts` rangos contiguos de tamaño parecido."""
+    size, remainder = divmod(plan.users, parts)
+    start = 0
+    for part in range(parts):
+        stop = start + size + (1 if part < remainder else 0)
+        if stop > start:
+            yield start, stop
+        start = stop
+
@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from .models import Client, Project
+from .instrumentation import TimedRepresentationMixin
 from drf_spectacular.utils import extend_schema_field, extend_schema_serializer
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo de Usuario.
     """
@@ -31,20 +32,30 @@ class UserSerializer(serializers.ModelSerializer):
 @extend_schema_serializer(
     component_name="Cliente"
 )
-class ClientSerializer(serializers.ModelSerializer):
+class ClientSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo de Cliente.
     Facilita la gestión de datos de clientes en la API.
     """
     class Meta:
         model = Client
-        fields = ('id', 'name', 'email', 'phone', 'user', 'created_at', 'updated_at')
-        read_only_fields = ('created_at', 'updated_at')
+        fields = (
+            'id', 'name', 'email', 'phone', 'user', 'project_count', 'pending_project_count',
+            'in_progress_project_count', 'completed_project_count', 'created_at', 'updated_at'
+        )
+        read_only_fields = (
+            'project_count', 'pending_project_count', 'in_progress_project_count',
+            'completed_project_count', 'created_at', 'updated_at'
+        )
         extra_kwargs = {
             'user': {'required': False, 'help_text': 'ID del usuario propietario del cliente'},
             'name': {'help_text': 'Nombre del cliente'},
             'email': {'help_text': 'Correo electrónico del cliente'},
             'phone': {'help_text': 'Número de teléfono del cliente'},
+            'project_count': {'help_text': 'Número total de proyectos del cliente (solo lectura)'},
+            'pending_project_count': {'help_text': 'Proyectos pendientes (solo lectura)'},
+            'in_progress_project_count': {'help_text': 'Proyectos en progreso (solo lectura)'},
+            'completed_project_count': {'help_text': 'Proyectos completados (solo lectura)'},
             'created_at': {'help_text': 'Fecha de creación (solo lectura)'},
             'updated_at': {'help_text': 'Fecha de última actualización (solo lectura)'},
         }
@@ -68,7 +79,7 @@ class ClientSerializer(serializers.ModelSerializer):
 @extend_schema_serializer(
     component_name="Proyecto"
 )
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo de Proyecto.
     Facilita la gestión de datos de proyectos en la API.
@@ -94,4 +105,122 @@ class ProjectSerializer(serializers.ModelSerializer):
             'end_date': {'help_text': 'Fecha de finalización del proyecto (YYYY-MM-DD, opcional)'},
             'created_at': {'help_text': 'Fecha de creación (solo lectura)'},
             'updated_at': {'help_text': 'Fecha de última actualización (solo lectura)'},
-        } 
\ No newline at end of file
+        } 
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Campo de clave primaria que resuelve los objetos contra un diccionario
+    precargado en el contexto (`context[context_key]`), de modo que validar un
+    lote completo cuesta una sola consulta en lugar de una por fila.
+    """
+    def __init__(self, context_key, **kwargs):
+        self.context_key = context_key
+        super().__init__(**kwargs)
+    
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        instance = self.context[self.context_key].get(pk)
+        if instance is None:
+            self.fail('does_not_exist', pk_value=data)
+        return instance
+
+@extend_schema_serializer(
+    component_name="ClienteLote"
+)
+class ClientBulkSerializer(ClientSerializer):
+    """
+    Serializador de clientes para las operaciones en lote. El usuario siempre
+    es el autenticado, por lo que `user` es de solo lectura.
+    """
+    class Meta(ClientSerializer.Meta):
+        read_only_fields = ('user',) + ClientSerializer.Meta.read_only_fields
+
+@extend_schema_serializer(
+    component_name="ProyectoLote"
+)
+class ProjectBulkSerializer(ProjectSerializer):
+    """
+    Serializador de proyectos para las operaciones en lote. `client` se valida
+    contra los clientes del usuario precargados en el contexto.
+    """
+    client = BulkPrimaryKeyRelatedField(
+        context_key='owned_clients',
+        queryset=Client.objects.none(),
+        help_text='ID del cliente asociado al proyecto'
+    )
+
+class StatusCountsSerializer(serializers.Serializer):
+    """Número de proyectos por estado."""
+    pendiente = serializers.IntegerField()
+    en_progreso = serializers.IntegerField()
+    completado = serializers.IntegerField()
+
+class ClientProjectSummarySerializer(serializers.Serializer):
+    """Resumen de los proyectos de un cliente."""
+    client = serializers.IntegerField(help_text="ID del cliente")
+    client_name = serializers.CharField(help_text="Nombre del cliente")
+    total = serializers.IntegerField()
+    by_status = StatusCountsSerializer()
+    overdue = serializers.IntegerField(help_text="Proyectos no completados con fecha de entrega vencida")
+    upcoming = serializers.IntegerField(help_text="Proyectos no completados que vencen en los próximos días")
+    next_deadline = serializers.DateField(allow_null=True, help_text="Próxima fecha de entrega pendiente")
+
+@extend_schema_serializer(
+    component_name="ResumenProyectos"
+)
+class ProjectSummarySerializer(TimedRepresentationMixin, serializers.Serializer):
+    """
+    Serializador (solo documentación) del resumen agregado de proyectos.
+    """
+    total = serializers.IntegerField()
+    by_status = StatusCountsSerializer()
+    overdue = serializers.IntegerField()
+    upcoming = serializers.IntegerField()
+    upcoming_days = serializers.IntegerField(help_text="Ventana en días usada para `upcoming`")
+    next_deadline = serializers.DateField(allow_null=True)
+    by_client = ClientProjectSummarySerializer(many=True)
+
+
+class ProjectFilterSerializer(serializers.Serializer):
+    """
+    Valida los parámetros de filtrado del listado de proyectos. Las fechas
+    `*_after` / `*_before` son inclusivas.
+    """
+    status = serializers.CharField(
+        required=False,
+        help_text="Estados separados por comas (pendiente, en_progreso, completado)"
+    )
+    client = serializers.IntegerField(required=False, min_value=1, help_text="ID del cliente")
+    start_date_after = serializers.DateField(required=False, help_text="Fecha de inicio desde (YYYY-MM-DD)")
+    start_date_before = serializers.DateField(required=False, help_text="Fecha de inicio hasta (YYYY-MM-DD)")
+    end_date_after = serializers.DateField(required=False, help_text="Fecha de entrega desde (YYYY-MM-DD)")
+    end_date_before = serializers.DateField(required=False, help_text="Fecha de entrega hasta (YYYY-MM-DD)")
+    overdue = serializers.BooleanField(
+        required=False, allow_null=True, default=None,
+        help_text="true: solo proyectos no completados con la fecha de entrega vencida; false: el resto"
+    )
+    
+    def validate_status(self, value):
+        """Validar que todos los estados pertenezcan a STATUS_CHOICES."""
+        statuses = [status.strip() for status in value.split(',') if status.strip()]
+        valid = [choice for choice, _ in Project.STATUS_CHOICES]
+        invalid = [status for status in statuses if status not in valid]
+        if invalid or not statuses:
+            raise serializers.ValidationError(
+                f"Estado no válido: {', '.join(invalid) or value}. Valores permitidos: {', '.join(valid)}"
+            )
+        return statuses
+    
+    def validate(self, data):
+        for field in ('start_date', 'end_date'):
+            after, before = data.get(f'{field}_after'), data.get(f'{field}_before')
+            if after and before and after > before:
+                raise serializers.ValidationError(
+                    {f'{field}_before': f'Debe ser posterior o igual a {field}_after'}
+                )
+        return data
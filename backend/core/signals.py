@@ -0,0 +1,160 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .authentication import user_status_cache
+from .cache import invalidate_user_cache
+from .counters import CounterDeltas
+from .models import Client, Project, Tombstone
+from .sync import touch_client_projects
+
+User = get_user_model()
+
+# Activo mientras una eliminación en lote hace por su cuenta el trabajo de los receptores
+_bulk_deletion = ContextVar('bulk_deletion', default=False)
+
+
+@contextmanager
+def bulk_deletion():
+    """
+    Desactiva los receptores de eliminación de clientes y proyectos (contadores,
+    registros de eliminación y caché). Quien lo usa debe hacer ese trabajo una
+    sola vez para todo el lote (ver `BulkOperationsMixin.perform_bulk_destroy`).
+    """
+    token = _bulk_deletion.set(True)
+    try:
+        yield
+    finally:
+        _bulk_deletion.reset(token)
+
+
+def _origin_is(origin, model):
+    """Indica si la eliminación se originó en una instancia o queryset de `model`."""
+    if isinstance(origin, QuerySet):
+        return origin.model is model
+    return isinstance(origin, model)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_status(sender, instance, **kwargs):
+    """Descarta el estado cacheado del usuario al modificarlo o eliminarlo."""
+    user_status_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Client)
+def invalidate_client_owner_cache(sender, instance, **kwargs):
+    """Invalida las respuestas cacheadas del propietario del cliente."""
+    invalidate_user_cache(instance.user_id)
+
+
+@receiver(post_save, sender=Client)
+def touch_projects_of_renamed_client(sender, instance, created, update_fields=None, **kwargs):
+    """Los proyectos de un cliente renombrado vuelven a entrar en la sincronización."""
+    if update_fields is not None and 'name' not in update_fields:
+        return
+    if not created and instance.name_changed():
+        touch_client_projects([instance.pk])
+    instance._loaded_name = instance.name
+
+
+@receiver(pre_delete, sender=Client)
+def record_cascaded_project_tombstones(sender, instance, origin=None, **kwargs):
+    """
+    Registra de una sola vez las eliminaciones de los proyectos que se borrarán
+    en cascada con el cliente (se hace antes de que desaparezcan las filas).
+    """
+    if instance.user_id is None or _origin_is(origin, User) or _bulk_deletion.get():
+        return
+    project_ids = Project.objects.filter(client_id=instance.pk).values_list('id', flat=True)
+    Tombstone.objects.bulk_create([
+        Tombstone(model='project', object_id=project_id, user_id=instance.user_id)
+        for project_id in project_ids
+    ])
+
+
+@receiver(post_delete, sender=Client)
+def record_client_deletion(sender, instance, origin=None, **kwargs):
+    """
+    Invalida la caché del propietario, lo que cubre también sus proyectos
+    borrados en cascada, y registra la eliminación para la sincronización.
+    """
+    if _bulk_deletion.get():
+        return
+    invalidate_user_cache(instance.user_id)
+    # Si se elimina el usuario, sus registros de eliminación también desaparecen
+    if instance.user_id is not None and not _origin_is(origin, User):
+        Tombstone.objects.create(model='client', object_id=instance.pk, user_id=instance.user_id)
+
+
+def _get_project_owner_id(instance):
+    return Client.objects.filter(pk=instance.client_id).values_list('user_id', flat=True).first()
+
+
+@receiver(pre_save, sender=Project)
+def load_project_counter_state(sender, instance, raw=False, **kwargs):
+    """
+    Si el proyecto no se cargó desde la base de datos (p. ej. se construyó con
+    un pk existente), se leen su cliente y estado actuales para poder ajustar
+    los contadores tras guardar.
+    """
+    if raw or instance._state.adding or hasattr(instance, '_counter_state'):
+        return
+    instance._counter_state = Project.objects.filter(pk=instance.pk).values_list('client_id', 'status').first()
+
+
+@receiver(post_save, sender=Project)
+def update_project_counters(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """
+    Ajusta con F() los contadores del cliente al crear un proyecto o cambiar
+    su estado o su cliente, e invalida la caché del propietario.
+    """
+    counted_fields_saved = update_fields is None or bool({'client', 'client_id', 'status'} & set(update_fields))
+    if not raw and counted_fields_saved:
+        current = (instance.client_id, instance.status)
+        deltas = CounterDeltas()
+        if created:
+            deltas.add(*current, 1)
+        elif getattr(instance, '_counter_state', None) is not None:
+            deltas.move(instance._counter_state, current)
+        deltas.apply()
+        instance._counter_state = current
+    invalidate_user_cache(_get_project_owner_id(instance))
+
+
+@receiver(pre_delete, sender=Project)
+def lock_project_counter_state(sender, instance, origin=None, **kwargs):
+    """
+    Bloquea la fila y lee el cliente y el estado que se descontarán. Django
+    envía post_delete aunque la fila ya no exista (eliminación repetida o
+    concurrente): sin fila no hay nada que descontar ni que registrar.
+    """
+    if _origin_is(origin, Client) or _origin_is(origin, User) or _bulk_deletion.get():
+        return
+    instance._deleted_state = (
+        Project.objects.select_for_update().filter(pk=instance.pk).values_list('client_id', 'status').first()
+    )
+
+
+@receiver(post_delete, sender=Project)
+def record_project_deletion(sender, instance, origin=None, **kwargs):
+    """
+    Descuenta el proyecto de los contadores del cliente, invalida la caché y
+    registra la eliminación. Las eliminaciones en cascada desde un cliente o un
+    usuario ya se gestionan en sus receptores.
+    """
+    if _origin_is(origin, Client) or _origin_is(origin, User) or _bulk_deletion.get():
+        return
+    deleted_state = getattr(instance, '_deleted_state', None)
+    if deleted_state is None:
+        return
+    deltas = CounterDeltas()
+    deltas.add(*deleted_state, -1)
+    deltas.apply()
+    user_id = Client.objects.filter(pk=deleted_state[0]).values_list('user_id', flat=True).first()
+    invalidate_user_cache(user_id)
+    if user_id is not None:
+        Tombstone.objects.create(model='project', object_id=instance.pk, user_id=user_id)
@@ -0,0 +1,65 @@
+import datetime
+
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from .models import Project
+
+STATUSES = [value for value, _ in Project.STATUS_CHOICES]
+
+
+def _empty_status_counts():
+    return {value: 0 for value in STATUSES}
+
+
+def build_project_summary(queryset, upcoming_days):
+    """
+    Resumen de proyectos por estado y por cliente, con vencidos y próximas
+    entregas, calculado con una sola consulta agrupada por (cliente, estado).
+    Los totales globales se obtienen sumando los grupos en Python.
+    """
+    today = timezone.localdate()
+    horizon = today + datetime.timedelta(days=upcoming_days)
+    open_projects = ~Q(status='completado') & Q(end_date__isnull=False)
+
+    groups = (
+        queryset.order_by()
+        .values('client_id', 'client__name', 'status')
+        .annotate(
+            total=Count('id'),
+            overdue=Count('id', filter=open_projects & Q(end_date__lt=today)),
+            upcoming=Count('id', filter=open_projects & Q(end_date__gte=today, end_date__lte=horizon)),
+            next_deadline=Min('end_date', filter=open_projects & Q(end_date__gte=today)),
+        )
+    )
+
+    summary = {
+        'total': 0,
+        'by_status': _empty_status_counts(),
+        'overdue': 0,
+        'upcoming': 0,
+        'upcoming_days': upcoming_days,
+        'next_deadline': None,
+    }
+    clients = {}
+    for group in groups:
+        client = clients.setdefault(group['client_id'], {
+            'client': group['client_id'],
+            'client_name': group['client__name'],
+            'total': 0,
+            'by_status': _empty_status_counts(),
+            'overdue': 0,
+            'upcoming': 0,
+            'next_deadline': None,
+        })
+        for target in (summary, client):
+            target['total'] += group['total']
+            target['by_status'][group['status']] = target['by_status'].get(group['status'], 0) + group['total']
+            target['overdue'] += group['overdue']
+            target['upcoming'] += group['upcoming']
+            deadline = group['next_deadline']
+            if deadline is not None and (target['next_deadline'] is None or deadline < target['next_deadline']):
+                target['next_deadline'] = deadline
+
+    summary['by_client'] = sorted(clients.values(), key=lambda item: (item['client_name'], item['client']))
+    return summary
@@ -0,0 +1,184 @@
+import datetime
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .models import Project, Tombstone
+
+TOKEN_SEPARATOR = '|'
+
+
+def encode_sync_token(moment, resume=None):
+    """
+    Token de sincronización. Sin `resume` codifica solo el instante desde el
+    que pedir cambios; con `resume = (next_since, position, deleted_after)` es
+    un token de continuación: la ronda que empezó en `moment` sigue tras la
+    fila `position = (updated_at, id)` y tras el id eliminado `deleted_after`
+    (`None` si aún no se entregó ninguno), y terminará entregando `next_since`.
+    """
+    parts = [moment.isoformat() if moment is not None else '']
+    if resume is not None:
+        next_since, position, deleted_after = resume
+        updated_at, pk = position if position is not None else (None, None)
+        parts += [
+            next_since.isoformat(),
+            updated_at.isoformat() if updated_at is not None else '',
+            str(pk) if pk is not None else '',
+            str(deleted_after) if deleted_after is not None else '',
+        ]
+    return urlsafe_b64encode(TOKEN_SEPARATOR.join(parts).encode('ascii')).decode('ascii')
+
+
+def _parse_moment(value):
+    moment = parse_datetime(value)
+    if moment is None or timezone.is_naive(moment):
+        raise ValueError(value)
+    return moment
+
+
+def decode_sync_token(token):
+    """Devuelve `(since, resume)`; ver `encode_sync_token`."""
+    try:
+        parts = urlsafe_b64decode(token.encode('ascii')).decode('ascii').split(TOKEN_SEPARATOR)
+        if len(parts) == 1:
+            return _parse_moment(parts[0]), None
+        since, next_since, updated_at, pk, deleted_after = parts
+        position = (_parse_moment(updated_at), int(pk)) if updated_at else None
+        return (
+            _parse_moment(since) if since else None,
+            (_parse_moment(next_since), position, int(deleted_after) if deleted_after else None),
+        )
+    except (TypeError, ValueError, UnicodeError):
+        raise ValidationError({'since': 'Token de sincronización no válido.'})
+
+
+def touch_client_projects(client_ids):
+    """
+    Marca como modificados los proyectos de los clientes renombrados:
+    `client_name` forma parte de su representación y la sincronización de
+    proyectos solo consulta su propio `updated_at`.
+    """
+    if client_ids:
+        Project.objects.filter(client_id__in=client_ids).update(updated_at=timezone.now())
+
+
+class IncrementalSyncMixin:
+    """
+    Modo delta del listado: `?since=<token>` devuelve solo las filas en las que
+    alguna de `sync_fields` cambió desde el token, los ids eliminados desde
+    entonces según `Tombstone`, y un nuevo token `next_since` para la
+    siguiente llamada.
+
+    La primera sincronización se hace con `?since=` vacío, que devuelve todas
+    las filas y el primer token.
+
+    `sync_fields` son columnas de fecha del propio modelo, cada una con un
+    índice que empieza por la columna de propiedad (usuario o cliente): el
+    coste del delta depende de los cambios y no del tamaño de los datos. Con
+    varias columnas las filas se leen del gestor del modelo por id, sin los
+    `select_related` de `get_queryset()`.
+
+    El delta se pagina con el tamaño de página del listado: las filas por
+    (updated_at, id) y los ids eliminados por id. Mientras `has_more` sea
+    verdadero, `next_since` es un token de continuación de la misma ronda y el
+    cliente debe seguir llamando con él.
+
+    El token final se fija en el inicio de la ronda menos `SYNC_SAFETY_WINDOW`
+    segundos, de modo que las transacciones en curso se vuelven a enviar en la
+    siguiente ronda en lugar de perderse; los clientes deben aplicar los
+    cambios de forma idempotente.
+    """
+    sync_model_name = None
+    sync_fields = ('updated_at',)
+
+    def list(self, request, *args, **kwargs):
+        token = request.query_params.get('since')
+        if token is None:
+            return super().list(request, *args, **kwargs)
+        if not token:
+            return self.sync_response(None)
+        return self.sync_response(*decode_sync_token(token))
+
+    def get_sync_queryset(self, since):
+        queryset = self.get_queryset()
+        if since is not None:
+            changed = [queryset.filter(**{f'{field}__gte': since}) for field in self.sync_fields]
+            if len(changed) == 1:
+                queryset = changed[0]
+            else:
+                # Con un OR sobre la consulta de la vista el planificador recorre todas las
+                # filas del usuario; así cada columna usa su índice y las filas se leen por id
+                condition = Q()
+                for rows in changed:
+                    condition |= Q(pk__in=rows.values('pk'))
+                queryset = queryset.model._default_manager.filter(condition)
+        return queryset.order_by('updated_at', 'id')
+
+    def get_deleted_ids(self, since, after, page_size):
+        """Ids eliminados desde `since` posteriores a `after`, hasta `page_size` más uno."""
+        if since is None:
+            return []
+        queryset = Tombstone.objects.filter(
+            user_id=self.request.user.id, model=self.sync_model_name, deleted_at__gte=since
+        )
+        if after is not None:
+            queryset = queryset.filter(object_id__gt=after)
+        return list(queryset.order_by('object_id').values_list('object_id', flat=True).distinct()[:page_size + 1])
+
+    def get_sync_page_size(self):
+        page_size = self.paginator.get_page_size(self.request) if self.paginator is not None else None
+        return page_size or settings.API_MAX_PAGE_SIZE
+
+    def get_sync_page(self, queryset, page_size):
+        """
+        Filas de la página (más una para saber si hay más) y su representación.
+        Usa la vía rápida de `.values()` si la vista la ofrece.
+        """
+        get_representation = getattr(self, 'get_values_representation', None)
+        representation = get_representation() if get_representation is not None else None
+        if representation is None:
+            rows = list(queryset[:page_size + 1])
+            return rows, self.get_serializer(rows[:page_size], many=True).data
+        rows = list(representation.values(queryset, ('updated_at', 'id'))[:page_size + 1])
+        return rows, representation.to_representation(rows[:page_size])
+
+    def sync_response(self, since, resume=None):
+        queryset = self.get_sync_queryset(since)
+        if resume is None:
+            window = datetime.timedelta(seconds=settings.SYNC_SAFETY_WINDOW)
+            next_since = timezone.now() - window
+            if since is not None:
+                next_since = max(since, next_since)
+            position = deleted_after = None
+        else:
+            next_since, position, deleted_after = resume
+        if position is not None:
+            # Equivale a (updated_at, id) > position, con un rango sobre el índice
+            updated_at, pk = position
+            queryset = queryset.filter(updated_at__gte=updated_at).exclude(updated_at=updated_at, id__lte=pk)
+
+        page_size = self.get_sync_page_size()
+        rows, results = self.get_sync_page(queryset, page_size)
+        deleted = self.get_deleted_ids(since, deleted_after, page_size)
+        has_more = len(rows) > page_size or len(deleted) > page_size
+        if has_more:
+            rows, deleted = rows[:page_size], deleted[:page_size]
+            if rows:
+                last = rows[-1]
+                position = (last['updated_at'], last['id']) if isinstance(last, dict) else (last.updated_at, last.id)
+            if deleted:
+                deleted_after = deleted[-1]
+            token = encode_sync_token(since, (next_since, position, deleted_after))
+        else:
+            token = encode_sync_token(next_since)
+        return Response({
+            'next_since': token,
+            'has_more': has_more,
+            'results': results,
+            'deleted': deleted,
+        })
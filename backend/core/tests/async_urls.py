@@ -0,0 +1,10 @@
+"""URLs del proyecto con las vistas de lectura asíncronas (`API_ASYNC_VIEWS`)."""
+from django.urls import include, path
+from core.async_views import async_read_urls
+from core.urls import router
+from user_manager.urls import urlpatterns as project_urlpatterns
+
+urlpatterns = [
+    path('api/', include(async_read_urls(router.urls))),
+    *project_urlpatterns,
+]
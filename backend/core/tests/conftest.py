@@ -1,5 +1,6 @@
 import pytest
 from django.urls import reverse
+from django.core.cache import caches
 from rest_framework.test import APIClient
 from .factories import UserFactory, ClientFactory, ProjectFactory
 
@@ -30,4 +31,21 @@ def authenticated_client(api_client, user):
     response = api_client.post(url, data, format='json')
     token = response.data['access']
     api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
-    return api_client 
\ No newline at end of file
+    return api_client
+
+@pytest.fixture
+def client_instance(user):
+    """
+    Fixture que crea un cliente del usuario de las pruebas.
+    """
+    return ClientFactory(user=user)
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Vacía las cachés locales entre pruebas: los ids se reutilizan al revertir
+    las transacciones y una respuesta cacheada podría filtrarse a otra prueba.
+    """
+    for cache in caches.all():
+        cache.clear()
+    yield
@@ -0,0 +1,177 @@
+import asyncio
+from unittest import mock
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+from core.async_views import AsyncReadMixin
+from core.authentication import StatelessJWTAuthentication, aauthenticate
+from core.pagination import KeysetCursorPagination
+from .factories import ClientFactory, ProjectFactory, UserFactory
+
+
+@pytest.fixture
+def async_urls(settings):
+    """Sirve la API con las vistas asíncronas, como bajo ASGI."""
+    settings.ROOT_URLCONF = 'core.tests.async_urls'
+
+
+@pytest.fixture
+def async_pagination():
+    """Cuenta las páginas obtenidas por la vía asíncrona."""
+    with mock.patch.object(KeysetCursorPagination, 'apaginate_queryset', autospec=True,
+                           side_effect=KeysetCursorPagination.apaginate_queryset) as spy:
+        yield spy
+
+
+@pytest.mark.django_db
+class TestAsyncReadViews:
+    """Pruebas para las vistas de lectura asíncronas de clientes y proyectos."""
+
+    def test_list_matches_sync_view(self, authenticated_client, user, settings, async_pagination):
+        """El listado asíncrono devuelve lo mismo que el síncrono."""
+        settings.API_CACHE_ENABLED = False
+        client_instance = ClientFactory(user=user)
+        ProjectFactory.create_batch(3, client=client_instance)
+        ProjectFactory()
+        url = reverse('project-list') + '?page_size=2'
+        sync_response = authenticated_client.get(url)
+
+        settings.ROOT_URLCONF = 'core.tests.async_urls'
+        async_response = authenticated_client.get(url)
+
+        assert async_pagination.called
+        assert async_response.status_code == status.HTTP_200_OK
+        assert async_response.json() == sync_response.json()
+        assert async_response['ETag'] == sync_response['ETag']
+        next_page = authenticated_client.get(async_response.json()['next'])
+        assert len(next_page.json()['results']) == 1
+
+    def test_list_supports_filters_and_not_modified(self, authenticated_client, user, async_urls,
+                                                    async_pagination):
+        """Los filtros y los validadores condicionales funcionan igual que en la vía síncrona."""
+        client_instance = ClientFactory(user=user)
+        ProjectFactory(client=client_instance, status='completado')
+        ProjectFactory(client=client_instance, status='pendiente')
+        url = reverse('project-list') + '?status=completado'
+        response = authenticated_client.get(url)
+        assert [item['status'] for item in response.json()['results']] == ['completado']
+
+        not_modified = authenticated_client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+        invalid = authenticated_client.get(reverse('project-list') + '?status=cancelado')
+        assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_retrieve(self, authenticated_client, user, async_urls):
+        """El detalle se obtiene con aget y respeta la propiedad y los campos dispersos."""
+        client_instance = ClientFactory(user=user)
+        with mock.patch.object(AsyncReadMixin, 'aget_object', autospec=True,
+                               side_effect=AsyncReadMixin.aget_object) as spy:
+            response = authenticated_client.get(
+                reverse('client-detail', args=[client_instance.id]) + '?fields=id,name'
+            )
+            other = authenticated_client.get(reverse('client-detail', args=[ClientFactory().id]))
+        assert spy.call_count == 2
+        assert response.json() == {'id': client_instance.id, 'name': client_instance.name}
+        assert other.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_by_status(self, authenticated_client, user, async_urls, async_pagination):
+        """by_status filtra de forma asíncrona y exige el parámetro status."""
+        client_instance = ClientFactory(user=user)
+        ProjectFactory(client=client_instance, status='en_progreso')
+        ProjectFactory(client=client_instance, status='pendiente')
+        response = authenticated_client.get(reverse('project-by-status') + '?status=en_progreso')
+        assert [item['status'] for item in response.json()['results']] == ['en_progreso']
+        assert async_pagination.called
+        missing = authenticated_client.get(reverse('project-by-status'))
+        assert missing.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_authentication_errors(self, api_client, async_urls):
+        """Sin token o con un token no válido se responde 401 como en la vía síncrona."""
+        url = reverse('client-list')
+        assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+        api_client.credentials(HTTP_AUTHORIZATION='Bearer no-es-un-token')
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response['WWW-Authenticate'].startswith('Bearer')
+
+    def test_unsupported_requests_use_sync_view(self, authenticated_client, user, async_urls):
+        """Las escrituras y la sincronización incremental se delegan en la vista síncrona."""
+        response = authenticated_client.post(reverse('client-list'), {
+            'name': 'Cliente nuevo', 'email': 'nuevo@example.com', 'phone': '+34 600 000 000',
+        }, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        delta = authenticated_client.get(reverse('client-list') + '?since=')
+        assert [item['name'] for item in delta.json()['results']] == ['Cliente nuevo']
+        assert 'next_since' in delta.json()
+
+    def test_served_by_asgi_handler(self, user, async_urls):
+        """Con el manejador ASGI de Django, con el middleware en modo asíncrono, la lectura funciona."""
+        ClientFactory(user=user, name='Cliente ASGI')
+        token = AccessToken.for_user(user)
+
+        async def fetch():
+            return await AsyncClient().get(reverse('client-list'), headers={'Authorization': f'Bearer {token}'})
+
+        response = async_to_sync(fetch)()
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['name'] for item in response.json()['results']] == ['Cliente ASGI']
+
+    def test_cache_is_not_blocking_the_event_loop(self, user, async_urls, settings):
+        """La caché de respuestas y el anclaje al primario no se consultan de forma síncrona en el bucle."""
+        settings.DATABASE_REPLICAS = ['default']
+        ClientFactory(user=user)
+        token = AccessToken.for_user(user)
+        on_loop = []
+
+        def spy(original):
+            def method(self, *args, **kwargs):
+                try:
+                    asyncio.get_running_loop()
+                    on_loop.append((original.__name__, args[0]))
+                except RuntimeError:
+                    pass
+                return original(self, *args, **kwargs)
+            return method
+
+        async def fetch():
+            return await AsyncClient().get(reverse('client-list'), headers={'Authorization': f'Bearer {token}'})
+
+        with mock.patch.object(LocMemCache, 'get', spy(LocMemCache.get)), \
+                mock.patch.object(LocMemCache, 'set', spy(LocMemCache.set)), \
+                mock.patch.object(LocMemCache, 'add', spy(LocMemCache.add)):
+            first = async_to_sync(fetch)()
+            second = async_to_sync(fetch)()
+
+        assert first.json() == second.json()
+        assert [key for _, key in on_loop if key.startswith(('api:', 'db:pin:'))] == []
+
+
+@pytest.mark.django_db
+class TestAsyncJWTAuthentication:
+    """Pruebas para la comprobación asíncrona del token JWT."""
+
+    def _request(self, token):
+        http_request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        return Request(http_request)
+
+    def test_stateless_authentication(self, user):
+        """El modo stateless comprueba el estado del usuario con la caché asíncrona."""
+        token = AccessToken.for_user(user)
+        authenticated, validated_token = async_to_sync(aauthenticate)(
+            StatelessJWTAuthentication(), self._request(token)
+        )
+        assert authenticated.id == user.id
+        assert validated_token['user_id'] == user.id
+
+    def test_inactive_user_is_rejected(self):
+        """Un usuario inactivo no se autentica."""
+        inactive = UserFactory(is_active=False)
+        with pytest.raises(AuthenticationFailed):
+            async_to_sync(aauthenticate)(StatelessJWTAuthentication(), self._request(AccessToken.for_user(inactive)))
@@ -2,7 +2,10 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
-from .factories import UserFactory
+from rest_framework_simplejwt.tokens import AccessToken
+from core.authentication import StatelessJWTAuthentication, StatelessUser, UserStatusCache, user_status_cache
+from core.views import UserViewSet, ClientViewSet, ProjectViewSet
+from .factories import UserFactory, ClientFactory
 
 @pytest.fixture
 def api_client():
@@ -78,4 +81,99 @@ class TestAuthentication:
         
         response = api_client.get(url)
         
-        assert response.status_code == status.HTTP_401_UNAUTHORIZED 
\ No newline at end of file
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+@pytest.fixture
+def stateless_auth(monkeypatch):
+    """
+    Activa la autenticación JWT stateless para la prueba. Las vistas leen
+    DEFAULT_AUTHENTICATION_CLASSES al importarse, por eso se parchean directamente.
+    """
+    for viewset in (UserViewSet, ClientViewSet, ProjectViewSet):
+        monkeypatch.setattr(viewset, 'authentication_classes', [StatelessJWTAuthentication])
+    user_status_cache.invalidate()
+    yield
+    user_status_cache.invalidate()
+
+@pytest.fixture
+def stateless_client(api_client, user, stateless_auth):
+    token = AccessToken.for_user(user)
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return api_client
+
+@pytest.mark.django_db
+class TestStatelessAuthentication:
+    """Pruebas para la autenticación JWT stateless."""
+    
+    def test_skips_user_query_once_status_is_cached(self, stateless_client, user, settings,
+                                                    django_assert_num_queries):
+        """Con el estado del usuario en caché, el listado no consulta auth_user."""
+        settings.API_CACHE_ENABLED = False
+        ClientFactory(user=user)
+        url = reverse('client-list')
+        stateless_client.get(url)
+        
+        # Solo la agregación de validadores (ETag) y la página de clientes
+        with django_assert_num_queries(2) as context:
+            response = stateless_client.get(url)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 1
+        assert not any('auth_user' in query['sql'] for query in context.captured_queries)
+    
+    def test_inactive_user_is_rejected(self, stateless_client, user):
+        """Desactivar al usuario invalida la caché y revoca el acceso."""
+        url = reverse('client-list')
+        assert stateless_client.get(url).status_code == status.HTTP_200_OK
+        
+        user.is_active = False
+        user.save()
+        
+        assert stateless_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_deleted_user_is_rejected(self, stateless_client, user):
+        """Un token de un usuario eliminado deja de ser válido."""
+        user.delete()
+        
+        response = stateless_client.get(reverse('client-list'))
+        
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_create_client(self, stateless_client, user):
+        """La creación asigna el usuario del token."""
+        data = {'name': 'Cliente', 'email': 'cliente@test.com', 'phone': '+34123456789'}
+        
+        response = stateless_client.post(reverse('client-list'), data, format='json')
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['user'] == user.id
+    
+    def test_stateless_user_loads_model_lazily(self, user, django_assert_num_queries):
+        """Los atributos distintos del id se cargan desde la base de datos una sola vez."""
+        stateless_user = StatelessUser(AccessToken.for_user(user))
+        
+        with django_assert_num_queries(0):
+            assert stateless_user.id == user.id
+            assert stateless_user.is_authenticated
+        with django_assert_num_queries(1):
+            assert stateless_user.email == user.email
+            assert stateless_user.username == user.username
+    
+    def test_status_cache_is_bounded(self, settings):
+        """La caché descarta primero las entradas caducadas y después las más antiguas."""
+        cache = UserStatusCache()
+        cache.max_entries = 3
+        settings.JWT_USER_STATUS_CACHE_TTL = 0
+        cache._store(1, True)
+        cache._store(2, True)
+        settings.JWT_USER_STATUS_CACHE_TTL = 30
+        cache._store(3, True)
+        cache._store(4, False)
+        
+        assert list(cache._entries) == [3, 4]
+        
+        cache._store(5, True)
+        cache._store(6, True)
+        
+        assert list(cache._entries) == [4, 5, 6]
+        assert cache._get_cached(4) == (True, False)
@@ -0,0 +1,187 @@
+import datetime
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from core.models import Client, Project, Tombstone
+from .factories import UserFactory, ClientFactory, ProjectFactory
+
+
+def project_payload(client_id, n):
+    today = timezone.now().date()
+    return {
+        'name': f'Proyecto {n}',
+        'description': 'Descripción',
+        'status': 'pendiente',
+        'client': client_id,
+        'start_date': today.isoformat(),
+        'end_date': (today + datetime.timedelta(days=10)).isoformat(),
+    }
+
+
+@pytest.mark.django_db
+class TestBulkEndpoints:
+    """Pruebas para las operaciones en lote de clientes y proyectos."""
+    
+    def test_bulk_create_clients(self, authenticated_client, user):
+        """Los clientes creados en lote pertenecen al usuario autenticado."""
+        other = UserFactory()
+        payload = [
+            {'name': f'Cliente {n}', 'email': f'c{n}@test.com', 'phone': '+34123456789', 'user': other.id}
+            for n in range(5)
+        ]
+        
+        response = authenticated_client.post(reverse('client-bulk'), payload, format='json')
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data) == 5
+        assert all(item['id'] for item in response.data)
+        assert Client.objects.filter(user=user).count() == 5
+    
+    def test_bulk_create_projects_with_constant_queries(self, authenticated_client, client_instance,
+                                                         django_assert_max_num_queries):
+        """La propiedad de los clientes se comprueba con una sola consulta para todo el lote."""
+        second_client = ClientFactory(user=client_instance.user)
+        payload = [project_payload((client_instance if n % 2 else second_client).id, n) for n in range(50)]
+        
+        # Autenticación, clientes del usuario, INSERT, un UPDATE de contadores por
+        # cliente y el savepoint de la transacción: no depende del número de filas
+        with django_assert_max_num_queries(8):
+            response = authenticated_client.post(reverse('project-bulk'), payload, format='json')
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Project.objects.filter(client__user=client_instance.user).count() == 50
+        assert {item['client_name'] for item in response.data} == {client_instance.name, second_client.name}
+    
+    def test_bulk_create_rejects_foreign_clients(self, authenticated_client, client_instance):
+        """Un cliente de otro usuario invalida el lote completo con errores por elemento."""
+        foreign = ClientFactory(user=UserFactory())
+        payload = [project_payload(client_instance.id, 0), project_payload(foreign.id, 1)]
+        
+        response = authenticated_client.post(reverse('project-bulk'), payload, format='json')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['errors'][0] == {}
+        assert 'client' in response.data['errors'][1]
+        assert not Project.objects.exists()
+    
+    def test_bulk_update_projects(self, authenticated_client, client_instance):
+        """PATCH en lote actualiza solo los campos enviados y refresca updated_at."""
+        projects = [ProjectFactory(client=client_instance, status='pendiente') for _ in range(3)]
+        payload = [{'id': project.id, 'status': 'completado'} for project in projects]
+        
+        response = authenticated_client.patch(reverse('project-bulk'), payload, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        for project in projects:
+            previous = project.updated_at
+            project.refresh_from_db()
+            assert project.status == 'completado'
+            assert project.updated_at > previous
+    
+    def test_bulk_update_unknown_id(self, authenticated_client, client_instance):
+        """Un id ajeno o inexistente devuelve un error en su posición y no aplica cambios."""
+        project = ProjectFactory(client=client_instance, status='pendiente')
+        foreign = ProjectFactory(client=ClientFactory(user=UserFactory()))
+        payload = [{'id': project.id, 'status': 'completado'}, {'id': foreign.id, 'status': 'completado'}]
+        
+        response = authenticated_client.patch(reverse('project-bulk'), payload, format='json')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['errors'] == [{}, {'id': ['No encontrado.']}]
+        project.refresh_from_db()
+        assert project.status == 'pendiente'
+    
+    def test_bulk_update_locks_rows_inside_transaction(self, authenticated_client, client_instance):
+        """Las filas se leen dentro de la transacción (y con FOR UPDATE donde se admite)."""
+        project = ProjectFactory(client=client_instance, status='pendiente')
+        payload = [{'id': project.id, 'status': 'completado'}]
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.patch(reverse('project-bulk'), payload, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        statements = [query['sql'] for query in queries]
+        savepoint = next(i for i, sql in enumerate(statements) if sql.startswith('SAVEPOINT'))
+        load = next(i for i, sql in enumerate(statements)
+                    if sql.startswith('SELECT') and f'"core_project"."id" IN ({project.id})' in sql)
+        assert savepoint < load
+        if connection.features.has_select_for_update:
+            assert 'FOR UPDATE' in statements[load]
+    
+    def test_bulk_delete_records_tombstones(self, authenticated_client, client_instance):
+        """La eliminación en lote registra las eliminaciones para la sincronización."""
+        projects = [ProjectFactory(client=client_instance) for _ in range(3)]
+        
+        response = authenticated_client.delete(
+            reverse('project-bulk'), [project.id for project in projects], format='json'
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'deleted': 3}
+        assert not Project.objects.exists()
+        assert Tombstone.objects.filter(model='project').count() == 3
+    
+    def test_bulk_delete_projects_with_constant_queries(self, authenticated_client, client_instance,
+                                                        django_assert_max_num_queries):
+        """Contadores, registros de eliminación y caché se actualizan una vez por lote, no por fila."""
+        projects = ProjectFactory.create_batch(25, client=client_instance, status='pendiente')
+        ProjectFactory(client=client_instance, status='completado')
+        
+        with django_assert_max_num_queries(12):
+            response = authenticated_client.delete(
+                reverse('project-bulk'), [project.id for project in projects], format='json'
+            )
+        
+        assert response.status_code == status.HTTP_200_OK
+        client_instance.refresh_from_db()
+        assert (client_instance.project_count, client_instance.pending_project_count) == (1, 0)
+        assert Tombstone.objects.filter(model='project').count() == 25
+    
+    def test_bulk_delete_clients_records_cascaded_projects(self, authenticated_client, client_instance):
+        """Eliminar clientes en lote registra también sus proyectos borrados en cascada."""
+        ProjectFactory.create_batch(2, client=client_instance)
+        url = reverse('client-list')
+        authenticated_client.get(url)
+        
+        response = authenticated_client.delete(reverse('client-bulk'), [client_instance.id], format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert Tombstone.objects.filter(model='client').count() == 1
+        assert Tombstone.objects.filter(model='project').count() == 2
+        assert authenticated_client.get(url).data['results'] == []
+    
+    def test_bulk_update_rejects_non_integer_ids(self, authenticated_client, client_instance):
+        """Un id que no es un entero devuelve un error en su posición, no un 500."""
+        project = ProjectFactory(client=client_instance)
+        payload = [{'id': project.id, 'status': 'completado'}, {'id': [1], 'status': 'completado'}]
+        
+        response = authenticated_client.patch(reverse('project-bulk'), payload, format='json')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['errors'] == [{}, {'id': ['Se esperaba un id entero.']}]
+    
+    def test_bulk_create_invalidates_list_cache(self, authenticated_client, user):
+        """bulk_create no emite señales, pero la caché del listado se invalida igualmente."""
+        url = reverse('client-list')
+        authenticated_client.get(url)
+        payload = [{'name': 'Nuevo', 'email': 'n@test.com', 'phone': '+34123456789'}]
+        
+        authenticated_client.post(reverse('client-bulk'), payload, format='json')
+        
+        assert len(authenticated_client.get(url).data['results']) == 1
+    
+    def test_bulk_rejects_non_list_payload(self, authenticated_client):
+        response = authenticated_client.post(reverse('client-bulk'), {'name': 'x'}, format='json')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_bulk_rejects_oversized_batch(self, authenticated_client, settings):
+        settings.API_BULK_MAX_ITEMS = 2
+        payload = [{'name': 'x', 'email': 'x@test.com', 'phone': '1'}] * 3
+        
+        response = authenticated_client.post(reverse('client-bulk'), payload, format='json')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
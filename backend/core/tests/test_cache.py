@@ -0,0 +1,99 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from core.models import Client
+from .factories import UserFactory, ClientFactory, ProjectFactory
+
+
+@pytest.mark.django_db
+class TestListResponseCache:
+    """Pruebas para la caché por usuario de los endpoints de listado."""
+    
+    def test_repeated_list_is_served_from_cache(self, authenticated_client, client_instance,
+                                                django_assert_max_num_queries):
+        """La segunda petición idéntica no consulta clientes ni proyectos."""
+        ProjectFactory(client=client_instance)
+        url = reverse('project-list')
+        first = authenticated_client.get(url)
+        
+        # Solo quedan la autenticación y la agregación de los validadores (ETag)
+        with django_assert_max_num_queries(2):
+            second = authenticated_client.get(url)
+        
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data == first.data
+    
+    def test_cache_is_per_user(self, authenticated_client, api_client, user):
+        """Cada usuario obtiene sus propios datos aunque la URL coincida."""
+        ClientFactory(user=user)
+        url = reverse('client-list')
+        authenticated_client.get(url)
+        
+        other_user = UserFactory()
+        other_client = ClientFactory(user=other_user)
+        api_client.force_authenticate(other_user)
+        response = api_client.get(url)
+        
+        assert [c['id'] for c in response.data['results']] == [other_client.id]
+    
+    def test_query_params_are_part_of_the_key(self, authenticated_client, client_instance):
+        """Distintos estados en by_status no comparten entrada de caché."""
+        pending = ProjectFactory(client=client_instance, status='pendiente')
+        done = ProjectFactory(client=client_instance, status='completado')
+        url = reverse('project-by-status')
+        
+        first = authenticated_client.get(f'{url}?status=pendiente')
+        second = authenticated_client.get(f'{url}?status=completado')
+        
+        assert [p['id'] for p in first.data['results']] == [pending.id]
+        assert [p['id'] for p in second.data['results']] == [done.id]
+    
+    def test_client_changes_invalidate_cache(self, authenticated_client, user):
+        """Crear, modificar o borrar un cliente invalida la lista cacheada."""
+        url = reverse('client-list')
+        client = ClientFactory(user=user)
+        authenticated_client.get(url)
+        
+        client.name = 'Nombre nuevo'
+        client.save()
+        response = authenticated_client.get(url)
+        assert response.data['results'][0]['name'] == 'Nombre nuevo'
+        
+        client.delete()
+        response = authenticated_client.get(url)
+        assert response.data['results'] == []
+    
+    def test_project_changes_invalidate_cache(self, authenticated_client, client_instance):
+        """Los cambios en proyectos invalidan la lista y el filtro por estado."""
+        url = f"{reverse('project-by-status')}?status=pendiente"
+        authenticated_client.get(url)
+        
+        project = ProjectFactory(client=client_instance, status='pendiente')
+        response = authenticated_client.get(url)
+        assert [p['id'] for p in response.data['results']] == [project.id]
+        
+        project.status = 'completado'
+        project.save()
+        response = authenticated_client.get(url)
+        assert response.data['results'] == []
+    
+    def test_client_cascade_delete_invalidates_projects(self, authenticated_client, client_instance):
+        """Borrar un cliente invalida también la lista de sus proyectos."""
+        ProjectFactory(client=client_instance)
+        url = reverse('project-list')
+        assert len(authenticated_client.get(url).data['results']) == 1
+        
+        client_instance.delete()
+        
+        assert authenticated_client.get(url).data['results'] == []
+    
+    def test_cache_can_be_disabled(self, authenticated_client, user, settings):
+        """Con API_CACHE_ENABLED desactivado cada petición recalcula la respuesta."""
+        settings.API_CACHE_ENABLED = False
+        url = reverse('client-list')
+        authenticated_client.get(url)
+        
+        # bulk_create no emite señales, así que solo se ve si no hay caché
+        Client.objects.bulk_create([Client(name='Sin señal', email='a@b.com', phone='1', user=user)])
+        
+        assert len(authenticated_client.get(url).data['results']) == 1
@@ -61,9 +61,9 @@ class TestClientEndpoints:
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 3
+        assert len(response.data['results']) == 3
         client_ids = [client.id for client in clients]
-        response_ids = [client['id'] for client in response.data]
+        response_ids = [client['id'] for client in response.data['results']]
         for client_id in client_ids:
             assert client_id in response_ids
     
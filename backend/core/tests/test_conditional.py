@@ -0,0 +1,150 @@
+import datetime
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import status
+from .factories import ProjectFactory
+
+
+@pytest.mark.django_db
+class TestConditionalRequests:
+    """Pruebas para ETag / Last-Modified en clientes y proyectos."""
+    
+    def test_detail_returns_validators(self, authenticated_client, client_instance):
+        """El detalle incluye un ETag fuerte y Last-Modified."""
+        response = authenticated_client.get(reverse('client-detail', args=[client_instance.id]))
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'].startswith('"')
+        assert response['Last-Modified'] == http_date(client_instance.updated_at.timestamp())
+    
+    def test_detail_if_none_match_returns_304(self, authenticated_client, client_instance):
+        """Un ETag vigente devuelve 304 sin cuerpo."""
+        url = reverse('client-detail', args=[client_instance.id])
+        etag = authenticated_client.get(url)['ETag']
+        
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert not response.content
+    
+    def test_detail_etag_changes_after_update(self, authenticated_client, client_instance):
+        """Modificar el objeto invalida el ETag anterior."""
+        url = reverse('client-detail', args=[client_instance.id])
+        etag = authenticated_client.get(url)['ETag']
+        client_instance.name = 'Otro nombre'
+        client_instance.save()
+        
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+    
+    def test_detail_if_modified_since(self, authenticated_client, client_instance):
+        """If-Modified-Since posterior a updated_at devuelve 304."""
+        url = reverse('client-detail', args=[client_instance.id])
+        future = http_date((timezone.now() + datetime.timedelta(hours=1)).timestamp())
+        
+        response = authenticated_client.get(url, HTTP_IF_MODIFIED_SINCE=future)
+        
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    
+    def test_project_etag_depends_on_client_name(self, authenticated_client, client_instance):
+        """Renombrar el cliente cambia el ETag del proyecto (incluye client_name)."""
+        project = ProjectFactory(client=client_instance)
+        url = reverse('project-detail', args=[project.id])
+        etag = authenticated_client.get(url)['ETag']
+        client_instance.name = 'Cliente renombrado'
+        client_instance.save()
+        
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['client_name'] == 'Cliente renombrado'
+    
+    def test_list_if_none_match_returns_304_without_loading_rows(self, authenticated_client, client_instance,
+                                                                 django_assert_max_num_queries):
+        """El listado responde 304 con una sola agregación, sin leer las filas."""
+        ProjectFactory(client=client_instance)
+        url = reverse('project-list')
+        etag = authenticated_client.get(url)['ETag']
+        
+        with django_assert_max_num_queries(2):
+            response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    
+    def test_list_etag_changes_on_delete(self, authenticated_client, client_instance):
+        """Eliminar una fila cambia el ETag del listado aunque max(updated_at) no cambie."""
+        first, second = ProjectFactory(client=client_instance), ProjectFactory(client=client_instance)
+        url = reverse('project-list')
+        etag = authenticated_client.get(url)['ETag']
+        (first if first.updated_at < second.updated_at else second).delete()
+        
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 1
+    
+    def test_list_ignores_if_modified_since_after_delete(self, authenticated_client, client_instance):
+        """El listado no emite Last-Modified: If-Modified-Since no oculta una eliminación."""
+        other = ProjectFactory(client=client_instance)
+        ProjectFactory(client=client_instance)
+        url = reverse('project-list')
+        assert 'Last-Modified' not in authenticated_client.get(url)
+        other.delete()
+        future = http_date((timezone.now() + datetime.timedelta(hours=1)).timestamp())
+        
+        response = authenticated_client.get(url, HTTP_IF_MODIFIED_SINCE=future)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 1
+    
+    def test_list_etag_depends_on_query(self, authenticated_client, client_instance):
+        """Cada filtro por estado tiene su propio ETag."""
+        ProjectFactory(client=client_instance, status='pendiente')
+        url = reverse('project-by-status')
+        etag = authenticated_client.get(f'{url}?status=pendiente')['ETag']
+        
+        response = authenticated_client.get(f'{url}?status=completado', HTTP_IF_NONE_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_200_OK
+    
+    def test_update_with_matching_if_match(self, authenticated_client, client_instance):
+        """PATCH con If-Match vigente se aplica y devuelve el nuevo ETag."""
+        url = reverse('client-detail', args=[client_instance.id])
+        etag = authenticated_client.get(url)['ETag']
+        
+        response = authenticated_client.patch(url, {'name': 'Nuevo'}, format='json', HTTP_IF_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['name'] == 'Nuevo'
+        assert response['ETag'] != etag
+    
+    def test_update_with_stale_if_match_returns_412(self, authenticated_client, client_instance):
+        """PUT con un ETag obsoleto no modifica el objeto."""
+        url = reverse('client-detail', args=[client_instance.id])
+        etag = authenticated_client.get(url)['ETag']
+        authenticated_client.patch(url, {'name': 'Cambio concurrente'}, format='json')
+        data = {'name': 'Perdido', 'email': 'a@test.com', 'phone': '+34123456789'}
+        
+        response = authenticated_client.put(url, data, format='json', HTTP_IF_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        client_instance.refresh_from_db()
+        assert client_instance.name == 'Cambio concurrente'
+    
+    def test_if_match_survives_project_creation_in_same_client(self, authenticated_client, client_instance):
+        """Crear otro proyecto del cliente cambia sus contadores, pero no el ETag de sus proyectos."""
+        project = ProjectFactory(client=client_instance)
+        url = reverse('project-detail', args=[project.id])
+        etag = authenticated_client.get(url)['ETag']
+        client_etag = authenticated_client.get(reverse('client-detail', args=[client_instance.id]))['ETag']
+        
+        ProjectFactory(client=client_instance)
+        response = authenticated_client.patch(url, {'name': 'Nuevo'}, format='json', HTTP_IF_MATCH=etag)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert authenticated_client.get(reverse('client-detail', args=[client_instance.id]))['ETag'] != client_etag
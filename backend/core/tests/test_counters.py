@@ -0,0 +1,131 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from core.models import Client, Project, Tombstone
+from .factories import ClientFactory, ProjectFactory
+
+
+def counters(client):
+    client.refresh_from_db()
+    return (
+        client.project_count, client.pending_project_count,
+        client.in_progress_project_count, client.completed_project_count,
+    )
+
+
+@pytest.mark.django_db
+class TestClientProjectCounters:
+    """Pruebas para los contadores desnormalizados de proyectos por cliente."""
+    
+    def test_create_and_delete_update_counters(self, client_instance):
+        project = ProjectFactory(client=client_instance, status='pendiente')
+        ProjectFactory(client=client_instance, status='completado')
+        assert counters(client_instance) == (2, 1, 0, 1)
+        
+        project.delete()
+        
+        assert counters(client_instance) == (1, 0, 0, 1)
+    
+    def test_status_change_moves_counter(self, client_instance):
+        project = ProjectFactory(client=client_instance, status='pendiente')
+        
+        project = Project.objects.get(pk=project.pk)
+        project.status = 'en_progreso'
+        project.save()
+        
+        assert counters(client_instance) == (1, 0, 1, 0)
+    
+    def test_client_change_moves_counter(self, client_instance):
+        other = ClientFactory(user=client_instance.user)
+        project = ProjectFactory(client=client_instance, status='completado')
+        
+        project.client = other
+        project.save()
+        
+        assert counters(client_instance) == (0, 0, 0, 0)
+        assert counters(other) == (1, 0, 0, 1)
+    
+    def test_save_without_changes_keeps_counters(self, client_instance):
+        project = ProjectFactory(client=client_instance, status='pendiente')
+        
+        project.name = 'Otro nombre'
+        project.save()
+        Project(pk=project.pk, name='x', description='d', status='pendiente',
+                client=client_instance, start_date=project.start_date, created_at=project.created_at).save()
+        
+        assert counters(client_instance) == (1, 1, 0, 0)
+    
+    def test_repeated_delete_is_counted_once(self, client_instance):
+        """Eliminar de nuevo un proyecto que ya no existe no vuelve a descontarlo."""
+        project = ProjectFactory(client=client_instance, status='pendiente')
+        stale = Project.objects.get(pk=project.pk)
+        project.delete()
+        
+        stale.delete()
+        
+        assert counters(client_instance) == (0, 0, 0, 0)
+        assert Tombstone.objects.filter(model='project').count() == 1
+    
+    def test_stale_status_change_is_counted_once(self, client_instance):
+        """Dos cambios de estado desde copias antiguas solo mueven el contador una vez."""
+        project = ProjectFactory(client=client_instance, status='pendiente')
+        first = Project.objects.get(pk=project.pk)
+        second = Project.objects.get(pk=project.pk)
+        
+        first.status = second.status = 'completado'
+        first.save()
+        second.save()
+        
+        assert counters(client_instance) == (1, 0, 0, 1)
+    
+    def test_bulk_endpoints_update_counters(self, authenticated_client, client_instance):
+        payload = [{
+            'name': f'P{n}', 'description': 'd', 'status': 'pendiente',
+            'client': client_instance.id, 'start_date': '2025-01-01',
+        } for n in range(3)]
+        created = authenticated_client.post(reverse('project-bulk'), payload, format='json').data
+        assert counters(client_instance) == (3, 3, 0, 0)
+        
+        authenticated_client.patch(
+            reverse('project-bulk'), [{'id': created[0]['id'], 'status': 'completado'}], format='json'
+        )
+        assert counters(client_instance) == (3, 2, 0, 1)
+        
+        authenticated_client.delete(reverse('project-bulk'), [created[1]['id']], format='json')
+        assert counters(client_instance) == (2, 1, 0, 1)
+    
+    def test_serializer_exposes_counters(self, authenticated_client, client_instance):
+        ProjectFactory(client=client_instance, status='en_progreso')
+        
+        response = authenticated_client.get(reverse('client-detail', args=[client_instance.id]))
+        
+        assert response.data['project_count'] == 1
+        assert response.data['in_progress_project_count'] == 1
+    
+    def test_recompute_command(self, client_instance):
+        ProjectFactory(client=client_instance, status='pendiente')
+        ProjectFactory(client=client_instance, status='completado')
+        Client.objects.update(project_count=0, pending_project_count=9)
+        
+        call_command('recompute_client_counters')
+        
+        assert counters(client_instance) == (2, 1, 0, 1)
+    
+    def test_recompute_refreshes_validators_and_cache(self, authenticated_client, client_instance, capsys):
+        """Solo se corrigen los clientes desviados, y el listado deja de servir el contador antiguo."""
+        ProjectFactory(client=client_instance)
+        correct = ClientFactory(user=client_instance.user)
+        url = reverse('client-list')
+        Client.objects.filter(pk=client_instance.pk).update(project_count=7)
+        stale = authenticated_client.get(url)
+        correct_before = Client.objects.get(pk=correct.pk).counters_updated_at
+        
+        call_command('recompute_client_counters')
+        
+        assert 'corregidos en 1 clientes' in capsys.readouterr().out
+        assert authenticated_client.get(url, HTTP_IF_NONE_MATCH=stale['ETag']).status_code == 200
+        response = authenticated_client.get(url)
+        assert {c['id']: c['project_count'] for c in response.data['results']} == {
+            client_instance.id: 1, correct.id: 0,
+        }
+        assert Client.objects.get(pk=correct.pk).counters_updated_at == correct_before
@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from .factories import UserFactory, ClientFactory, ProjectFactory
+
+
+def read_streaming(response):
+    return b''.join(response.streaming_content).decode('utf-8')
+
+
+@pytest.mark.django_db
+class TestExport:
+    """Pruebas para la exportación en streaming de clientes y proyectos."""
+    
+    def test_projects_csv_export(self, authenticated_client, client_instance):
+        """La exportación CSV contiene los proyectos del usuario con el nombre del cliente."""
+        projects = [ProjectFactory(client=client_instance) for _ in range(3)]
+        ProjectFactory(client=ClientFactory(user=UserFactory()))
+        
+        response = authenticated_client.get(reverse('project-export'))
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'].startswith('text/csv')
+        assert 'proyectos.csv' in response['Content-Disposition']
+        rows = list(csv.DictReader(io.StringIO(read_streaming(response))))
+        assert sorted(int(row['id']) for row in rows) == sorted(project.id for project in projects)
+        assert {row['client_name'] for row in rows} == {client_instance.name}
+    
+    def test_export_matches_api_representation(self, authenticated_client, client_instance):
+        """Los valores exportados coinciden con los que devuelve el detalle de la API."""
+        project = ProjectFactory(client=client_instance)
+        detail = authenticated_client.get(reverse('project-detail', args=[project.id])).data
+        
+        response = authenticated_client.get(reverse('project-export'), {'format': 'ndjson'})
+        
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        (row,) = [json.loads(line) for line in read_streaming(response).splitlines()]
+        assert row == dict(detail)
+    
+    def test_clients_ndjson_export(self, authenticated_client, user):
+        """Los clientes se exportan en NDJSON, una línea por cliente."""
+        clients = [ClientFactory(user=user) for _ in range(2)]
+        
+        response = authenticated_client.get(reverse('client-export'), HTTP_ACCEPT='application/x-ndjson')
+        
+        rows = [json.loads(line) for line in read_streaming(response).splitlines()]
+        assert sorted(row['id'] for row in rows) == sorted(client.id for client in clients)
+        assert 'user' not in rows[0]
+    
+    def test_export_query_count_is_constant(self, authenticated_client, client_instance, settings,
+                                            django_assert_max_num_queries):
+        """El número de consultas no depende del número de filas."""
+        settings.EXPORT_CHUNK_SIZE = 2
+        for _ in range(5):
+            ProjectFactory(client=client_instance)
+        
+        with django_assert_max_num_queries(2):
+            content = read_streaming(authenticated_client.get(reverse('project-export')))
+        
+        assert len(content.splitlines()) == 6
+    
+    def test_export_requires_authentication(self, api_client):
+        response = api_client.get(reverse('project-export'))
+        
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_export_streams_asynchronously_under_asgi(self, user, settings):
+        """Bajo ASGI la respuesta usa un iterador asíncrono y no se acumula en memoria."""
+        settings.EXPORT_CHUNK_SIZE = 2
+        client_instance = ClientFactory(user=user)
+        projects = ProjectFactory.create_batch(5, client=client_instance)
+        token = AccessToken.for_user(user)
+        
+        async def fetch():
+            response = await AsyncClient().get(reverse('project-export'), headers={'Authorization': f'Bearer {token}'})
+            chunks = [chunk async for chunk in response.streaming_content]
+            return response, chunks
+        
+        response, chunks = async_to_sync(fetch)()
+        
+        assert response.is_async
+        assert len(chunks) == 4
+        rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode('utf-8'))))
+        assert sorted(int(row['id']) for row in rows) == sorted(project.id for project in projects)
@@ -0,0 +1,118 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from .factories import ProjectFactory
+
+
+def project_selects(queries):
+    """Consultas SELECT sobre la tabla de proyectos ejecutadas durante la petición."""
+    return [query['sql'] for query in queries if query['sql'].startswith('SELECT') and 'core_project' in query['sql']
+            and 'COUNT' not in query['sql'] and 'MAX' not in query['sql']]
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """Pruebas para la selección de campos con ?fields= y ?exclude=."""
+    
+    def test_fields_trims_list(self, authenticated_client, client_instance):
+        """?fields= devuelve solo los campos pedidos, en el orden del serializador."""
+        project = ProjectFactory(client=client_instance)
+        
+        response = authenticated_client.get(reverse('project-list'), {'fields': 'status,id,name'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == [{'id': project.id, 'name': project.name, 'status': project.status}]
+        assert list(response.data['results'][0]) == ['id', 'name', 'status']
+    
+    def test_exclude_removes_fields(self, authenticated_client, client_instance):
+        """?exclude= omite los campos indicados."""
+        ProjectFactory(client=client_instance)
+        
+        response = authenticated_client.get(reverse('project-list'), {'exclude': 'description,client_name'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        (item,) = response.data['results']
+        assert 'description' not in item and 'client_name' not in item
+        assert {'id', 'name', 'status', 'client', 'created_at'} <= set(item)
+    
+    def test_invalid_fields_are_rejected(self, authenticated_client):
+        """Los campos fuera de la lista permitida producen un 400."""
+        response = authenticated_client.get(reverse('project-list'), {'fields': 'id,client__user__password'})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'client__user__password' in str(response.data['fields'])
+    
+    def test_empty_selection_is_rejected(self, authenticated_client):
+        """No se puede excluir todos los campos pedidos."""
+        response = authenticated_client.get(reverse('client-list'), {'fields': 'id', 'exclude': 'id'})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_list_skips_client_columns(self, authenticated_client, client_instance, django_assert_max_num_queries):
+        """Sin client_name no se leen las columnas del cliente ni la descripción."""
+        ProjectFactory.create_batch(3, client=client_instance)
+        
+        with django_assert_max_num_queries(3) as context:
+            response = authenticated_client.get(reverse('project-list'), {'fields': 'id,name,status'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        (sql,) = project_selects(context.captured_queries)
+        select_clause = sql.split(' FROM ')[0]
+        assert '"core_client"' not in select_clause
+        assert 'description' not in select_clause
+    
+    def test_serializer_path_uses_only(self, authenticated_client, client_instance, settings,
+                                       django_assert_max_num_queries):
+        """Sin la vía de .values() la selección se aplica con .only() y sin join al cliente."""
+        settings.API_LIST_FAST_PATH = False
+        ProjectFactory.create_batch(3, client=client_instance)
+        
+        with django_assert_max_num_queries(3) as context:
+            response = authenticated_client.get(reverse('project-list'), {'fields': 'id,client'})
+        
+        assert response.data['results'][0] == {'id': response.data['results'][0]['id'], 'client': client_instance.id}
+        (sql,) = project_selects(context.captured_queries)
+        assert '"core_client"."name"' not in sql
+        assert 'description' not in sql.split(' FROM ')[0]
+    
+    def test_client_name_keeps_join(self, authenticated_client, client_instance):
+        """Si se pide client_name se sigue incluyendo el nombre del cliente."""
+        ProjectFactory(client=client_instance)
+        
+        response = authenticated_client.get(reverse('project-list'), {'fields': 'id,client_name'})
+        
+        assert response.data['results'][0]['client_name'] == client_instance.name
+    
+    def test_retrieve_uses_only(self, authenticated_client, client_instance, django_assert_max_num_queries):
+        """El detalle recorta los campos y difiere las columnas no pedidas."""
+        project = ProjectFactory(client=client_instance)
+        
+        with django_assert_max_num_queries(2) as context:
+            response = authenticated_client.get(reverse('project-detail', args=[project.id]), {'fields': 'id,name'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'id': project.id, 'name': project.name}
+        (sql,) = project_selects(context.captured_queries)
+        assert 'description' not in sql.split(' FROM ')[0]
+    
+    def test_by_status_and_clients_support_fields(self, authenticated_client, client_instance):
+        """El filtro por estado y el listado de clientes también admiten ?fields=."""
+        ProjectFactory(client=client_instance, status='pendiente')
+        
+        by_status = authenticated_client.get(reverse('project-by-status'), {'status': 'pendiente', 'fields': 'id'})
+        clients = authenticated_client.get(reverse('client-list'), {'fields': 'name,project_count'})
+        
+        assert list(by_status.data['results'][0]) == ['id']
+        assert clients.data['results'] == [{'name': client_instance.name, 'project_count': 1}]
+    
+    def test_fields_ignored_on_writes(self, authenticated_client, client_instance):
+        """Las escrituras devuelven la representación completa."""
+        response = authenticated_client.post(
+            f"{reverse('project-list')}?fields=id",
+            {'name': 'Nuevo', 'description': 'd', 'status': 'pendiente', 'client': client_instance.id,
+             'start_date': '2024-01-01'},
+            format='json',
+        )
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['name'] == 'Nuevo'
@@ -0,0 +1,168 @@
+import datetime
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from .factories import UserFactory, ClientFactory, ProjectFactory
+
+
+def result_ids(response):
+    return [item['id'] for item in response.data['results']]
+
+
+def get_all_ids(api_client, url, params):
+    """Recorre todas las páginas hacia delante y devuelve los ids en orden."""
+    ids = []
+    response = api_client.get(url, params)
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        ids.extend(result_ids(response))
+        if not response.data['next']:
+            return ids, response
+        response = api_client.get(response.data['next'])
+
+
+@pytest.mark.django_db
+class TestProjectFilters:
+    """Pruebas para los filtros validados del listado de proyectos."""
+    
+    def test_filter_by_status_set(self, authenticated_client, client_instance):
+        """?status= admite varios estados separados por comas."""
+        pending = ProjectFactory(client=client_instance, status='pendiente')
+        in_progress = ProjectFactory(client=client_instance, status='en_progreso')
+        ProjectFactory(client=client_instance, status='completado')
+        
+        response = authenticated_client.get(reverse('project-list'), {'status': 'pendiente,en_progreso'})
+        
+        assert sorted(result_ids(response)) == sorted([pending.id, in_progress.id])
+    
+    @pytest.mark.parametrize('url_name', ['project-list', 'project-by-status'])
+    def test_invalid_status_is_rejected(self, authenticated_client, url_name):
+        """Los estados fuera de STATUS_CHOICES producen un 400, también en by_status."""
+        response = authenticated_client.get(reverse(url_name), {'status': 'cancelado'})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'cancelado' in str(response.data['status'])
+    
+    def test_filter_by_client(self, authenticated_client, user, client_instance):
+        """?client= limita los proyectos a un cliente."""
+        project = ProjectFactory(client=client_instance)
+        ProjectFactory(client=ClientFactory(user=user))
+        
+        response = authenticated_client.get(reverse('project-list'), {'client': client_instance.id})
+        
+        assert result_ids(response) == [project.id]
+    
+    def test_filter_by_date_ranges(self, authenticated_client, client_instance):
+        """Los rangos de fechas son inclusivos."""
+        base = datetime.date(2024, 1, 10)
+        projects = [
+            ProjectFactory(client=client_instance, start_date=base + datetime.timedelta(days=i),
+                           end_date=base + datetime.timedelta(days=30 + i))
+            for i in range(5)
+        ]
+        
+        response = authenticated_client.get(reverse('project-list'), {
+            'start_date_after': '2024-01-11', 'start_date_before': '2024-01-13', 'end_date_before': '2024-02-11',
+        })
+        
+        assert sorted(result_ids(response)) == [projects[1].id, projects[2].id]
+    
+    def test_invalid_range_is_rejected(self, authenticated_client):
+        """Un rango invertido o una fecha mal formada producen un 400."""
+        inverted = authenticated_client.get(reverse('project-list'), {
+            'end_date_after': '2024-02-01', 'end_date_before': '2024-01-01',
+        })
+        malformed = authenticated_client.get(reverse('project-list'), {'start_date_after': '01/02/2024'})
+        
+        assert inverted.status_code == status.HTTP_400_BAD_REQUEST
+        assert malformed.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_filter_overdue(self, authenticated_client, client_instance):
+        """?overdue=true devuelve los proyectos no completados con la entrega vencida."""
+        yesterday = timezone.localdate() - datetime.timedelta(days=1)
+        overdue = ProjectFactory(client=client_instance, status='en_progreso', end_date=yesterday)
+        completed = ProjectFactory(client=client_instance, status='completado', end_date=yesterday)
+        without_date = ProjectFactory(client=client_instance, status='pendiente', end_date=None)
+        
+        overdue_response = authenticated_client.get(reverse('project-list'), {'overdue': 'true'})
+        rest_response = authenticated_client.get(reverse('project-list'), {'overdue': 'false'})
+        
+        assert result_ids(overdue_response) == [overdue.id]
+        assert sorted(result_ids(rest_response)) == sorted([completed.id, without_date.id])
+    
+    def test_filters_do_not_leak_other_users(self, authenticated_client):
+        """Filtrar por un cliente de otro usuario no devuelve nada."""
+        other_client = ClientFactory(user=UserFactory())
+        ProjectFactory(client=other_client)
+        
+        response = authenticated_client.get(reverse('project-list'), {'client': other_client.id})
+        
+        assert response.data['results'] == []
+
+
+@pytest.mark.django_db
+class TestProjectOrdering:
+    """Pruebas para ?ordering= con paginación por cursor."""
+    
+    @pytest.mark.parametrize('ordering', ['end_date', '-end_date'])
+    def test_nullable_ordering_paginates_forward_and_back(self, authenticated_client, client_instance,
+                                                          settings, ordering):
+        """Ordenar por end_date (opcional) recorre todas las filas una vez, con los nulos tratados como mayores."""
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'PAGE_SIZE': 2}
+        base = datetime.date(2024, 3, 1)
+        projects = [ProjectFactory(client=client_instance, end_date=None) for _ in range(3)]
+        projects += [ProjectFactory(client=client_instance, end_date=base + datetime.timedelta(days=i % 2))
+                     for i in range(4)]
+        
+        ids, last_page = get_all_ids(authenticated_client, reverse('project-list'), {'ordering': ordering})
+        
+        def key(project):
+            return (project.end_date is None, project.end_date or base, project.id)
+        expected = [project.id for project in sorted(projects, key=key, reverse=ordering.startswith('-'))]
+        assert ids == expected
+        
+        backwards = []
+        response = last_page
+        while response.data['previous']:
+            response = authenticated_client.get(response.data['previous'])
+            backwards = result_ids(response) + backwards
+        assert backwards + result_ids(last_page) == expected
+    
+    def test_ordering_by_start_date(self, authenticated_client, client_instance):
+        """?ordering=start_date ordena de forma ascendente con id como desempate."""
+        later = ProjectFactory(client=client_instance, start_date=datetime.date(2024, 5, 1))
+        earlier = ProjectFactory(client=client_instance, start_date=datetime.date(2024, 4, 1))
+        
+        response = authenticated_client.get(reverse('project-list'), {'ordering': 'start_date'})
+        
+        assert result_ids(response) == [earlier.id, later.id]
+    
+    @pytest.mark.parametrize('ordering', ['name', 'client__name', '--end_date', 'end_date,id'])
+    def test_ordering_outside_whitelist_is_rejected(self, authenticated_client, ordering):
+        """Solo se admiten los campos de ordering_fields."""
+        response = authenticated_client.get(reverse('project-list'), {'ordering': ordering})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'ordering' in response.data
+    
+    def test_ordering_takes_precedence_over_relevance(self, authenticated_client, client_instance):
+        """Con ?q= y ?ordering= se respeta el orden pedido."""
+        first = ProjectFactory(client=client_instance, name='Informe', description='informe informe',
+                               start_date=datetime.date(2024, 1, 1))
+        second = ProjectFactory(client=client_instance, name='Otro', description='informe',
+                                start_date=datetime.date(2024, 2, 1))
+        
+        response = authenticated_client.get(reverse('project-list'), {'q': 'informe', 'ordering': '-start_date'})
+        
+        assert result_ids(response) == [second.id, first.id]
+    
+    def test_filters_do_not_apply_to_detail_actions(self, authenticated_client, client_instance):
+        """Los parámetros de filtro del listado no afectan a retrieve, update ni destroy."""
+        project = ProjectFactory(client=client_instance, status='pendiente')
+        url = reverse('project-detail', args=[project.id])
+        
+        assert authenticated_client.get(url, {'status': 'completado', 'q': 'nada'}).status_code == status.HTTP_200_OK
+        response = authenticated_client.patch(f'{url}?status=bogus', {'name': 'Otro'}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert authenticated_client.delete(f'{url}?ordering=bogus').status_code == status.HTTP_204_NO_CONTENT
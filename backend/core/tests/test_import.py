@@ -0,0 +1,121 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command, CommandError
+from django.urls import reverse
+from rest_framework import status
+from core.models import Client, Project
+from .factories import UserFactory, ClientFactory
+
+
+def clients_csv_with_invalid_bytes(rows):
+    """CSV de clientes válido hasta la fila `rows` seguido de bytes que no son UTF-8."""
+    lines = ['name,email,phone'] + [f'Cliente {n},c{n}@test.com,+34600000000' for n in range(rows)]
+    return ('\n'.join(lines) + '\n').encode('utf-8') + b'Cliente \xff,x@test.com,+34600000000\n'
+
+
+CLIENTS_CSV = (
+    "name,email,phone\n"
+    "Cliente A,a@test.com,+34111111111\n"
+    "Cliente B,no-es-email,+34222222222\n"
+    "Cliente C,c@test.com,\n"
+    "Cliente D,d@test.com,+34444444444\n"
+)
+
+
+@pytest.mark.django_db
+class TestCSVImport:
+    """Pruebas para la importación de clientes y proyectos desde CSV."""
+    
+    def test_import_command_reports_created_and_rejected(self, tmp_path, user, capsys):
+        """El comando importa las filas válidas e informa de las rechazadas."""
+        path = tmp_path / 'clientes.csv'
+        path.write_text(CLIENTS_CSV, encoding='utf-8')
+        
+        call_command('import_core_data', user=user.username, clients=str(path), batch_size=2,
+                     show_rejections=True)
+        
+        output = capsys.readouterr().out
+        assert set(Client.objects.filter(user=user).values_list('name', flat=True)) == {'Cliente A', 'Cliente D'}
+        assert '2 creados, 2 rechazados' in output
+        assert 'línea 3' in output and 'línea 4' in output
+    
+    def test_import_projects_by_client_name(self, tmp_path, user):
+        """Los proyectos pueden referenciar al cliente por nombre, solo entre los del usuario."""
+        ClientFactory(user=user, name='Acme')
+        ClientFactory(user=UserFactory(), name='Ajeno')
+        path = tmp_path / 'proyectos.csv'
+        path.write_text(
+            "name,description,status,client_name,start_date,end_date\n"
+            "P1,Desc,pendiente,Acme,2025-01-01,\n"
+            "P2,Desc,completado,Ajeno,2025-01-01,2025-02-01\n"
+            "P3,Desc,desconocido,Acme,2025-01-01,\n",
+            encoding='utf-8',
+        )
+        
+        call_command('import_core_data', user=user.username, projects=str(path))
+        
+        assert list(Project.objects.values_list('name', 'client__name')) == [('P1', 'Acme')]
+    
+    def test_import_command_requires_existing_user(self, tmp_path):
+        with pytest.raises(CommandError):
+            call_command('import_core_data', user='no-existe', clients=str(tmp_path / 'x.csv'))
+    
+    def test_upload_endpoint(self, authenticated_client, user):
+        """El endpoint de subida devuelve el informe de la importación."""
+        upload = SimpleUploadedFile('clientes.csv', CLIENTS_CSV.encode('utf-8'), content_type='text/csv')
+        
+        response = authenticated_client.post(reverse('client-import-csv'), {'file': upload}, format='multipart')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['created'] == 2
+        assert response.data['rejected'] == 2
+        assert [r['line'] for r in response.data['rejections']] == [3, 4]
+        assert 'email' in response.data['rejections'][0]['errors']
+        assert response.data['rows_per_second'] > 0
+    
+    def test_upload_projects_with_foreign_client_id(self, authenticated_client, user):
+        """Un id de cliente de otro usuario se rechaza."""
+        own = ClientFactory(user=user)
+        foreign = ClientFactory(user=UserFactory())
+        content = (
+            "name,description,status,client,start_date\n"
+            f"P1,Desc,pendiente,{own.id},2025-01-01\n"
+            f"P2,Desc,pendiente,{foreign.id},2025-01-01\n"
+        )
+        upload = SimpleUploadedFile('proyectos.csv', content.encode('utf-8'), content_type='text/csv')
+        
+        response = authenticated_client.post(reverse('project-import-csv'), {'file': upload}, format='multipart')
+        
+        assert (response.data['created'], response.data['rejected']) == (1, 1)
+        assert Project.objects.get().client == own
+    
+    def test_upload_requires_file(self, authenticated_client):
+        response = authenticated_client.post(reverse('client-import-csv'), {}, format='multipart')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_upload_with_invalid_encoding_reports_partial_import(self, authenticated_client, user, settings):
+        """Un error de lectura a mitad devuelve el informe parcial y la caché refleja lo importado."""
+        settings.IMPORT_BATCH_SIZE = 50
+        url = reverse('client-list')
+        assert authenticated_client.get(url).data['results'] == []
+        upload = SimpleUploadedFile('clientes.csv', clients_csv_with_invalid_bytes(400), content_type='text/csv')
+        
+        response = authenticated_client.post(reverse('client-import-csv'), {'file': upload}, format='multipart')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        created = response.data['created']
+        assert 0 < created <= 400
+        assert response.data['error']['line'] == created + 2
+        assert Client.objects.filter(user=user).count() == created
+        assert authenticated_client.get(url).data['results']
+    
+    def test_import_command_reports_invalid_csv(self, tmp_path, user, capsys):
+        """El comando informa de la línea del error en lugar de mostrar una traza."""
+        path = tmp_path / 'clientes.csv'
+        path.write_bytes(clients_csv_with_invalid_bytes(3))
+        
+        with pytest.raises(CommandError, match='línea 1'):
+            call_command('import_core_data', user=user.username, clients=str(path))
+        
+        assert '0 creados' in capsys.readouterr().out
@@ -0,0 +1,113 @@
+import datetime
+import pytest
+from types import SimpleNamespace
+from django.db import connection
+from core.filters import OPEN_STATUSES
+from core.pagination import order_queryset
+from core.views import ClientViewSet, ProjectViewSet
+from .factories import UserFactory, ClientFactory, ProjectFactory
+
+
+def get_view_queryset(viewset_class, user):
+    """Devuelve el queryset que usaría la vista para el usuario dado."""
+    view = viewset_class()
+    view.request = SimpleNamespace(user=user)
+    return view.get_queryset()
+
+
+def explain(queryset):
+    """Plan de ejecución de la consulta, forzando el uso de índices en PostgreSQL."""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+    return queryset.explain()
+
+
+@pytest.fixture
+def dataset():
+    user = UserFactory()
+    clients = [ClientFactory(user=user) for _ in range(3)]
+    for client in clients:
+        for _ in range(3):
+            ProjectFactory(client=client)
+    ClientFactory(user=UserFactory())
+    return user
+
+
+@pytest.mark.django_db
+class TestAccessPathIndexes:
+    """Comprueba que las consultas principales usan los índices compuestos."""
+    
+    def test_client_list_uses_user_created_index(self, dataset):
+        queryset = get_view_queryset(ClientViewSet, dataset).order_by('-created_at', '-id')
+        
+        assert 'client_user_created_idx' in explain(queryset)
+    
+    def test_project_list_uses_client_created_index(self, dataset):
+        # Al recorrer varios clientes el orden se resuelve con una ordenación, y
+        # cualquier índice que empiece por client sirve para el filtro
+        queryset = get_view_queryset(ProjectViewSet, dataset).order_by('-created_at', '-id')
+        
+        plan = explain(queryset)
+        
+        assert 'project_client_' in plan
+    
+    def test_client_project_list_is_ordered_by_index(self, dataset):
+        """Con ?client= el orden por defecto se lee del índice, sin ordenación adicional."""
+        client_id = dataset.clients.first().id
+        queryset = get_view_queryset(ProjectViewSet, dataset).filter(client_id=client_id)
+        
+        plan = explain(order_queryset(queryset, ('-created_at', '-id')))
+        
+        assert 'project_client_created_idx' in plan
+        assert 'TEMP B-TREE' not in plan and 'Sort' not in plan
+    
+    @pytest.mark.parametrize('ordering, index', [
+        (('start_date', 'id'), 'project_client_start_idx'),
+        (('-start_date', '-id'), 'project_client_start_idx'),
+        (('end_date', 'id'), 'project_client_end_idx'),
+        (('-end_date', '-id'), 'project_client_end_idx'),
+    ])
+    def test_client_project_ordering_uses_index(self, dataset, ordering, index):
+        """Cada ?ordering= admitido se lee de su índice dentro de un cliente."""
+        client_id = dataset.clients.first().id
+        queryset = get_view_queryset(ProjectViewSet, dataset).filter(client_id=client_id)
+        
+        plan = explain(order_queryset(queryset, ordering))
+        
+        assert index in plan
+        assert 'TEMP B-TREE' not in plan and 'Sort' not in plan
+    
+    def test_overdue_uses_end_date_index(self, dataset):
+        """El filtro de vencidos usa el rango sobre end_date del índice por cliente."""
+        queryset = get_view_queryset(ProjectViewSet, dataset).filter(
+            status__in=OPEN_STATUSES, end_date__lt=datetime.date.today()
+        )
+        
+        assert 'project_client_end_idx' in explain(queryset)
+    
+    def test_start_date_range_uses_start_date_index(self, dataset):
+        """Los rangos de fecha de inicio usan el índice por cliente y fecha de inicio."""
+        queryset = get_view_queryset(ProjectViewSet, dataset).filter(start_date__gte=datetime.date.today())
+        
+        assert 'project_client_start_idx' in explain(queryset)
+    
+    def test_by_status_uses_client_status_index(self, dataset):
+        queryset = get_view_queryset(ProjectViewSet, dataset).filter(
+            status='pendiente'
+        ).order_by('-created_at', '-id')
+        
+        assert 'project_client_status_idx' in explain(queryset)
+    
+    @pytest.mark.parametrize('viewset_class, indexes', [
+        (ClientViewSet, ('client_user_updated_idx', 'client_user_counters_idx')),
+        (ProjectViewSet, ('project_client_updated_idx',)),
+    ])
+    def test_sync_delta_uses_updated_index(self, dataset, viewset_class, indexes):
+        """El delta de ?since= es un rango sobre updated_at, no un recorrido de todas las filas del usuario."""
+        view = viewset_class()
+        view.request = SimpleNamespace(user=dataset)
+        
+        plan = explain(view.get_sync_queryset(datetime.datetime.now(datetime.timezone.utc)))
+        
+        assert all(index in plan for index in indexes)
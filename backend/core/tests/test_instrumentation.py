@@ -0,0 +1,106 @@
+import json
+import logging
+import re
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from core.instrumentation import PerformanceMiddleware, get_request_metrics, timed
+from .factories import ClientFactory, ProjectFactory
+
+
+@pytest.fixture
+def instrumentation(settings):
+    """Activa la instrumentación antes de que el cliente de pruebas cargue el middleware."""
+    settings.API_INSTRUMENTATION = True
+    settings.API_CACHE_ENABLED = False
+    settings.API_SLOW_REQUEST_MS = 60000
+
+
+@pytest.fixture
+def performance_log(caplog):
+    """Registros del logger core.performance, que no se propaga a la raíz."""
+    logger = logging.getLogger('core.performance')
+    logger.addHandler(caplog.handler)
+    try:
+        with caplog.at_level(logging.INFO, logger='core.performance'):
+            yield caplog
+    finally:
+        logger.removeHandler(caplog.handler)
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for entry in header.split(', '):
+        name, *params = entry.split(';')
+        values = dict(param.split('=', 1) for param in params)
+        metrics[name] = values
+    return metrics
+
+
+@pytest.mark.django_db
+class TestPerformanceMiddleware:
+    """Pruebas para la instrumentación por petición."""
+
+    def test_server_timing_header(self, instrumentation, authenticated_client, user):
+        """La respuesta incluye el tiempo total, las consultas y las fases de DRF."""
+        client_instance = ClientFactory(user=user)
+        ProjectFactory.create_batch(3, client=client_instance)
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(reverse('project-list'))
+
+        assert response.status_code == status.HTTP_200_OK
+        timing = parse_server_timing(response['Server-Timing'])
+        assert {'total', 'db', 'serialize', 'render'} <= set(timing)
+        assert timing['db']['desc'] == f'"{len(queries)} queries"'
+        assert float(timing['total']['dur']) >= float(timing['db']['dur'])
+
+    def test_serializer_path_is_timed(self, instrumentation, authenticated_client, user):
+        """El detalle, que usa el serializador, también mide la fase serialize."""
+        client_instance = ClientFactory(user=user)
+        response = authenticated_client.get(reverse('client-detail', args=[client_instance.id]))
+        assert 'serialize' in parse_server_timing(response['Server-Timing'])
+
+    def test_structured_log_line(self, instrumentation, authenticated_client, user, performance_log):
+        """Cada petición deja una línea JSON en core.performance."""
+        ClientFactory(user=user)
+        authenticated_client.get(reverse('client-list'))
+        record = json.loads(performance_log.records[-1].getMessage())
+        assert record['view'] == 'client-list'
+        assert record['status'] == 200
+        assert record['queries'] >= 1
+        assert {'total_ms', 'db_ms', 'serialize_ms', 'render_ms'} <= set(record)
+
+    def test_slow_requests_include_queries(self, instrumentation, settings, authenticated_client, user,
+                                           performance_log):
+        """Las peticiones lentas se registran con el texto de sus consultas."""
+        settings.API_SLOW_REQUEST_MS = 0
+        ClientFactory(user=user)
+        performance_log.clear()
+        authenticated_client.get(reverse('client-list'))
+        slow = [json.loads(r.getMessage()) for r in performance_log.records if r.levelno == logging.WARNING]
+        assert len(slow) == 1
+        assert slow[0]['slow'] is True
+        assert any(re.search(r'FROM "core_client"', query['sql']) for query in slow[0]['sql'])
+
+    def test_slow_request_sampling(self, instrumentation, settings, authenticated_client, performance_log):
+        """Con una proporción de muestreo nula no se registran peticiones lentas."""
+        settings.API_SLOW_REQUEST_MS = 0
+        settings.API_SLOW_REQUEST_SAMPLE_RATE = 0
+        authenticated_client.get(reverse('client-list'))
+        assert not [r for r in performance_log.records if r.levelno == logging.WARNING]
+
+    def test_disabled_by_default(self, authenticated_client):
+        """Desactivada, Django descarta el middleware y no hay cabecera."""
+        response = authenticated_client.get(reverse('client-list'))
+        assert 'Server-Timing' not in response
+        with pytest.raises(MiddlewareNotUsed):
+            PerformanceMiddleware(lambda request: None)
+
+    def test_timed_outside_requests(self):
+        """Fuera de una petición instrumentada los bloques medidos no hacen nada."""
+        assert get_request_metrics() is None
+        with timed('serialize'):
+            pass
@@ -0,0 +1,169 @@
+import json
+import os
+from unittest import mock
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from core import metrics
+from core.pool import ConnectionPool
+from .factories import ClientFactory, ProjectFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    """Cada prueba empieza con el registro del proceso vacío."""
+    metrics.registry.clear()
+    yield
+    metrics.registry.clear()
+
+
+@pytest.fixture
+def metrics_enabled(settings):
+    """Activa las métricas antes de que el cliente de pruebas cargue el middleware."""
+    settings.API_METRICS = True
+    settings.API_METRICS_TOKEN = None
+    settings.API_METRICS_MULTIPROC_DIR = None
+
+
+def series(state, name):
+    return {tuple(labels): value for labels, value in state[name]['series']}
+
+
+@pytest.mark.django_db
+class TestMetricsMiddleware:
+    """Pruebas para el registro de latencias por acción."""
+
+    def test_requests_are_labeled_by_action(self, metrics_enabled, authenticated_client, user):
+        """Cada petición se registra con la acción del ViewSet y el código de estado."""
+        client_instance = ClientFactory(user=user)
+        ProjectFactory(client=client_instance, status='pendiente')
+        authenticated_client.get(reverse('client-list'))
+        authenticated_client.get(reverse('client-list'))
+        authenticated_client.get(reverse('project-by-status') + '?status=pendiente')
+        authenticated_client.get(reverse('project-by-status'))
+
+        state = metrics.registry.collect()
+        durations = series(state, 'api_request_duration_seconds')
+        assert sum(durations[('ClientViewSet.list', '200')][0]) == 2
+        assert sum(durations[('ProjectViewSet.by_status', '200')][0]) == 1
+        assert sum(durations[('ProjectViewSet.by_status', '400')][0]) == 1
+        # El fixture authenticated_client obtiene el token a través del middleware
+        assert ('ExtendedTokenObtainPairView.post', '200') in durations
+        queries = series(state, 'api_request_queries')
+        counts, total = queries[('ClientViewSet.list',)]
+        assert sum(counts) == 2 and total >= 2
+
+    def test_unmatched_paths_share_a_label(self, metrics_enabled, api_client):
+        """Las rutas inexistentes no crean series nuevas por URL."""
+        api_client.get('/no-existe/1/')
+        api_client.get('/no-existe/2/')
+        durations = series(metrics.registry.collect(), 'api_request_duration_seconds')
+        assert sum(durations[('unmatched', '404')][0]) == 2
+
+    def test_disabled_by_default(self, authenticated_client):
+        """Desactivadas, no se registra nada y el endpoint no existe."""
+        authenticated_client.get(reverse('client-list'))
+        assert not metrics.registry.collect()['api_request_duration_seconds']['series']
+        assert authenticated_client.get(reverse('metrics')).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    """Pruebas para el endpoint de exposición."""
+
+    def test_text_exposition(self, metrics_enabled, authenticated_client):
+        """El endpoint devuelve el formato de texto de Prometheus."""
+        authenticated_client.get(reverse('client-list'))
+        response = authenticated_client.get(reverse('metrics'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == metrics.CONTENT_TYPE
+        body = response.content.decode()
+        assert '# TYPE api_request_duration_seconds histogram' in body
+        assert 'api_request_duration_seconds_count{action="ClientViewSet.list",status="200"} 1' in body
+        assert 'api_request_queries_bucket{action="ClientViewSet.list",le="+Inf"} 1' in body
+
+    def test_token(self, metrics_enabled, settings, api_client):
+        """Con API_METRICS_TOKEN el endpoint exige el token."""
+        settings.API_METRICS_TOKEN = 'secreto'
+        url = reverse('metrics')
+        assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+        assert api_client.get(url, HTTP_AUTHORIZATION='Bearer otro').status_code == status.HTTP_401_UNAUTHORIZED
+        assert api_client.get(url, HTTP_AUTHORIZATION='Bearer secreto').status_code == status.HTTP_200_OK
+
+    def test_multiprocess_mode(self, metrics_enabled, settings, tmp_path, api_client):
+        """En modo multiproceso el endpoint suma los ficheros de todos los workers."""
+        settings.API_METRICS_MULTIPROC_DIR = str(tmp_path)
+        other = metrics.MetricsRegistry()
+        histogram = other.register(metrics.Histogram(
+            'api_request_duration_seconds', 'Duración.', ('action', 'status'),
+        ))
+        histogram.observe(0.2, action='ClientViewSet.list', status='200')
+        (tmp_path / 'metrics_1.json').write_text(json.dumps(other.collect()))
+        metrics.REQUEST_DURATION.observe(0.01, action='ClientViewSet.list', status='200')
+
+        body = api_client.get(reverse('metrics')).content.decode()
+        assert 'api_request_duration_seconds_count{action="ClientViewSet.list",status="200"} 2' in body
+        assert os.path.exists(metrics.process_file(str(tmp_path), os.getpid()))
+
+
+class TestMetricsRegistry:
+    """Pruebas para el registro y el formato de exposición."""
+
+    def test_histogram_rendering(self):
+        """Las cubetas se exponen acumuladas, con +Inf, suma y total."""
+        registry = metrics.MetricsRegistry()
+        histogram = registry.register(metrics.Histogram('latency', 'Latencia.', ('view',), buckets=(0.1, 1)))
+        for value in (0.05, 0.5, 2):
+            histogram.observe(value, view='a"b')
+        text = metrics.render(registry.collect())
+        assert text.splitlines() == [
+            '# HELP latency Latencia.',
+            '# TYPE latency histogram',
+            'latency_bucket{view="a\\"b",le="0.1"} 1',
+            'latency_bucket{view="a\\"b",le="1.0"} 2',
+            'latency_bucket{view="a\\"b",le="+Inf"} 3',
+            'latency_sum{view="a\\"b"} 2.55',
+            'latency_count{view="a\\"b"} 3',
+        ]
+
+    def test_labels_are_validated(self):
+        """Observar con etiquetas distintas de las declaradas es un error."""
+        counter = metrics.Counter('requests', 'Peticiones.', ('action',))
+        with pytest.raises(ValueError):
+            counter.inc(status='200')
+        with pytest.raises(ValueError):
+            metrics.registry.register(metrics.Counter('api_request_queries', 'Duplicada.'))
+
+    def test_dead_processes_keep_counters(self, tmp_path):
+        """Los contadores de un worker terminado se conservan y sus medidores se descartan."""
+        path = str(tmp_path)
+        registry = metrics.MetricsRegistry()
+        counter = registry.register(metrics.Counter('requests', 'Peticiones.'))
+        gauge = registry.register(metrics.Gauge('connections', 'Conexiones.'))
+        counter.inc(3)
+        gauge.set(5)
+        for pid in (101, 102):
+            (tmp_path / f'metrics_{pid}.json').write_text(json.dumps(registry.collect()))
+
+        metrics.mark_process_dead(101, path)
+        metrics.mark_process_dead(102, path)
+        state = metrics.read_metrics(path)
+        assert series(state, 'requests') == {(): 6}
+        assert 'connections' not in state
+        assert sorted(os.listdir(path)) == [metrics.DEAD_PROCESSES_FILE]
+
+        metrics.clear_process_metrics(path)
+        assert os.listdir(path) == []
+
+    def test_pool_gauges(self):
+        """El estado de los pools se lee al exportar."""
+        pool = ConnectionPool(object, max_size=3)
+        pool.acquire()
+        pool.release(pool.acquire())
+        backend = mock.Mock(pool_stats=lambda: [('localhost/app', pool)])
+        with mock.patch.dict('sys.modules', {'core.backends.postgresql_pool.base': backend}):
+            state = metrics.registry.collect()
+        assert series(state, 'db_pool_connections') == {
+            ('localhost/app', 'idle'): 1, ('localhost/app', 'in_use'): 1,
+        }
+        assert series(state, 'db_pool_max_connections') == {('localhost/app',): 3}
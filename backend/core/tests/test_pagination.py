@@ -0,0 +1,92 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from .factories import UserFactory, ClientFactory, ProjectFactory
+
+
+def collect_pages(api_client, url):
+    """Recorre todas las páginas siguiendo el enlace `next` y devuelve los ids."""
+    ids = []
+    pages = 0
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        ids.extend(item['id'] for item in response.data['results'])
+        url = response.data['next']
+        pages += 1
+    return ids, pages
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Pruebas para la paginación por cursor de los endpoints de listado."""
+    
+    def test_clients_are_paginated_with_cursor(self, authenticated_client, user):
+        """Las páginas de clientes cubren todos los registros sin repetir ninguno."""
+        clients = [ClientFactory(user=user) for _ in range(5)]
+        
+        url = f"{reverse('client-list')}?page_size=2"
+        ids, pages = collect_pages(authenticated_client, url)
+        
+        assert pages == 3
+        assert sorted(ids) == sorted(client.id for client in clients)
+    
+    def test_ties_on_created_at_are_broken_by_id(self, authenticated_client, client_instance):
+        """Los proyectos con el mismo created_at se ordenan por id sin perder filas."""
+        projects = [ProjectFactory(client=client_instance) for _ in range(5)]
+        same_time = projects[0].created_at
+        for project in projects:
+            project.created_at = same_time
+            project.save(update_fields=['created_at'])
+        
+        url = f"{reverse('project-list')}?page_size=2"
+        ids, _ = collect_pages(authenticated_client, url)
+        
+        assert ids == sorted((project.id for project in projects), reverse=True)
+    
+    def test_previous_link_returns_previous_page(self, authenticated_client, user):
+        """El enlace `previous` devuelve la página anterior."""
+        [ClientFactory(user=user) for _ in range(4)]
+        
+        first = authenticated_client.get(f"{reverse('client-list')}?page_size=2")
+        second = authenticated_client.get(first.data['next'])
+        back = authenticated_client.get(second.data['previous'])
+        
+        assert first.data['previous'] is None
+        assert [c['id'] for c in back.data['results']] == [c['id'] for c in first.data['results']]
+    
+    def test_page_size_is_capped(self, authenticated_client, user, settings):
+        """El tamaño de página solicitado no puede superar API_MAX_PAGE_SIZE."""
+        settings.API_MAX_PAGE_SIZE = 3
+        [ClientFactory(user=user) for _ in range(5)]
+        
+        response = authenticated_client.get(f"{reverse('client-list')}?page_size=100")
+        
+        assert len(response.data['results']) == 3
+        assert response.data['next'] is not None
+    
+    def test_by_status_is_paginated(self, authenticated_client, client_instance):
+        """El filtro por estado también se pagina por cursor."""
+        projects = [ProjectFactory(client=client_instance, status='pendiente') for _ in range(3)]
+        ProjectFactory(client=client_instance, status='completado')
+        
+        url = f"{reverse('project-by-status')}?status=pendiente&page_size=2"
+        ids, pages = collect_pages(authenticated_client, url)
+        
+        assert pages == 2
+        assert sorted(ids) == sorted(project.id for project in projects)
+    
+    def test_users_are_paginated(self, authenticated_client, user):
+        """El listado de usuarios también se pagina por cursor."""
+        [UserFactory() for _ in range(2)]
+        
+        ids, pages = collect_pages(authenticated_client, f"{reverse('user-list')}?page_size=2")
+        
+        assert pages == 2
+        assert len(ids) == 3
+    
+    def test_invalid_cursor_returns_404(self, authenticated_client):
+        """Un cursor manipulado devuelve un error en lugar de fallar."""
+        response = authenticated_client.get(f"{reverse('client-list')}?cursor=cD1mb28%3D")
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
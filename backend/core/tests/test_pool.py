@@ -0,0 +1,148 @@
+import threading
+import pytest
+from core.backends.postgresql_pool.base import DatabaseWrapper
+from core.pool import ConnectionPool, PoolTimeout
+
+
+class FakeInfo:
+    def __init__(self):
+        self.transaction_status = 0
+
+
+class FakeConnection:
+    """Conexión de prueba que registra si se cerró o se deshizo su transacción."""
+
+    def __init__(self, number):
+        self.number = number
+        self.closed = 0
+        self.rolled_back = False
+        self.info = FakeInfo()
+
+    def close(self):
+        self.closed = 1
+
+    def rollback(self):
+        self.rolled_back = True
+        self.info.transaction_status = 0
+
+
+class Connector:
+    def __init__(self):
+        self.opened = []
+
+    def __call__(self):
+        connection = FakeConnection(len(self.opened) + 1)
+        self.opened.append(connection)
+        return connection
+
+
+class TestConnectionPool:
+    """Pruebas para el pool de conexiones local al proceso."""
+
+    def test_reuses_released_connections(self):
+        """Una conexión devuelta se entrega de nuevo sin abrir otra."""
+        connector = Connector()
+        pool = ConnectionPool(connector, max_size=2)
+        first = pool.acquire()
+        pool.release(first)
+        assert pool.acquire() is first
+        assert len(connector.opened) == 1
+        assert pool.size == 1
+
+    def test_unusable_connection_is_replaced(self):
+        """Si la comprobación falla la conexión se cierra y se abre otra en su hueco."""
+        connector = Connector()
+        pool = ConnectionPool(connector, max_size=1, check=lambda connection: not connection.closed)
+        first = pool.acquire()
+        first.closed = 2
+        pool.release(first)
+        second = pool.acquire()
+        assert second is not first
+        assert pool.size == 1
+
+    def test_failing_check_counts_as_unusable(self):
+        """Una excepción en la comprobación descarta la conexión."""
+        def check(connection):
+            raise RuntimeError('conexión caída')
+
+        connector = Connector()
+        pool = ConnectionPool(connector, max_size=1, check=check)
+        pool.release(pool.acquire())
+        pool.acquire()
+        assert connector.opened[0].closed
+        assert len(connector.opened) == 2
+
+    def test_waits_for_a_free_connection_until_timeout(self):
+        """Con el pool agotado se espera a que se devuelva una conexión, o se agota el tiempo."""
+        pool = ConnectionPool(Connector(), max_size=1, timeout=0.05)
+        first = pool.acquire()
+        with pytest.raises(PoolTimeout):
+            pool.acquire()
+
+        pool.timeout = 5
+        threading.Timer(0.05, pool.release, args=(first,)).start()
+        assert pool.acquire() is first
+
+    def test_failed_connect_frees_its_slot(self):
+        """Si no se puede abrir la conexión no se ocupa su hueco."""
+        def connect():
+            raise ConnectionError('sin servidor')
+
+        pool = ConnectionPool(connect, max_size=1)
+        with pytest.raises(ConnectionError):
+            pool.acquire()
+        assert pool.size == 0
+
+    def test_prefill_and_close_all(self):
+        """prefill abre min_size conexiones y close_all cierra las libres."""
+        connector = Connector()
+        pool = ConnectionPool(connector, min_size=3, max_size=5)
+        pool.prefill()
+        assert pool.size == pool.idle == 3
+        pool.close_all()
+        assert pool.size == 0
+        assert all(connection.closed for connection in connector.opened)
+
+    def test_invalid_sizes(self):
+        """Los tamaños incoherentes se rechazan."""
+        with pytest.raises(ValueError):
+            ConnectionPool(Connector(), min_size=3, max_size=2)
+
+
+class TestPooledDatabaseWrapper:
+    """Pruebas para la devolución de conexiones desde el backend con pool."""
+
+    @pytest.fixture
+    def wrapper(self):
+        wrapper = DatabaseWrapper({
+            'ENGINE': 'core.backends.postgresql_pool', 'NAME': 'user_manager', 'USER': '', 'PASSWORD': '',
+            'HOST': '', 'PORT': '', 'OPTIONS': {}, 'TIME_ZONE': None, 'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': False, 'AUTOCOMMIT': True, 'ATOMIC_REQUESTS': False, 'TEST': {},
+        })
+        wrapper.pool = ConnectionPool(Connector(), max_size=1)
+        wrapper.connection = wrapper.pool.acquire()
+        return wrapper
+
+    def test_close_returns_connection_to_pool(self, wrapper):
+        """Cerrar la conexión de Django la devuelve al pool sin cerrarla."""
+        connection = wrapper.connection
+        wrapper.close()
+        assert wrapper.connection is None
+        assert not connection.closed
+        assert wrapper.pool.idle == 1
+
+    def test_open_transaction_is_rolled_back(self, wrapper):
+        """Una transacción pendiente se deshace antes de devolver la conexión."""
+        connection = wrapper.connection
+        connection.info.transaction_status = 2
+        wrapper.close()
+        assert connection.rolled_back
+        assert wrapper.pool.idle == 1
+
+    def test_broken_connection_is_discarded(self, wrapper):
+        """Una conexión rota se descarta en lugar de volver al pool."""
+        connection = wrapper.connection
+        connection.closed = 2
+        wrapper.close()
+        assert wrapper.pool.idle == 0
+        assert wrapper.pool.size == 0
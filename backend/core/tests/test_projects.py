@@ -73,9 +73,9 @@ class TestProjectEndpoints:
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 3
+        assert len(response.data['results']) == 3
         project_ids = [project.id for project in projects]
-        response_ids = [project['id'] for project in response.data]
+        response_ids = [project['id'] for project in response.data['results']]
         for project_id in project_ids:
             assert project_id in response_ids
     
@@ -139,24 +139,24 @@ class TestProjectEndpoints:
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]['id'] == pendiente_project.id
+        assert len(response.data['results']) == 1
+        assert response.data['results'][0]['id'] == pendiente_project.id
         
         # Probar filtro para proyectos en progreso
         url = f"{reverse('project-by-status')}?status=en_progreso"
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]['id'] == en_progreso_project.id
+        assert len(response.data['results']) == 1
+        assert response.data['results'][0]['id'] == en_progreso_project.id
         
         # Probar filtro para proyectos completados
         url = f"{reverse('project-by-status')}?status=completado"
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]['id'] == completado_project.id
+        assert len(response.data['results']) == 1
+        assert response.data['results'][0]['id'] == completado_project.id
     
     def test_cannot_access_other_user_project(self, authenticated_client):
         """Prueba que un usuario no puede acceder a proyectos de otro usuario."""
@@ -167,4 +167,55 @@ class TestProjectEndpoints:
         url = reverse('project-detail', args=[other_project.id])
         response = authenticated_client.get(url)
         
-        assert response.status_code == status.HTTP_404_NOT_FOUND 
\ No newline at end of file
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+# Número máximo de consultas permitidas por endpoint de proyectos,
+# independientemente del número de filas devueltas: autenticación, agregación
+# COUNT/MAX del ETag y consulta principal.
+MAX_PROJECT_QUERIES = 3
+
+
+@pytest.mark.django_db
+class TestProjectQueryCount:
+    """Pruebas que garantizan un número fijo de consultas en los endpoints de proyectos."""
+    
+    @pytest.mark.parametrize('num_projects', [1, 20])
+    def test_list_query_count_is_constant(self, authenticated_client, client_instance, num_projects,
+                                          django_assert_max_num_queries):
+        """La lista de proyectos no debe generar una consulta por fila."""
+        other_client = ClientFactory(user=client_instance.user)
+        for i in range(num_projects):
+            ProjectFactory(client=client_instance if i % 2 else other_client)
+        
+        url = reverse('project-list')
+        with django_assert_max_num_queries(MAX_PROJECT_QUERIES):
+            response = authenticated_client.get(url)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert all(project['client_name'] for project in response.data['results'])
+    
+    @pytest.mark.parametrize('num_projects', [1, 20])
+    def test_by_status_query_count_is_constant(self, authenticated_client, client_instance, num_projects,
+                                               django_assert_max_num_queries):
+        """El filtro por estado no debe generar una consulta por fila."""
+        for _ in range(num_projects):
+            ProjectFactory(client=ClientFactory(user=client_instance.user), status='pendiente')
+        
+        url = f"{reverse('project-by-status')}?status=pendiente"
+        with django_assert_max_num_queries(MAX_PROJECT_QUERIES):
+            response = authenticated_client.get(url)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == num_projects
+    
+    def test_retrieve_query_count(self, authenticated_client, client_instance, django_assert_max_num_queries):
+        """El detalle de un proyecto carga el cliente en la misma consulta."""
+        project = ProjectFactory(client=client_instance)
+        
+        url = reverse('project-detail', args=[project.id])
+        with django_assert_max_num_queries(MAX_PROJECT_QUERIES):
+            response = authenticated_client.get(url)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['client_name'] == client_instance.name
@@ -0,0 +1,91 @@
+import datetime
+import decimal
+import io
+import uuid
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from core import renderers
+from core.renderers import FastJSONParser, FastJSONRenderer
+from .factories import ClientFactory, ProjectFactory
+
+SAMPLE_DATA = {
+    'id': 1,
+    'name': 'Proyecto ñandú     "comillas" \\ \n\t\x01 😀',
+    'created_at': timezone.now(),
+    'naive': datetime.datetime(2024, 1, 2, 3, 4, 5, 123456),
+    'start_date': datetime.date(2024, 1, 2),
+    'time': datetime.time(10, 30, 15, 250000),
+    'duration': datetime.timedelta(hours=1, seconds=3),
+    'amount': decimal.Decimal('12.50'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'nested': [{'a': None, 'b': True}, (1, 2.5), []],
+    'big': 2 ** 70,
+    1: 'clave no str',
+}
+
+
+class TestFastJSONRenderer:
+    """Pruebas para el renderer y el parser JSON rápidos."""
+    
+    def test_output_is_identical_to_drf(self):
+        """La salida es idéntica byte a byte a la del JSONRenderer de DRF."""
+        assert FastJSONRenderer().render(SAMPLE_DATA) == JSONRenderer().render(SAMPLE_DATA)
+        without_fallback = {key: value for key, value in SAMPLE_DATA.items() if key not in ('big', 1)}
+        assert FastJSONRenderer().render(without_fallback) == JSONRenderer().render(without_fallback)
+    
+    def test_indented_output_uses_drf(self):
+        """Con indentación la salida es la de DRF."""
+        media_type = 'application/json; indent=4'
+        assert (FastJSONRenderer().render(SAMPLE_DATA, media_type)
+                == JSONRenderer().render(SAMPLE_DATA, media_type))
+    
+    def test_falls_back_without_orjson(self, monkeypatch):
+        """Sin orjson se usan el renderer y el parser de DRF."""
+        monkeypatch.setattr(renderers, 'orjson', None)
+        
+        assert FastJSONRenderer().render(SAMPLE_DATA) == JSONRenderer().render(SAMPLE_DATA)
+        assert FastJSONParser().parse(io.BytesIO(b'{"a": [1, 2]}')) == {'a': [1, 2]}
+    
+    def test_parser_matches_drf(self):
+        """El parser devuelve los mismos datos que el de DRF, también los que orjson no admite."""
+        body = '{"name": "ñandú", "values": [1, 2.5, null, true], "big": %d}' % 2 ** 70
+        expected = JSONParser().parse(io.BytesIO(body.encode('utf-8')))
+        
+        assert FastJSONParser().parse(io.BytesIO(body.encode('utf-8'))) == expected
+    
+    def test_parser_rejects_invalid_json(self):
+        """Un cuerpo no válido produce el mismo ParseError que DRF."""
+        with pytest.raises(ParseError) as fast_error:
+            FastJSONParser().parse(io.BytesIO(b'{"a": NaN}'))
+        with pytest.raises(ParseError) as drf_error:
+            JSONParser().parse(io.BytesIO(b'{"a": NaN}'))
+        
+        assert str(fast_error.value) == str(drf_error.value)
+    
+    @pytest.mark.django_db
+    def test_api_uses_fast_renderer(self, authenticated_client, user):
+        """Los listados de la API se renderizan con el renderer rápido sin cambiar el JSON."""
+        ProjectFactory.create_batch(3, client=ClientFactory(user=user))
+        
+        response = authenticated_client.get(reverse('project-list'))
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.accepted_renderer, FastJSONRenderer)
+        assert response.content == JSONRenderer().render(response.data)
+    
+    @pytest.mark.django_db
+    def test_api_parses_with_fast_parser(self, authenticated_client):
+        """Las peticiones JSON se analizan con el parser rápido."""
+        response = authenticated_client.post(
+            reverse('client-list'),
+            {'name': 'Cliente ñ', 'email': 'cliente@example.com', 'phone': '+34912345678'},
+            format='json',
+        )
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['name'] == 'Cliente ñ'
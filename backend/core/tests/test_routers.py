@@ -0,0 +1,118 @@
+from unittest import mock
+import pytest
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from core import routers
+from core.models import Client
+from core.routers import PrimaryReplicaRouter, RoutingState, is_user_pinned
+from .factories import ClientFactory
+
+
+@pytest.fixture
+def replica_reads():
+    """
+    Simula una réplica apuntando a la propia base de datos de pruebas y cuenta
+    las lecturas que el router envía a ella.
+    """
+    with override_settings(DATABASE_REPLICAS=['default']), \
+            mock.patch.object(routers.random, 'choice', side_effect=lambda aliases: aliases[0]) as choice:
+        yield choice
+
+
+@pytest.fixture
+def routing_state():
+    state = RoutingState()
+    token = routers._routing_state.set(state)
+    yield state
+    routers._routing_state.reset(token)
+
+
+@pytest.mark.django_db
+class TestReplicaRouting:
+    """Pruebas para el envío de las lecturas a las réplicas."""
+
+    def test_safe_requests_read_from_replica(self, authenticated_client, user, replica_reads):
+        """Los listados y el detalle se leen de una réplica."""
+        client_instance = ClientFactory(user=user)
+        list_response = authenticated_client.get(reverse('client-list'))
+        assert list_response.status_code == status.HTTP_200_OK
+        assert replica_reads.called
+
+        replica_reads.reset_mock()
+        detail_response = authenticated_client.get(reverse('client-detail', args=[client_instance.id]))
+        assert detail_response.data['id'] == client_instance.id
+        assert replica_reads.called
+
+    def test_reads_stay_on_primary_after_a_write(self, authenticated_client, user, replica_reads):
+        """Tras escribir, las lecturas del usuario van al primario durante la ventana."""
+        response = authenticated_client.post(reverse('client-list'), {
+            'name': 'Cliente nuevo', 'email': 'nuevo@example.com', 'phone': '+34 600 000 000',
+        }, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert is_user_pinned(user.id)
+
+        list_response = authenticated_client.get(reverse('client-list'))
+        assert [item['name'] for item in list_response.data['results']] == ['Cliente nuevo']
+        assert not replica_reads.called
+
+    def test_pin_is_per_user(self, authenticated_client, api_client, user, replica_reads):
+        """La escritura de un usuario no afecta a las lecturas de otro."""
+        other = ClientFactory().user
+        authenticated_client.post(reverse('client-list'), {
+            'name': 'Cliente nuevo', 'email': 'nuevo@example.com', 'phone': '+34 600 000 000',
+        }, format='json')
+
+        api_client.force_authenticate(other)
+        api_client.get(reverse('project-list'))
+        assert replica_reads.called
+
+    def test_without_replicas_everything_uses_primary(self, authenticated_client, user):
+        """Sin réplicas configuradas el router no elige ninguna."""
+        ClientFactory(user=user)
+        with mock.patch.object(routers.random, 'choice') as choice:
+            response = authenticated_client.get(reverse('client-list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert not choice.called
+
+    def test_user_registration_uses_primary(self, api_client, replica_reads):
+        """El registro de usuarios escribe y valida contra el primario."""
+        response = api_client.post(reverse('user-list'), {
+            'username': 'nuevo', 'email': 'nuevo@example.com', 'password': 'password123',
+        }, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert User.objects.filter(username='nuevo').exists()
+        assert not replica_reads.called
+
+
+class TestPrimaryReplicaRouter:
+    """Pruebas unitarias del router."""
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_write_in_request_switches_reads_to_primary(self, routing_state):
+        """Una escritura devuelve al primario el resto de lecturas de la petición."""
+        router = PrimaryReplicaRouter()
+        routing_state.use_replica = True
+        assert router.db_for_read(Client) == 'replica1'
+        assert router.db_for_write(Client) == 'default'
+        assert router.db_for_read(Client) is None
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_auth_models_always_use_primary(self, routing_state):
+        """Los usuarios se leen y escriben siempre en el primario."""
+        router = PrimaryReplicaRouter()
+        routing_state.use_replica = True
+        assert router.db_for_read(User) == 'default'
+        assert router.db_for_write(User) == 'default'
+
+    def test_outside_requests_reads_use_primary(self):
+        """Sin estado de petición (p. ej. comandos) no se usan réplicas."""
+        assert PrimaryReplicaRouter().db_for_read(Client) is None
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_migrations_only_on_primary(self):
+        """Las migraciones solo se aplican al primario."""
+        router = PrimaryReplicaRouter()
+        assert router.allow_migrate('default', 'core')
+        assert not router.allow_migrate('replica1', 'core')
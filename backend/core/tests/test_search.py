@@ -0,0 +1,170 @@
+import time
+import pytest
+from importlib import import_module
+from types import SimpleNamespace
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request
+from core.models import Project
+from core.operations import postgresql_search_sql
+from core.search import FullTextSearchFilter, repair_sqlite_search_triggers
+from .factories import UserFactory, ClientFactory, ProjectFactory
+
+
+def result_ids(response):
+    return [item['id'] for item in response.data['results']]
+
+
+def search_page(queryset, query):
+    """Primera página de resultados de `?q=` ordenada por relevancia."""
+    request = Request(RequestFactory().get('/', {'q': query}))
+    view = SimpleNamespace(search_fields=('name', 'description'))
+    results = FullTextSearchFilter().filter_queryset(request, queryset, view).order_by('-search_rank', '-id')
+    return results, list(results[:20])
+
+
+@pytest.mark.django_db
+class TestFullTextSearch:
+    """Pruebas para la búsqueda ?q= de clientes y proyectos."""
+    
+    def test_search_projects_by_keyword(self, authenticated_client, client_instance):
+        """Se devuelven los proyectos cuyo nombre o descripción contienen todas las palabras."""
+        match = ProjectFactory(client=client_instance, name='Migración', description='Base de datos PostgreSQL')
+        ProjectFactory(client=client_instance, name='Web', description='Rediseño del portal')
+        ProjectFactory(client=ClientFactory(user=UserFactory()), name='Migración PostgreSQL')
+        
+        response = authenticated_client.get(reverse('project-list'), {'q': 'postgresql migración'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert result_ids(response) == [match.id]
+    
+    def test_search_is_prefix_and_accent_insensitive(self, authenticated_client, client_instance):
+        """Las palabras se buscan como prefijo y sin distinguir acentos."""
+        project = ProjectFactory(client=client_instance, name='Aplicación móvil', description='iOS')
+        
+        response = authenticated_client.get(reverse('project-list'), {'q': 'aplicacion mov'})
+        
+        assert result_ids(response) == [project.id]
+    
+    def test_results_are_ranked(self, authenticated_client, client_instance):
+        """Las coincidencias en el nombre pesan más que en la descripción."""
+        in_description = ProjectFactory(client=client_instance, name='Portal', description='Tienda online')
+        in_name = ProjectFactory(client=client_instance, name='Tienda', description='Comercio electrónico')
+        
+        response = authenticated_client.get(reverse('project-list'), {'q': 'tienda'})
+        
+        assert result_ids(response) == [in_name.id, in_description.id]
+    
+    def test_search_is_paginated(self, authenticated_client, client_instance, settings):
+        """Los resultados se paginan por cursor en orden de relevancia."""
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'PAGE_SIZE': 2}
+        projects = [ProjectFactory(client=client_instance, name=f'Informe {i}', description='x') for i in range(5)]
+        ProjectFactory(client=client_instance, name='Otro', description='y')
+        
+        ids = []
+        response = authenticated_client.get(reverse('project-list'), {'q': 'informe'})
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            ids.extend(result_ids(response))
+            if not response.data['next']:
+                break
+            response = authenticated_client.get(response.data['next'])
+        
+        assert sorted(ids) == sorted(project.id for project in projects)
+        assert len(ids) == len(set(ids))
+    
+    def test_index_follows_updates_and_deletes(self, authenticated_client, client_instance):
+        """El índice se mantiene al modificar, crear en lote y eliminar filas."""
+        project = ProjectFactory(client=client_instance, name='Antiguo', description='x')
+        project.name = 'Renovado'
+        project.save()
+        Project.objects.bulk_create([Project(client=client_instance, name='Renovado bis', description='x',
+                                             start_date=project.start_date)])
+        
+        response = authenticated_client.get(reverse('project-list'), {'q': 'renovado'})
+        assert len(result_ids(response)) == 2
+        assert result_ids(authenticated_client.get(reverse('project-list'), {'q': 'antiguo'})) == []
+        
+        project.delete()
+        response = authenticated_client.get(reverse('project-list'), {'q': 'renovado'})
+        assert len(result_ids(response)) == 1
+    
+    def test_search_clients(self, authenticated_client, user):
+        """Los clientes se buscan por nombre y correo."""
+        client = ClientFactory(user=user, name='Acme Corporación', email='contacto@acme.com')
+        ClientFactory(user=user, name='Globex', email='info@globex.com')
+        
+        assert result_ids(authenticated_client.get(reverse('client-list'), {'q': 'acme'})) == [client.id]
+        assert result_ids(authenticated_client.get(reverse('client-list'), {'q': 'contacto'})) == [client.id]
+    
+    def test_query_syntax_is_ignored(self, authenticated_client, client_instance):
+        """Los operadores del motor de búsqueda se tratan como texto."""
+        ProjectFactory(client=client_instance, name='Proyecto', description='x')
+        
+        response = authenticated_client.get(reverse('project-list'), {'q': 'proyecto" OR NEAR(*'})
+        empty = authenticated_client.get(reverse('project-list'), {'q': '"*'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert empty.status_code == status.HTTP_200_OK
+        assert empty.data['results'] == []
+    
+    def test_search_with_sparse_fieldset(self, authenticated_client, client_instance, settings):
+        """La búsqueda se combina con ?fields= en ambas vías de serialización."""
+        project = ProjectFactory(client=client_instance, name='Auditoría', description='x')
+        
+        fast = authenticated_client.get(reverse('project-list'), {'q': 'auditoria', 'fields': 'id,name'})
+        settings.API_LIST_FAST_PATH = False
+        settings.API_CACHE_ENABLED = False
+        slow = authenticated_client.get(reverse('project-list'), {'q': 'auditoria', 'fields': 'id,name'})
+        
+        assert fast.data['results'] == slow.data['results'] == [{'id': project.id, 'name': 'Auditoría'}]
+    
+    def test_repair_recreates_missing_triggers(self, authenticated_client, client_instance):
+        """Si una migración recrea la tabla y pierde los triggers, se restauran tras migrar."""
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER core_project_fts_ai')
+        project = ProjectFactory(client=client_instance, name='Recuperado', description='x')
+        
+        repair_sqlite_search_triggers(using='default')
+        
+        response = authenticated_client.get(reverse('project-list'), {'q': 'recuperado'})
+        assert result_ids(response) == [project.id]
+    
+    def test_postgresql_index_is_built_concurrently(self):
+        """El índice GIN no bloquea las escrituras: se crea con CONCURRENTLY fuera de una transacción."""
+        migration = import_module('core.migrations.0005_search').Migration
+        statements = postgresql_search_sql('core_project', ['name', 'description'], 'spanish')
+        
+        assert statements[-1].startswith('CREATE INDEX CONCURRENTLY')
+        assert migration.atomic is False
+    
+    @pytest.mark.skipif(connection.vendor != 'sqlite', reason='Plan de la tabla FTS5 de SQLite')
+    def test_sqlite_rank_scales_linearly(self, client_instance):
+        """La relevancia se calcula en un solo recorrido de la tabla FTS5, no con un MATCH por fila."""
+        def add_projects(total):
+            existing = Project.objects.count()
+            Project.objects.bulk_create([
+                Project(client=client_instance, name=f'Proyecto {n}', description='x', start_date='2025-01-01')
+                for n in range(existing, total)
+            ])
+        
+        def best_time():
+            timings = []
+            for _ in range(3):
+                started = time.perf_counter()
+                search_page(Project.objects.all(), 'proyecto')
+                timings.append(time.perf_counter() - started)
+            return min(timings)
+        
+        add_projects(500)
+        small = best_time()
+        add_projects(2000)
+        large = best_time()
+        queryset, page = search_page(Project.objects.all(), 'proyecto')
+        
+        assert len(page) == 20
+        assert 'SUBQUERY' not in queryset.explain()
+        # Cuatro veces más filas: lineal ~4x, la subconsulta correlacionada ~16x
+        assert large < small * 10
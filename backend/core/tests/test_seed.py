@@ -0,0 +1,79 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command, CommandError
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from core.counters import COUNTER_FIELDS, recompute_client_counters
+from core.models import Client, Project
+from core.seeding import SeedPlan, seed_users, user_ranges
+
+
+def snapshot(prefix='seed'):
+    """Datos generados sin claves primarias, que dependen del orden de inserción."""
+    clients = Client.objects.filter(user__username__startswith=prefix)
+    projects = Project.objects.filter(client__in=clients)
+    return (
+        sorted(User.objects.filter(username__startswith=prefix).values_list('username', 'email')),
+        sorted(clients.values_list('user__username', 'name', 'email', 'phone', *COUNTER_FIELDS)),
+        sorted(projects.values_list('client__name', 'name', 'status', 'start_date', 'end_date')),
+    )
+
+
+@pytest.mark.django_db
+class TestSeedCoreData:
+    """Pruebas para el generador de datos sintéticos."""
+
+    def test_generates_requested_volume(self, capsys):
+        """Crea el volumen pedido con contadores coherentes e informa del rendimiento."""
+        call_command('seed_core_data', users=3, clients_per_user=4, projects_per_client=5, batch_size=7)
+
+        assert User.objects.filter(username__startswith='seed').count() == 3
+        assert Client.objects.count() == 12
+        assert Project.objects.count() == 60
+        before = snapshot()
+        recompute_client_counters()
+        assert snapshot() == before
+        output = capsys.readouterr().out
+        assert '3 usuarios, 12 clientes y 60 proyectos' in output
+        assert 'filas/s' in output
+
+    def test_shared_password_hash(self):
+        """Todos los usuarios comparten un único hash válido de la contraseña indicada."""
+        call_command('seed_core_data', users=2, clients_per_user=0, password='secreto')
+        users = list(User.objects.filter(username__startswith='seed'))
+        assert len({user.password for user in users}) == 1
+        assert all(user.check_password('secreto') for user in users)
+
+    def test_deterministic_regardless_of_batches(self):
+        """Los datos dependen de la semilla, no del tamaño de lote ni del reparto entre procesos."""
+        plan = SeedPlan(4, 2, 3, seed=7, batch_size=5)
+        seed_users(plan, 0, 4, 'hash')
+        expected = snapshot()
+        User.objects.all().delete()
+
+        plan.batch_size = 1000
+        for start, stop in user_ranges(plan, 3):
+            seed_users(plan, start, stop, 'hash')
+        assert snapshot() == expected
+
+        User.objects.all().delete()
+        seed_users(SeedPlan(4, 2, 3, seed=8), 0, 4, 'hash')
+        assert snapshot() != expected
+
+    def test_generated_projects_are_searchable(self, api_client):
+        """El índice de búsqueda se mantiene también con bulk_create."""
+        call_command('seed_core_data', users=1, clients_per_user=1, projects_per_client=3)
+        user = User.objects.get(username__startswith='seed')
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        response = api_client.get(reverse('project-list'), {'q': 'sintético'})
+        assert len(response.json()['results']) == 3
+
+    def test_rejects_existing_prefix_and_invalid_options(self):
+        call_command('seed_core_data', users=1, clients_per_user=0)
+        with pytest.raises(CommandError):
+            call_command('seed_core_data', users=1)
+        with pytest.raises(CommandError):
+            call_command('seed_core_data', users=0, prefix='otro')
+        # SQLite no admite varios procesos escribiendo a la vez
+        with pytest.raises(CommandError):
+            call_command('seed_core_data', users=2, workers=2, prefix='otro')
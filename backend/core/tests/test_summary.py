@@ -0,0 +1,69 @@
+import datetime
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from .factories import UserFactory, ClientFactory, ProjectFactory
+
+
+@pytest.mark.django_db
+class TestProjectSummary:
+    """Pruebas para el resumen agregado de proyectos."""
+    
+    @pytest.fixture
+    def dataset(self, user):
+        today = timezone.now().date()
+        acme = ClientFactory(user=user, name='Acme')
+        beta = ClientFactory(user=user, name='Beta')
+        ProjectFactory(client=acme, status='pendiente', end_date=today - datetime.timedelta(days=2))
+        ProjectFactory(client=acme, status='en_progreso', end_date=today + datetime.timedelta(days=3))
+        ProjectFactory(client=acme, status='completado', end_date=today - datetime.timedelta(days=10))
+        ProjectFactory(client=beta, status='pendiente', end_date=None)
+        ProjectFactory(client=beta, status='en_progreso', end_date=today + datetime.timedelta(days=30))
+        ProjectFactory(client=ClientFactory(user=UserFactory()), status='pendiente')
+        return acme, beta, today
+    
+    def test_summary_counts(self, authenticated_client, dataset):
+        """El resumen agrega por estado, por cliente, vencidos y próximas entregas."""
+        acme, beta, today = dataset
+        
+        response = authenticated_client.get(reverse('project-summary'))
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data
+        assert data['total'] == 5
+        assert data['by_status'] == {'pendiente': 2, 'en_progreso': 2, 'completado': 1}
+        assert data['overdue'] == 1
+        assert data['upcoming'] == 1
+        assert data['next_deadline'] == (today + datetime.timedelta(days=3)).isoformat()
+        assert [c['client'] for c in data['by_client']] == [acme.id, beta.id]
+        assert data['by_client'][0]['by_status'] == {'pendiente': 1, 'en_progreso': 1, 'completado': 1}
+        assert data['by_client'][1]['next_deadline'] == (today + datetime.timedelta(days=30)).isoformat()
+    
+    def test_summary_days_window(self, authenticated_client, dataset):
+        """El parámetro days amplía la ventana de próximas entregas."""
+        response = authenticated_client.get(reverse('project-summary'), {'days': 60})
+        
+        assert response.data['upcoming'] == 2
+        assert response.data['upcoming_days'] == 60
+    
+    def test_summary_uses_single_query(self, authenticated_client, dataset, django_assert_max_num_queries):
+        """El resumen completo se calcula con una sola consulta (más la autenticación)."""
+        with django_assert_max_num_queries(2):
+            response = authenticated_client.get(reverse('project-summary'))
+        
+        assert response.status_code == status.HTTP_200_OK
+    
+    def test_summary_is_invalidated_on_change(self, authenticated_client, dataset):
+        """El resumen cacheado se invalida al crear un proyecto."""
+        acme, _, _ = dataset
+        authenticated_client.get(reverse('project-summary'))
+        
+        ProjectFactory(client=acme, status='completado')
+        
+        assert authenticated_client.get(reverse('project-summary')).data['by_status']['completado'] == 2
+    
+    def test_invalid_days(self, authenticated_client):
+        response = authenticated_client.get(reverse('project-summary'), {'days': 'x'})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
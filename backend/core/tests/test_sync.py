@@ -0,0 +1,192 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from core.models import Tombstone
+from .factories import UserFactory, ClientFactory, ProjectFactory
+
+
+@pytest.fixture
+def no_safety_window(settings):
+    settings.SYNC_SAFETY_WINDOW = 0
+
+
+def sync(api_client, url_name, token=''):
+    response = api_client.get(reverse(url_name), {'since': token})
+    assert response.status_code == status.HTTP_200_OK
+    return response.data
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('no_safety_window')
+class TestIncrementalSync:
+    """Pruebas para la sincronización incremental con ?since=."""
+    
+    def test_initial_sync_returns_everything(self, authenticated_client, client_instance):
+        """Con since vacío se devuelven todas las filas y el primer token."""
+        project = ProjectFactory(client=client_instance)
+        
+        data = sync(authenticated_client, 'project-list')
+        
+        assert [p['id'] for p in data['results']] == [project.id]
+        assert data['deleted'] == []
+        assert data['next_since']
+    
+    def test_only_changes_since_token_are_returned(self, authenticated_client, client_instance):
+        """Tras el token solo aparecen las filas creadas o modificadas."""
+        unchanged = ClientFactory(user=client_instance.user)
+        token = sync(authenticated_client, 'client-list')['next_since']
+        
+        client_instance.name = 'Modificado'
+        client_instance.save()
+        created = ClientFactory(user=client_instance.user)
+        data = sync(authenticated_client, 'client-list', token)
+        
+        ids = [c['id'] for c in data['results']]
+        assert sorted(ids) == sorted([client_instance.id, created.id])
+        assert unchanged.id not in ids
+    
+    def test_deletions_are_reported(self, authenticated_client, client_instance):
+        """Los proyectos eliminados aparecen en `deleted`."""
+        project = ProjectFactory(client=client_instance)
+        token = sync(authenticated_client, 'project-list')['next_since']
+        
+        authenticated_client.delete(reverse('project-detail', args=[project.id]))
+        data = sync(authenticated_client, 'project-list', token)
+        
+        assert data['results'] == []
+        assert data['deleted'] == [project.id]
+    
+    def test_cascaded_project_deletions_are_reported(self, authenticated_client, client_instance):
+        """Eliminar un cliente registra también sus proyectos borrados en cascada."""
+        projects = [ProjectFactory(client=client_instance) for _ in range(3)]
+        token = sync(authenticated_client, 'project-list')['next_since']
+        client_id = client_instance.id
+        
+        client_instance.delete()
+        
+        assert sorted(sync(authenticated_client, 'project-list', token)['deleted']) == sorted(
+            project.id for project in projects
+        )
+        assert sync(authenticated_client, 'client-list', token)['deleted'] == [client_id]
+        assert Tombstone.objects.filter(model='project').count() == 3
+    
+    def test_client_rename_marks_projects_changed(self, authenticated_client, client_instance):
+        """Renombrar el cliente incluye sus proyectos, ya que cambia client_name."""
+        project = ProjectFactory(client=client_instance)
+        token = sync(authenticated_client, 'project-list')['next_since']
+        
+        client_instance.name = 'Renombrado'
+        client_instance.save()
+        data = sync(authenticated_client, 'project-list', token)
+        
+        assert [(p['id'], p['client_name']) for p in data['results']] == [(project.id, 'Renombrado')]
+    
+    def test_other_users_changes_are_not_visible(self, authenticated_client, client_instance):
+        """Los cambios y eliminaciones de otros usuarios no aparecen en el delta."""
+        token = sync(authenticated_client, 'client-list')['next_since']
+        
+        other = ClientFactory(user=UserFactory())
+        other.delete()
+        data = sync(authenticated_client, 'client-list', token)
+        
+        assert data['results'] == []
+        assert data['deleted'] == []
+    
+    def test_user_deletion_does_not_create_tombstones(self, client_instance):
+        """Al borrar un usuario sus clientes y proyectos no generan registros huérfanos."""
+        ProjectFactory(client=client_instance)
+        
+        client_instance.user.delete()
+        
+        assert not Tombstone.objects.exists()
+    
+    def test_invalid_token_returns_400(self, authenticated_client):
+        response = authenticated_client.get(reverse('client-list'), {'since': 'no-es-un-token'})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_delta_is_paginated_with_continuation_token(self, authenticated_client, client_instance):
+        """El delta se entrega en páginas de `page_size` y el último token cierra la ronda."""
+        ClientFactory.create_batch(4, user=client_instance.user)
+        url = reverse('client-list')
+        
+        response = authenticated_client.get(url, {'since': '', 'page_size': 2})
+        ids = [c['id'] for c in response.data['results']]
+        pages = 1
+        while response.data['has_more']:
+            response = authenticated_client.get(url, {'since': response.data['next_since'], 'page_size': 2})
+            assert response.data['deleted'] == []
+            ids.extend(c['id'] for c in response.data['results'])
+            pages += 1
+        
+        assert pages == 3
+        assert sorted(ids) == sorted(client_instance.user.clients.values_list('id', flat=True))
+        assert sync(authenticated_client, 'client-list', response.data['next_since'])['results'] == []
+    
+    def test_changes_during_a_round_are_not_lost(self, authenticated_client, client_instance):
+        """Una fila modificada entre páginas se vuelve a entregar en la misma ronda."""
+        ClientFactory.create_batch(2, user=client_instance.user)
+        url = reverse('client-list')
+        first = authenticated_client.get(url, {'since': '', 'page_size': 2}).data
+        
+        client_instance.name = 'Modificado'
+        client_instance.save()
+        second = authenticated_client.get(url, {'since': first['next_since'], 'page_size': 2}).data
+        
+        assert not second['has_more']
+        assert [(c['id'], c['name']) for c in second['results']][-1] == (client_instance.id, 'Modificado')
+    
+    def test_delta_uses_values_fast_path(self, authenticated_client, client_instance, settings,
+                                         django_assert_max_num_queries):
+        """El delta se lee con `.values()` y coincide con la representación del listado."""
+        settings.API_CACHE_ENABLED = False
+        ProjectFactory.create_batch(3, client=client_instance)
+        listed = authenticated_client.get(reverse('project-list')).data['results']
+        
+        # Usuario, agregación de validadores (ETag) y filas
+        with django_assert_max_num_queries(3):
+            data = sync(authenticated_client, 'project-list')
+        
+        assert sorted(data['results'], key=lambda p: p['id']) == sorted(listed, key=lambda p: p['id'])
+    
+    def test_project_churn_does_not_resend_sibling_projects(self, authenticated_client, client_instance):
+        """Un proyecto nuevo solo reenvía ese proyecto y su cliente, cuyos contadores cambian."""
+        ProjectFactory.create_batch(30, client=client_instance)
+        project_token = sync(authenticated_client, 'project-list')['next_since']
+        client_token = sync(authenticated_client, 'client-list')['next_since']
+        
+        created = ProjectFactory(client=client_instance)
+        
+        assert [p['id'] for p in sync(authenticated_client, 'project-list', project_token)['results']] == [created.id]
+        clients = sync(authenticated_client, 'client-list', client_token)['results']
+        assert [(c['id'], c['project_count']) for c in clients] == [(client_instance.id, 31)]
+    
+    def test_deleted_ids_are_paginated(self, authenticated_client, client_instance):
+        """Los ids eliminados se entregan en páginas de `page_size`, como las filas."""
+        projects = ProjectFactory.create_batch(5, client=client_instance)
+        token = sync(authenticated_client, 'project-list')['next_since']
+        url = reverse('project-list')
+        
+        client_instance.delete()
+        response = authenticated_client.get(url, {'since': token, 'page_size': 2})
+        deleted = list(response.data['deleted'])
+        while response.data['has_more']:
+            assert len(response.data['deleted']) == 2
+            response = authenticated_client.get(url, {'since': response.data['next_since'], 'page_size': 2})
+            deleted.extend(response.data['deleted'])
+        
+        assert deleted == sorted(project.id for project in projects)
+    
+    def test_bulk_client_rename_marks_projects_changed(self, authenticated_client, client_instance):
+        """Renombrar clientes en lote también reenvía sus proyectos."""
+        project = ProjectFactory(client=client_instance)
+        token = sync(authenticated_client, 'project-list')['next_since']
+        
+        authenticated_client.patch(reverse('client-bulk'), [{'id': client_instance.id, 'phone': '+34999999999'}],
+                                   format='json')
+        assert sync(authenticated_client, 'project-list', token)['results'] == []
+        authenticated_client.patch(reverse('client-bulk'), [{'id': client_instance.id, 'name': 'Renombrado'}],
+                                   format='json')
+        data = sync(authenticated_client, 'project-list', token)
+        
+        assert [(p['id'], p['client_name']) for p in data['results']] == [(project.id, 'Renombrado')]
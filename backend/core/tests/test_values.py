@@ -0,0 +1,81 @@
+import pytest
+from django.urls import reverse
+from rest_framework import serializers, status
+from core.models import Client, Project
+from core.serializers import ClientSerializer, ProjectSerializer
+from core.values import ValuesRepresentation
+from .factories import ClientFactory, ProjectFactory
+
+
+def get_all_results(api_client, url, params=None):
+    """Recorre todas las páginas del listado."""
+    results = []
+    response = api_client.get(url, params)
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        results.extend(response.data['results'])
+        if not response.data['next']:
+            return results
+        response = api_client.get(response.data['next'])
+
+
+@pytest.mark.django_db
+class TestValuesFastPath:
+    """Pruebas para la vía rápida de los listados basada en .values()."""
+    
+    def test_project_list_matches_serializer(self, authenticated_client, client_instance, settings):
+        """El listado de proyectos coincide con la salida de ProjectSerializer, incluidos los nulos."""
+        ProjectFactory.create_batch(3, client=client_instance)
+        ProjectFactory(client=client_instance, end_date=None)
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'PAGE_SIZE': 2}
+        
+        results = get_all_results(authenticated_client, reverse('project-list'))
+        
+        projects = Project.objects.filter(client=client_instance).order_by('-created_at', '-id')
+        assert results == ProjectSerializer(projects, many=True).data
+    
+    def test_client_list_matches_serializer(self, authenticated_client, user):
+        """El listado de clientes coincide con la salida de ClientSerializer."""
+        ProjectFactory(client=ClientFactory(user=user), status='pendiente')
+        ClientFactory(user=user)
+        
+        results = get_all_results(authenticated_client, reverse('client-list'))
+        
+        clients = Client.objects.filter(user=user).order_by('-created_at', '-id')
+        assert results == ClientSerializer(clients, many=True).data
+    
+    def test_by_status_matches_serializer(self, authenticated_client, client_instance):
+        """El filtro por estado usa la misma representación."""
+        ProjectFactory.create_batch(2, client=client_instance, status='completado')
+        ProjectFactory(client=client_instance, status='pendiente')
+        
+        results = get_all_results(authenticated_client, reverse('project-by-status'), {'status': 'completado'})
+        
+        projects = Project.objects.filter(status='completado').order_by('-created_at', '-id')
+        assert results == ProjectSerializer(projects, many=True).data
+    
+    def test_same_json_as_serializer_path(self, authenticated_client, client_instance, settings):
+        """El JSON es idéntico con la vía rápida activada o desactivada."""
+        ProjectFactory.create_batch(3, client=client_instance)
+        url = reverse('project-list')
+        
+        fast = authenticated_client.get(url)
+        settings.API_LIST_FAST_PATH = False
+        settings.API_CACHE_ENABLED = False
+        slow = authenticated_client.get(url)
+        
+        assert fast.content == slow.content
+    
+    def test_unsupported_serializer_is_not_compiled(self):
+        """Un serializador con campos calculados no se compila y usa la vía habitual."""
+        class ComputedSerializer(ProjectSerializer):
+            label = serializers.SerializerMethodField()
+            
+            class Meta(ProjectSerializer.Meta):
+                fields = ProjectSerializer.Meta.fields + ('label',)
+            
+            def get_label(self, obj):
+                return obj.name.upper()
+        
+        assert ValuesRepresentation.from_serializer(ProjectSerializer()) is not None
+        assert ValuesRepresentation.from_serializer(ComputedSerializer()) is None
@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from .async_views import async_read_urls
 from .views import UserViewSet, ClientViewSet, ProjectViewSet
 
 router = DefaultRouter()
@@ -7,6 +9,9 @@ router.register(r'users', UserViewSet)
 router.register(r'clients', ClientViewSet, basename='client')
 router.register(r'projects', ProjectViewSet, basename='project')
 
+# Bajo ASGI las lecturas de clientes y proyectos se sirven con vistas asíncronas
+api_urls = async_read_urls(router.urls) if settings.API_ASYNC_VIEWS else router.urls
+
 urlpatterns = [
-    path('', include(router.urls)),
+    path('', include(api_urls)),
 ] 
\ No newline at end of file
@@ -0,0 +1,156 @@
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .instrumentation import timed
+
+# Campos cuya representación coincide con el valor que devuelve la base de datos
+IDENTITY_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+    serializers.ChoiceField, serializers.ReadOnlyField,
+)
+
+
+def resolve_lookup(model, source_attrs):
+    """
+    Traduce el `source` de un campo (p. ej. `client.name`) a un lookup de
+    `.values()` (`client__name`), o `None` si no corresponde a columnas del modelo.
+    """
+    for position, attr in enumerate(source_attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        is_last = position == len(source_attrs) - 1
+        if model_field.many_to_many or model_field.one_to_many:
+            return None
+        if model_field.is_relation and not is_last:
+            model = model_field.related_model
+        elif not is_last:
+            return None
+    return '__'.join(source_attrs)
+
+
+def _compile_field(model, field):
+    """Devuelve `(lookup, conversor)` para un campo del serializador, o `None` si no se admite."""
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        # values('client') devuelve directamente el id, que es lo que representa el campo
+        if field.pk_field is not None or len(field.source_attrs) != 1:
+            return None
+        lookup = resolve_lookup(model, field.source_attrs)
+        return (lookup, None) if lookup else None
+    if isinstance(field, (serializers.BaseSerializer, serializers.RelatedField, serializers.ManyRelatedField,
+                          serializers.SerializerMethodField, serializers.HiddenField)):
+        return None
+    if field.source == '*':
+        return None
+    lookup = resolve_lookup(model, field.source_attrs)
+    if lookup is None:
+        return None
+    if type(field) in IDENTITY_FIELDS or isinstance(field, serializers.CharField):
+        return lookup, None
+    # El resto (fechas, decimales...) usa la propia conversión del campo
+    return lookup, field.to_representation
+
+
+class ValuesRepresentation:
+    """
+    Representación precompilada de un ModelSerializer para listados de solo
+    lectura: las filas se leen con `.values()` (solo las columnas serializadas,
+    con los joins necesarios como `client__name`) y se convierten en
+    diccionarios aplicando a cada columna un conversor fijado de antemano.
+
+    El resultado es el mismo que `serializer.data`: mismos nombres, orden y
+    formato de los campos, y `None` para los valores nulos.
+    """
+
+    def __init__(self, columns):
+        # (nombre de salida, lookup, conversor o None)
+        self.columns = columns
+
+    @classmethod
+    def from_serializer(cls, serializer):
+        """Compila el serializador o devuelve `None` si algún campo no se puede leer con `.values()`."""
+        model = serializer.Meta.model
+        columns = []
+        for field in serializer._readable_fields:
+            compiled = _compile_field(model, field)
+            if compiled is None:
+                return None
+            columns.append((field.field_name, *compiled))
+        return cls(columns)
+
+    @property
+    def lookups(self):
+        return [lookup for _, lookup, _ in self.columns]
+
+    def values(self, queryset, extra_lookups=()):
+        """Queryset de diccionarios con las columnas serializadas y las adicionales (p. ej. de ordenación)."""
+        lookups = self.lookups
+        lookups.extend(lookup for lookup in extra_lookups if lookup not in lookups)
+        return queryset.values(*lookups)
+
+    def to_representation(self, rows):
+        with timed('serialize'):
+            return self._to_representation(rows)
+
+    def _to_representation(self, rows):
+        data = []
+        for row in rows:
+            item = {}
+            for name, lookup, convert in self.columns:
+                value = row[lookup]
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return data
+
+
+class ValuesListMixin:
+    """
+    Sustituye el listado de un ModelViewSet por la vía rápida de
+    `ValuesRepresentation`. Si el serializador no se puede compilar o
+    `API_LIST_FAST_PATH` está desactivado se usa el serializador habitual.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.get_list_response(self.filter_queryset(self.get_queryset()))
+
+    def get_values_representation(self):
+        if not getattr(settings, 'API_LIST_FAST_PATH', True):
+            return None
+        return ValuesRepresentation.from_serializer(self.get_serializer())
+
+    def get_pagination_lookups(self, queryset):
+        # La paginación por cursor necesita en cada fila los campos de ordenación
+        if self.paginator is None or not hasattr(self.paginator, 'get_ordering'):
+            return []
+        ordering = self.paginator.get_ordering(self.request, queryset, self)
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return [field.lstrip('-') for field in ordering]
+
+    def get_list_response(self, queryset):
+        """Respuesta paginada del listado de `queryset`."""
+        representation = self.get_values_representation()
+        if representation is None:
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                return self.get_paginated_response(self.get_serializer(page, many=True).data)
+            return Response(self.get_serializer(queryset, many=True).data)
+
+        rows = representation.values(queryset, self.get_pagination_lookups(queryset))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(representation.to_representation(page))
+        return Response(representation.to_representation(rows))
+
+    async def aget_list_response(self, queryset):
+        """Versión asíncrona de `get_list_response` con `aiterator()`; requiere la vía rápida."""
+        representation = self.get_values_representation()
+        rows = representation.values(queryset, self.get_pagination_lookups(queryset))
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(rows, self.request, view=self)
+            if page is not None:
+                return self.get_paginated_response(representation.to_representation(page))
+        return Response(representation.to_representation([row async for row in rows.aiterator()]))
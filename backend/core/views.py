@@ -1,11 +1,46 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.conf import settings
 from django.contrib.auth.models import User
-from .models import Client, Project
-from .serializers import UserSerializer, ClientSerializer, ProjectSerializer
+from .models import Client, Project, Tombstone
+from .serializers import (
+    UserSerializer, ClientSerializer, ProjectSerializer, ClientBulkSerializer, ProjectBulkSerializer,
+    ProjectSummarySerializer, ProjectFilterSerializer
+)
+from .pagination import UserCursorPagination
+from .cache import acache_list_response, cache_list_response
+from .conditional import ConditionalRequestMixin, aconditional_list_response, conditional_list_response
+from .sync import IncrementalSyncMixin, touch_client_projects
+from .routers import ReplicaReadMixin
+from .async_views import AsyncReadMixin
+from .values import ValuesListMixin
+from .fieldsets import SparseFieldsetMixin, sparse_fieldset_parameters
+from .search import FullTextSearchFilter
+from .filters import CollectionFilterMixin, KeysetOrderingFilter, ProjectFilterBackend
+from .bulk import BulkOperationsMixin
+from .export import ExportMixin
+from .importers import CSVImportMixin, ClientCSVImporter, ProjectCSVImporter
+from .summary import build_project_summary
+from .counters import CounterDeltas
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiExample
 
+SYNC_SINCE_PARAMETER = OpenApiParameter(
+    name="since",
+    description=(
+        "Token de sincronización incremental. Si se indica, la respuesta contiene solo las filas "
+        "modificadas (`results`) y los ids eliminados (`deleted`) desde el token, junto con el "
+        "token para la siguiente llamada (`next_since`). Vacío para la sincronización inicial. "
+        "El delta se pagina con `page_size`: mientras `has_more` sea verdadero, `next_since` "
+        "continúa la misma ronda."
+    ),
+    required=False,
+    type=str,
+)
+
+CLIENT_FIELDSET_PARAMETERS = sparse_fieldset_parameters(ClientSerializer.Meta.fields)
+PROJECT_FIELDSET_PARAMETERS = sparse_fieldset_parameters(ProjectSerializer.Meta.fields)
+
 @extend_schema_view(
     list=extend_schema(
         summary="Listar usuarios",
@@ -39,6 +74,7 @@ class UserViewSet(viewsets.ModelViewSet):
     """
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    pagination_class = UserCursorPagination
     permission_classes = [permissions.AllowAny]  # Solo para registro, luego se protegen otras acciones
     
     def get_permissions(self):
@@ -50,6 +86,7 @@ class UserViewSet(viewsets.ModelViewSet):
     list=extend_schema(
         summary="Listar clientes",
         description="Obtiene una lista de todos los clientes asociados al usuario autenticado.",
+        parameters=[SYNC_SINCE_PARAMETER, *CLIENT_FIELDSET_PARAMETERS],
         tags=["Clientes"]
     ),
     create=extend_schema(
@@ -60,6 +97,7 @@ class UserViewSet(viewsets.ModelViewSet):
     retrieve=extend_schema(
         summary="Obtener cliente",
         description="Obtiene la información de un cliente específico por su ID.",
+        parameters=CLIENT_FIELDSET_PARAMETERS,
         tags=["Clientes"]
     ),
     update=extend_schema(
@@ -72,21 +110,90 @@ class UserViewSet(viewsets.ModelViewSet):
         description="Elimina un cliente específico por su ID.",
         tags=["Clientes"]
     ),
+    bulk=extend_schema(
+        summary="Operaciones en lote sobre clientes",
+        description=(
+            "POST crea una lista de clientes, PUT/PATCH actualiza una lista de clientes identificados "
+            "por `id` y DELETE elimina una lista de ids. El lote se aplica en una única transacción; "
+            "si algún elemento no es válido se devuelve `errors` alineado con la entrada."
+        ),
+        request=ClientBulkSerializer(many=True),
+        responses=ClientBulkSerializer(many=True),
+        tags=["Clientes"]
+    ),
+    import_csv=extend_schema(
+        summary="Importar clientes desde CSV",
+        description=(
+            "Importa clientes desde un CSV con las columnas name, email y phone. Las filas no válidas "
+            "se rechazan y se detallan en el informe junto con el rendimiento de la importación."
+        ),
+        tags=["Clientes"]
+    ),
+    export=extend_schema(
+        summary="Exportar clientes",
+        description="Descarga en streaming todos los clientes del usuario en CSV o NDJSON.",
+        tags=["Clientes"]
+    ),
 )
-class ClientViewSet(viewsets.ModelViewSet):
+class ClientViewSet(ReplicaReadMixin, AsyncReadMixin, ConditionalRequestMixin, IncrementalSyncMixin,
+                    SparseFieldsetMixin, ValuesListMixin, BulkOperationsMixin, ExportMixin, CSVImportMixin,
+                    CollectionFilterMixin, viewsets.ModelViewSet):
     """
     API endpoint para gestionar clientes.
     """
     serializer_class = ClientSerializer
+    sparse_fields = ClientSerializer.Meta.fields
+    filter_backends = [FullTextSearchFilter]
+    search_fields = ('name', 'email')
+    bulk_serializer_class = ClientBulkSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # Los contadores de proyectos forman parte de la representación del cliente
+    validator_fields = ('updated_at', 'counters_updated_at')
+    sync_fields = ('updated_at', 'counters_updated_at')
+    sync_model_name = 'client'
+    export_filename = 'clientes'
+    csv_importer_class = ClientCSVImporter
+    export_fields = (
+        ('id', 'id'), ('name', 'name'), ('email', 'email'), ('phone', 'phone'),
+        ('created_at', 'created_at'), ('updated_at', 'updated_at'),
+    )
     
     def get_queryset(self):
-        # Solo devolver clientes del usuario actual
-        return Client.objects.filter(user=self.request.user)
+        # Solo devolver clientes del usuario actual.
+        # Se filtra por id para no requerir una instancia de User (ver StatelessUser)
+        return Client.objects.filter(user_id=self.request.user.id)
+    
+    @conditional_list_response
+    @cache_list_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @aconditional_list_response
+    @acache_list_response
+    async def alist(self, request, *args, **kwargs):
+        return await super().alist(request, *args, **kwargs)
+    
+    def get_bulk_save_kwargs(self):
+        # Los clientes creados en lote pertenecen siempre al usuario actual
+        return {'user_id': self.request.user.id}
+    
+    def bulk_updated(self, objects):
+        touch_client_projects([client.pk for client in objects if client.name_changed()])
+    
+    def bulk_deleting(self, rows):
+        # Se registran a la vez los clientes y los proyectos que se borrarán en cascada
+        client_ids = [row['id'] for row in rows]
+        project_ids = Project.objects.filter(client_id__in=client_ids).values_list('id', flat=True)
+        user_id = self.request.user.id
+        Tombstone.objects.bulk_create([
+            *(Tombstone(model='client', object_id=pk, user_id=user_id) for pk in client_ids),
+            *(Tombstone(model='project', object_id=pk, user_id=user_id) for pk in project_ids),
+        ])
     
     def perform_create(self, serializer):
-        # Asignar automáticamente el usuario actual al crear un cliente
-        serializer.save(user=self.request.user)
+        # El usuario actual ya se asignó en create() y llega validado como instancia
+        # del modelo, lo que funciona también con la autenticación stateless
+        serializer.save()
     
     def create(self, request, *args, **kwargs):
         # Añadir usuario a los datos de la solicitud
@@ -103,6 +210,7 @@ class ClientViewSet(viewsets.ModelViewSet):
     list=extend_schema(
         summary="Listar proyectos",
         description="Obtiene una lista de todos los proyectos asociados a los clientes del usuario autenticado.",
+        parameters=[SYNC_SINCE_PARAMETER, ProjectFilterSerializer, *PROJECT_FIELDSET_PARAMETERS],
         tags=["Proyectos"]
     ),
     create=extend_schema(
@@ -113,6 +221,7 @@ class ClientViewSet(viewsets.ModelViewSet):
     retrieve=extend_schema(
         summary="Obtener proyecto",
         description="Obtiene la información de un proyecto específico por su ID.",
+        parameters=PROJECT_FIELDSET_PARAMETERS,
         tags=["Proyectos"]
     ),
     update=extend_schema(
@@ -125,6 +234,50 @@ class ClientViewSet(viewsets.ModelViewSet):
         description="Elimina un proyecto específico por su ID.",
         tags=["Proyectos"]
     ),
+    bulk=extend_schema(
+        summary="Operaciones en lote sobre proyectos",
+        description=(
+            "POST crea una lista de proyectos, PUT/PATCH actualiza una lista de proyectos identificados "
+            "por `id` y DELETE elimina una lista de ids. Todos los clientes referenciados deben "
+            "pertenecer al usuario. El lote se aplica en una única transacción; si algún elemento no "
+            "es válido se devuelve `errors` alineado con la entrada."
+        ),
+        request=ProjectBulkSerializer(many=True),
+        responses=ProjectBulkSerializer(many=True),
+        tags=["Proyectos"]
+    ),
+    import_csv=extend_schema(
+        summary="Importar proyectos desde CSV",
+        description=(
+            "Importa proyectos desde un CSV con las columnas name, description, status, start_date, "
+            "end_date y el cliente por id (client) o por nombre (client_name). Las filas no válidas "
+            "se rechazan y se detallan en el informe junto con el rendimiento de la importación."
+        ),
+        tags=["Proyectos"]
+    ),
+    summary=extend_schema(
+        summary="Resumen de proyectos",
+        description=(
+            "Devuelve el número de proyectos por estado y por cliente, los proyectos vencidos "
+            "(fecha de entrega pasada y no completados) y las próximas entregas, calculados con una "
+            "única consulta agregada."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="days",
+                description="Días hacia adelante considerados como próximas entregas (1-365)",
+                required=False,
+                type=int,
+            ),
+        ],
+        responses=ProjectSummarySerializer,
+        tags=["Proyectos"]
+    ),
+    export=extend_schema(
+        summary="Exportar proyectos",
+        description="Descarga en streaming todos los proyectos del usuario, con el nombre del cliente, en CSV o NDJSON.",
+        tags=["Proyectos"]
+    ),
     by_status=extend_schema(
         summary="Filtrar proyectos por estado",
         description="Obtiene una lista de proyectos filtrados por su estado (pendiente, en_progreso, completado).",
@@ -136,27 +289,119 @@ class ClientViewSet(viewsets.ModelViewSet):
                 type=str,
                 enum=["pendiente", "en_progreso", "completado"]
             ),
+            *PROJECT_FIELDSET_PARAMETERS,
         ],
         tags=["Proyectos"]
     ),
 )
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ReplicaReadMixin, AsyncReadMixin, ConditionalRequestMixin, IncrementalSyncMixin,
+                     SparseFieldsetMixin, ValuesListMixin, BulkOperationsMixin, ExportMixin, CSVImportMixin,
+                     CollectionFilterMixin, viewsets.ModelViewSet):
     """
     API endpoint para gestionar proyectos.
     """
     serializer_class = ProjectSerializer
+    sparse_fields = ProjectSerializer.Meta.fields
+    # El orden explícito (?ordering=) tiene prioridad sobre la relevancia de ?q=
+    filter_backends = [KeysetOrderingFilter, FullTextSearchFilter, ProjectFilterBackend]
+    search_fields = ('name', 'description')
+    ordering_fields = ('created_at', 'start_date', 'end_date')
+    bulk_serializer_class = ProjectBulkSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # client_name forma parte de la representación del proyecto
+    validator_fields = ('updated_at', 'client__updated_at')
+    sync_model_name = 'project'
+    bulk_deletion_fields = ('client_id', 'status')
+    export_filename = 'proyectos'
+    csv_importer_class = ProjectCSVImporter
+    export_fields = (
+        ('id', 'id'), ('name', 'name'), ('description', 'description'), ('status', 'status'),
+        ('client', 'client_id'), ('client_name', 'client__name'),
+        ('start_date', 'start_date'), ('end_date', 'end_date'),
+        ('created_at', 'created_at'), ('updated_at', 'updated_at'),
+    )
     
     def get_queryset(self):
-        # Solo devolver proyectos de clientes del usuario actual
-        return Project.objects.filter(client__user=self.request.user)
+        # Solo devolver proyectos de clientes del usuario actual.
+        # select_related evita una consulta extra por fila al serializar client_name
+        return Project.objects.filter(client__user_id=self.request.user.id).select_related('client')
+    
+    @conditional_list_response
+    @cache_list_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @aconditional_list_response
+    @acache_list_response
+    async def alist(self, request, *args, **kwargs):
+        return await super().alist(request, *args, **kwargs)
+    
+    def get_bulk_serializer_context(self, items):
+        # Una sola consulta para comprobar que todos los clientes del lote son del usuario
+        client_ids = set()
+        for item in items:
+            try:
+                client_ids.add(int(item['client']))
+            except (KeyError, TypeError, ValueError):
+                continue
+        context = super().get_bulk_serializer_context(items)
+        context['owned_clients'] = Client.objects.filter(
+            user_id=self.request.user.id, pk__in=client_ids
+        ).in_bulk()
+        return context
+    
+    def bulk_created(self, objects):
+        # bulk_create no emite señales: los contadores del cliente se ajustan aquí
+        deltas = CounterDeltas()
+        for project in objects:
+            deltas.add(project.client_id, project.status, 1)
+        deltas.apply()
+    
+    def bulk_updated(self, objects):
+        deltas = CounterDeltas()
+        for project in objects:
+            deltas.move(project._counter_state, (project.client_id, project.status))
+            project._counter_state = (project.client_id, project.status)
+        deltas.apply()
+    
+    def bulk_deleting(self, rows):
+        deltas = CounterDeltas()
+        for row in rows:
+            deltas.add(row['client_id'], row['status'], -1)
+        deltas.apply()
+        Tombstone.objects.bulk_create([
+            Tombstone(model='project', object_id=row['id'], user_id=self.request.user.id) for row in rows
+        ])
     
     @action(detail=False, methods=['get'])
+    @conditional_list_response
+    @cache_list_response
     def by_status(self, request):
         """Endpoint para filtrar proyectos por estado"""
-        status_param = request.query_params.get('status', None)
-        if status_param:
-            projects = self.get_queryset().filter(status=status_param)
-            serializer = self.get_serializer(projects, many=True)
-            return Response(serializer.data)
-        return Response({'error': 'Se requiere el parámetro status'}, status=status.HTTP_400_BAD_REQUEST) 
\ No newline at end of file
+        # El estado se valida y aplica en ProjectFilterBackend como el resto de filtros
+        if request.query_params.get('status'):
+            return self.get_list_response(self.filter_queryset(self.get_queryset()))
+        return Response({'error': 'Se requiere el parámetro status'}, status=status.HTTP_400_BAD_REQUEST) 
+    
+    @aconditional_list_response
+    @acache_list_response
+    async def aby_status(self, request):
+        """Versión asíncrona de by_status (ver `core.async_views`)"""
+        if request.query_params.get('status'):
+            return await self.aget_list_response(self.filter_queryset(self.get_queryset()))
+        return Response({'error': 'Se requiere el parámetro status'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=False, methods=['get'])
+    @cache_list_response
+    def summary(self, request):
+        """Endpoint con el resumen agregado de proyectos por estado y cliente"""
+        try:
+            days = int(request.query_params.get('days', settings.PROJECT_SUMMARY_UPCOMING_DAYS))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= 365:
+            return Response({'error': 'El parámetro days debe ser un entero entre 1 y 365'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        data = build_project_summary(self.get_queryset(), days)
+        return Response(ProjectSummarySerializer(data).data)
+
@@ -0,0 +1,108 @@
+"""
+Configuración de gunicorn para producción. gunicorn la carga automáticamente al
+arrancar desde este directorio:
+
+    gunicorn                          # WSGI, workers gthread
+    GUNICORN_ASGI=1 gunicorn          # ASGI con workers de uvicorn
+
+Todos los valores se pueden ajustar con variables de entorno GUNICORN_*.
+"""
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def _env_bool(name, default=False):
+    return os.environ.get(name, str(int(default))).lower() in ('1', 'true', 'yes', 'on')
+
+
+cores = multiprocessing.cpu_count()
+asgi = _env_bool('GUNICORN_ASGI')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+if asgi:
+    wsgi_app = 'user_manager.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+    # Cada worker de uvicorn atiende muchas conexiones en su bucle de eventos
+    workers = _env_int('GUNICORN_WORKERS', cores + 1)
+else:
+    wsgi_app = 'user_manager.wsgi:application'
+    worker_class = 'gthread'
+    # Regla habitual de gunicorn: (2 x núcleos) + 1 procesos; los hilos cubren
+    # la espera de la base de datos sin multiplicar la memoria
+    workers = _env_int('GUNICORN_WORKERS', cores * 2 + 1)
+    threads = _env_int('GUNICORN_THREADS', 4)
+
+# La caché 'api' (respuestas de listado y marca de lectura en el primario tras una
+# escritura) es local a cada proceso salvo que API_CACHE_URL apunte a un backend
+# compartido. Con varios workers las invalidaciones solo llegarían al worker que
+# atendió la escritura y el resto serviría listados obsoletos con un ETag nuevo.
+shared_cache = not os.environ.get('API_CACHE_URL', 'locmemcache://').startswith('locmemcache://')
+if workers > 1 and not shared_cache:
+    if os.environ.get('DATABASE_REPLICA_URLS'):
+        raise RuntimeError(
+            'Con varios workers y réplicas de lectura se requiere una caché compartida: '
+            'define API_CACHE_URL (p. ej. redis://redis:6379/1).'
+        )
+    if 'API_CACHE_ENABLED' in os.environ and _env_bool('API_CACHE_ENABLED', True):
+        raise RuntimeError(
+            'API_CACHE_ENABLED=1 con varios workers requiere una caché compartida: '
+            'define API_CACHE_URL (p. ej. redis://redis:6379/1) o usa API_CACHE_ENABLED=0.'
+        )
+    os.environ['API_CACHE_ENABLED'] = '0'
+
+# Django se importa una vez en el maestro y los workers lo heredan al hacer fork
+preload_app = _env_bool('GUNICORN_PRELOAD', True)
+
+# Conexiones keep-alive: algo más que el tiempo de inactividad del balanceador
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+
+# Reciclado escalonado de workers para contener fugas de memoria sin reiniciarlos a la vez
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 2000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 200)
+
+# Los latidos de los workers en memoria en lugar del disco del contenedor
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Con varios workers las métricas de /metrics/ se reúnen en un directorio compartido
+metrics_enabled = _env_bool('API_METRICS')
+if metrics_enabled:
+    os.environ.setdefault(
+        'API_METRICS_MULTIPROC_DIR', os.path.join(worker_tmp_dir or '/tmp', 'user_manager_metrics')
+    )
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def pre_fork(server, worker):
+    # Ninguna conexión abierta en el maestro debe compartirse con los workers
+    if preload_app:
+        from django.db import connections
+        connections.close_all()
+
+
+def on_starting(server):
+    # Los ficheros de una ejecución anterior describen workers que ya no existen
+    if metrics_enabled:
+        from core.metrics import clear_process_metrics
+        clear_process_metrics(os.environ['API_METRICS_MULTIPROC_DIR'])
+
+
+def worker_exit(server, worker):
+    if metrics_enabled:
+        from core.metrics import flush
+        flush(force=True)
+
+
+def child_exit(server, worker):
+    if metrics_enabled:
+        from core.metrics import mark_process_dead
+        mark_process_dead(worker.pid, os.environ['API_METRICS_MULTIPROC_DIR'])
@@ -30,10 +30,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # La primera para medir la petición completa; se descarta si API_INSTRUMENTATION está desactivado
+    'core.instrumentation.PerformanceMiddleware',
+    'core.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'core.routers.DatabaseRoutingMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -63,18 +67,35 @@ WSGI_APPLICATION = 'user_manager.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASE_URL = os.environ.get('DATABASE_URL')
+# Conexiones persistentes: cada worker reutiliza su conexión durante DB_CONN_MAX_AGE
+# segundos (0 = una por petición) y, con DB_CONN_HEALTH_CHECKS,
+# la comprueba antes de reutilizarla. Con DB_POOL los hilos de cada proceso
+# comparten un pool de conexiones (core.backends.postgresql_pool).
+DATABASE_URL = env('DATABASE_URL', default=None)
 if DATABASE_URL:
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.postgresql',
-            'NAME': os.environ.get('POSTGRES_DB', 'user_manager'),
-            'USER': os.environ.get('POSTGRES_USER', 'postgres'),
-            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', 'postgres'),
-            'HOST': os.environ.get('POSTGRES_HOST', 'db'),
-            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            'NAME': env('POSTGRES_DB', default='user_manager'),
+            'USER': env('POSTGRES_USER', default='postgres'),
+            'PASSWORD': env('POSTGRES_PASSWORD', default='postgres'),
+            'HOST': env('POSTGRES_HOST', default='db'),
+            'PORT': env('POSTGRES_PORT', default='5432'),
+            'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=60),
+            'CONN_HEALTH_CHECKS': env.bool('DB_CONN_HEALTH_CHECKS', default=True),
         }
     }
+    if env.bool('DB_POOL', default=False):
+        DATABASES['default'].update({
+            'ENGINE': 'core.backends.postgresql_pool',
+            # La conexión vuelve al pool al terminar cada petición
+            'CONN_MAX_AGE': 0,
+            'POOL': {
+                'MIN_SIZE': env.int('DB_POOL_MIN_SIZE', default=0),
+                'MAX_SIZE': env.int('DB_POOL_MAX_SIZE', default=10),
+                'TIMEOUT': env.float('DB_POOL_TIMEOUT', default=30),
+            },
+        })
 else:
     DATABASES = {
         'default': {
@@ -83,6 +104,95 @@ else:
         }
     }
 
+# Réplicas de lectura: DATABASE_REPLICA_URLS=postgres://...,postgres://... crea los
+# alias replica1, replica2... con la misma configuración que 'default'. Las
+# peticiones de lectura de clientes y proyectos se sirven desde ellas salvo que el
+# usuario haya escrito en los últimos DATABASE_REPLICA_PIN_SECONDS segundos (debe
+# superar el retraso de replicación). La marca se guarda en la caché 'api', que
+# debe ser compartida para que valga entre workers.
+DATABASE_REPLICAS = []
+for index, url in enumerate(env.list('DATABASE_REPLICA_URLS', default=[]), start=1):
+    replica = env.db_url_config(url)
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        **{key: replica[key] for key in ('NAME', 'USER', 'PASSWORD', 'HOST', 'PORT') if key in replica},
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{index}')
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+DATABASE_REPLICA_PIN_SECONDS = env.int('DATABASE_REPLICA_PIN_SECONDS', default=5)
+
+# Caché
+# La caché 'api' guarda las respuestas de listado por usuario. Por defecto es local
+# al proceso; con varios workers debe apuntar a un backend compartido, p. ej.
+# API_CACHE_URL=redis://redis:6379/1 (paquete redis), o gunicorn.conf.py la desactiva
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': env.cache_url('API_CACHE_URL', default='locmemcache://api-responses'),
+}
+
+API_CACHE_ENABLED = env.bool('API_CACHE_ENABLED', default=True)
+API_CACHE_TIMEOUT = env.int('API_CACHE_TIMEOUT', default=300)
+
+# Los listados leen las filas con .values() y las convierten sin instanciar el serializador
+API_LIST_FAST_PATH = env.bool('API_LIST_FAST_PATH', default=True)
+
+# Vistas asíncronas para las lecturas de clientes y proyectos (list, retrieve y
+# by_status). Solo tienen sentido bajo ASGI (GUNICORN_ASGI=1) y se activan
+# explícitamente con API_ASYNC_VIEWS=1; bajo WSGI no aportan nada.
+API_ASYNC_VIEWS = env.bool('API_ASYNC_VIEWS', default=False)
+
+# Instrumentación por petición (core.instrumentation): cabecera Server-Timing y log
+# JSON en el logger core.performance. Las peticiones de más de API_SLOW_REQUEST_MS
+# se registran con sus consultas SQL en una proporción API_SLOW_REQUEST_SAMPLE_RATE.
+API_INSTRUMENTATION = env.bool('API_INSTRUMENTATION', default=False)
+API_SLOW_REQUEST_MS = env.int('API_SLOW_REQUEST_MS', default=500)
+API_SLOW_REQUEST_SAMPLE_RATE = env.float('API_SLOW_REQUEST_SAMPLE_RATE', default=1.0)
+
+# Métricas en formato Prometheus en /metrics/ (core.metrics). Con varios workers
+# cada uno vuelca las suyas en API_METRICS_MULTIPROC_DIR, como mucho cada
+# API_METRICS_FLUSH_SECONDS; gunicorn.conf.py fija el directorio si falta. Con
+# API_METRICS_TOKEN el endpoint exige "Authorization: Bearer <token>".
+API_METRICS = env.bool('API_METRICS', default=False)
+API_METRICS_MULTIPROC_DIR = env('API_METRICS_MULTIPROC_DIR', default=None)
+API_METRICS_FLUSH_SECONDS = env.float('API_METRICS_FLUSH_SECONDS', default=1.0)
+API_METRICS_TOKEN = env('API_METRICS_TOKEN', default=None)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.performance': {
+            'handlers': ['console'],
+            'level': env('API_PERFORMANCE_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+# Operaciones en lote: elementos máximos por petición y filas por INSERT/UPDATE
+API_BULK_MAX_ITEMS = env.int('API_BULK_MAX_ITEMS', default=1000)
+API_BULK_BATCH_SIZE = env.int('API_BULK_BATCH_SIZE', default=500)
+
+# Filas leídas del cursor del servidor por viaje en las exportaciones en streaming
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', default=2000)
+
+# Filas por lote (validación + bulk_create) en las importaciones CSV
+IMPORT_BATCH_SIZE = env.int('IMPORT_BATCH_SIZE', default=1000)
+
+# Ventana por defecto (días) de las próximas entregas en /api/projects/summary/
+PROJECT_SUMMARY_UPCOMING_DAYS = env.int('PROJECT_SUMMARY_UPCOMING_DAYS', default=7)
+
+# Segundos que se retrasa el token de sincronización incremental (?since=) para no
+# perder filas de transacciones que aún no habían confirmado
+SYNC_SAFETY_WINDOW = env.int('SYNC_SAFETY_WINDOW', default=5)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -107,22 +217,45 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework settings
+# Renderer/parser JSON rápidos (orjson). Si orjson no está instalado usan los de DRF
+API_FAST_JSON = env.bool('API_FAST_JSON', default=True)
+
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer' if API_FAST_JSON else 'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.FastJSONParser' if API_FAST_JSON else 'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Modo stateless opcional: construye el usuario a partir del token sin consultar auth_user
+        'core.authentication.StatelessJWTAuthentication'
+        if env.bool('JWT_STATELESS_AUTH', default=False)
+        else 'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetCursorPagination',
+    'PAGE_SIZE': env.int('API_PAGE_SIZE', default=50),
 }
 
+# Tamaño máximo de página que un cliente puede pedir con ?page_size=
+API_MAX_PAGE_SIZE = env.int('API_MAX_PAGE_SIZE', default=200)
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
 }
 
+# Segundos que la autenticación stateless confía en el estado (existe / is_active) de un usuario
+JWT_USER_STATUS_CACHE_TTL = env.int('JWT_USER_STATUS_CACHE_TTL', default=30)
+
 # CORS Settings
 CORS_ALLOW_ALL_ORIGINS = True  # Solo para desarrollo
 CORS_ALLOWED_ORIGINS = [
@@ -10,6 +10,7 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 from drf_spectacular.utils import extend_schema
+from core.metrics import metrics_view
 
 # Extender los esquemas para los endpoints de JWT
 class ExtendedTokenObtainPairView(TokenObtainPairView):
@@ -57,6 +58,9 @@ urlpatterns = [
     # API endpoints
     path('api/', include('core.urls')),
     
+    # Métricas en formato Prometheus (API_METRICS)
+    path('metrics/', metrics_view, name='metrics'),
+    
     # API Documentation
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
@@ -8,17 +8,18 @@ const ProjectList = () => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [filterStatus, setFilterStatus] = useState('');
+  const [onlyOverdue, setOnlyOverdue] = useState(false);
+  const [ordering, setOrdering] = useState('');
 
   const fetchProjects = useCallback(async () => {
     try {
       setLoading(true);
-      let data;
-      
-      if (filterStatus) {
-        data = await projectService.getByStatus(filterStatus);
-      } else {
-        data = await projectService.getAll();
-      }
+      // El filtrado y la ordenación se hacen en el servidor
+      const data = await projectService.getAll({
+        status: filterStatus,
+        overdue: onlyOverdue ? 'true' : '',
+        ordering,
+      });
       
       setProjects(data);
       setError('');
@@ -28,7 +29,7 @@ const ProjectList = () => {
     } finally {
       setLoading(false);
     }
-  }, [filterStatus]);
+  }, [filterStatus, onlyOverdue, ordering]);
 
   useEffect(() => {
     fetchProjects();
@@ -97,6 +98,25 @@ const ProjectList = () => {
               <option value="completado">Completado</option>
             </Form.Select>
           </Form.Group>
+          <Form.Group className="mb-3">
+            <Form.Label>Ordenar por</Form.Label>
+            <Form.Select
+              value={ordering}
+              onChange={(e) => setOrdering(e.target.value)}
+            >
+              <option value="">Más recientes</option>
+              <option value="start_date">Fecha de inicio</option>
+              <option value="end_date">Fecha de entrega</option>
+              <option value="-end_date">Fecha de entrega (descendente)</option>
+            </Form.Select>
+          </Form.Group>
+          <Form.Check
+            type="checkbox"
+            id="only-overdue"
+            label="Solo proyectos vencidos"
+            checked={onlyOverdue}
+            onChange={(e) => setOnlyOverdue(e.target.checked)}
+          />
         </Card.Body>
       </Card>
       
@@ -100,13 +100,24 @@ const checkAuth = () => {
   return token;
 };
 
+// Recorre todas las páginas de un listado paginado por cursor siguiendo el enlace `next`
+const fetchAllPages = async (url) => {
+  let results = [];
+  let nextUrl = url;
+  while (nextUrl) {
+    const response = await axios.get(nextUrl, { headers: authHeader() });
+    results = results.concat(response.data.results);
+    nextUrl = response.data.next;
+  }
+  return results;
+};
+
 // Servicios para Clientes
 export const clientService = {
   getAll: async () => {
     try {
       checkAuth();
-      const response = await axios.get(`${API_URL}/clients/`, { headers: authHeader() });
-      return response.data;
+      return await fetchAllPages(`${API_URL}/clients/`);
     } catch (error) {
       console.error('Error fetching clients:', error);
       throw error;
@@ -158,13 +169,26 @@ export const clientService = {
   },
 };
 
+// Construye la query string omitiendo los filtros vacíos
+const buildQuery = (params = {}) => {
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== '') {
+      query.append(key, value);
+    }
+  });
+  const queryString = query.toString();
+  return queryString ? `?${queryString}` : '';
+};
+
 // Servicios para Proyectos
 export const projectService = {
-  getAll: async () => {
+  // Filtros admitidos por la API: status (separados por comas), client, start_date_after,
+  // start_date_before, end_date_after, end_date_before, overdue, ordering y q
+  getAll: async (filters = {}) => {
     try {
       checkAuth();
-      const response = await axios.get(`${API_URL}/projects/`, { headers: authHeader() });
-      return response.data;
+      return await fetchAllPages(`${API_URL}/projects/${buildQuery(filters)}`);
     } catch (error) {
       console.error('Error fetching projects:', error);
       throw error;
@@ -218,8 +242,7 @@ export const projectService = {
   getByStatus: async (status) => {
     try {
       checkAuth();
-      const response = await axios.get(`${API_URL}/projects/by_status/?status=${status}`, { headers: authHeader() });
-      return response.data;
+      return await fetchAllPages(`${API_URL}/projects/by_status/?status=${status}`);
     } catch (error) {
       console.error(`Error fetching projects by status ${status}:`, error);
       throw error;